@@ -1,4 +1,4 @@
-import { test, expect, Page } from '@playwright/test'
+import { test, expect, Page, Response } from '@playwright/test'
 
 const STATUS_OPTIONS = ['pending', 'confirmed', 'declined', 'cancelled', 'expired'] as const
 
@@ -8,6 +8,12 @@ const CONTACT_PHONE = '08000001111'
 const CONTACT_LINE = 'playwright_line'
 const CONTACT_WEB = 'https://playwright.example.com'
 
+// The page also holds the reservation event stream open under the same prefix.
+function isReservationListResponse(response: Response) {
+  const url = new URL(response.url())
+  return url.pathname === '/api/admin/reservations' && response.request().method() === 'GET' && response.status() === 200
+}
+
 async function fetchFirstShop(page: Page) {
   const shopsResponse = await page.request.get('/api/admin/shops')
   if (!shopsResponse.ok()) {
@@ -293,9 +299,7 @@ test.describe('Admin dashboard', () => {
   test('予約一覧をフィルタリングできる', async ({ page }) => {
     await page.goto('/admin/reservations')
     await expect(page.getByRole('heading', { name: '予約管理' })).toBeVisible()
-    await page.waitForResponse((response) =>
-      response.url().includes('/api/admin/reservations') && response.request().method() === 'GET' && response.status() === 200,
-    )
+    await page.waitForResponse(isReservationListResponse)
 
     const cards = page.getByTestId('reservation-card')
     if ((await cards.count()) === 0) {
@@ -320,18 +324,14 @@ test.describe('Admin dashboard', () => {
         test.skip(true, `予約作成に失敗しました status=${create.status()}`)
       }
       await page.reload()
-      await page.waitForResponse((response) =>
-        response.url().includes('/api/admin/reservations') && response.request().method() === 'GET' && response.status() === 200,
-      )
+      await page.waitForResponse(isReservationListResponse)
     }
 
     const initialCount = await cards.count()
     expect(initialCount).toBeGreaterThan(0)
 
     await page.getByTestId('status-filter').selectOption('pending')
-    await page.waitForResponse((response) =>
-      response.url().includes('/api/admin/reservations') && response.request().method() === 'GET' && response.status() === 200,
-    )
+    await page.waitForResponse(isReservationListResponse)
     const filteredCount = await cards.count()
     expect(filteredCount).toBeGreaterThan(0)
     for (let i = 0; i < filteredCount; i += 1) {
@@ -339,23 +339,17 @@ test.describe('Admin dashboard', () => {
     }
 
     await page.getByTestId('status-filter').selectOption('')
-    await page.waitForResponse((response) =>
-      response.url().includes('/api/admin/reservations') && response.request().method() === 'GET' && response.status() === 200,
-    )
+    await page.waitForResponse(isReservationListResponse)
     expect(await cards.count()).toBeGreaterThan(0)
   })
 
   test('ステータスフィルタで0件の場合に件数が0になる', async ({ page }) => {
     await page.goto('/admin/reservations')
     await expect(page.getByRole('heading', { name: '予約管理' })).toBeVisible()
-    await page.waitForResponse((response) =>
-      response.url().includes('/api/admin/reservations') && response.request().method() === 'GET' && response.status() === 200,
-    )
+    await page.waitForResponse(isReservationListResponse)
 
     await page.getByTestId('status-filter').selectOption('declined')
-    await page.waitForResponse((response) =>
-      response.url().includes('/api/admin/reservations') && response.request().method() === 'GET' && response.status() === 200,
-    )
+    await page.waitForResponse(isReservationListResponse)
     const counterText = await page.locator('text=/件中/').first().textContent()
     expect(counterText).toContain('0件中 0件を表示')
     await expect(page.getByTestId('reservation-card')).toHaveCount(0)
@@ -389,9 +383,7 @@ test.describe('Admin dashboard', () => {
 
     await page.goto('/admin/reservations')
     await expect(page.getByRole('heading', { name: '予約管理' })).toBeVisible()
-    await page.waitForResponse((response) =>
-      response.url().includes('/api/admin/reservations') && response.request().method() === 'GET' && response.status() === 200,
-    )
+    await page.waitForResponse(isReservationListResponse)
 
     await ensureReservation(page)
     await page.getByTestId('reservations-refresh').click()
@@ -421,9 +413,7 @@ test.describe('Admin dashboard', () => {
 
     await page.goto('/admin/reservations')
     await expect(page.getByRole('heading', { name: '予約管理' })).toBeVisible()
-    await page.waitForResponse((response) =>
-      response.url().includes('/api/admin/reservations') && response.request().method() === 'GET' && response.status() === 200,
-    )
+    await page.waitForResponse(isReservationListResponse)
 
     const warnings: string[] = []
     page.on('console', (msg) => {
@@ -449,9 +439,7 @@ test.describe('Admin dashboard', () => {
   test('予約一覧はページングされる', async ({ page }) => {
     await page.goto('/admin/reservations')
     await expect(page.getByRole('heading', { name: '予約管理' })).toBeVisible()
-    await page.waitForResponse((response) =>
-      response.url().includes('/api/admin/reservations') && response.request().method() === 'GET' && response.status() === 200,
-    )
+    await page.waitForResponse(isReservationListResponse)
 
     const ensureManyReservations = async () => {
       const shop = await fetchFirstShop(page)
@@ -484,16 +472,12 @@ test.describe('Admin dashboard', () => {
     const firstCardId = await page.getByTestId('reservation-card').first().locator('text=/[0-9a-f\-]{36}/').first().innerText()
 
     await page.getByTestId('reservations-next').click()
-    await page.waitForResponse((response) =>
-      response.url().includes('/api/admin/reservations') && response.request().method() === 'GET' && response.status() === 200,
-    )
+    await page.waitForResponse(isReservationListResponse)
     const secondCardId = await page.getByTestId('reservation-card').first().locator('text=/[0-9a-f\-]{36}/').first().innerText()
     expect(secondCardId).not.toBe(firstCardId)
 
     await page.getByTestId('reservations-prev').click()
-    await page.waitForResponse((response) =>
-      response.url().includes('/api/admin/reservations') && response.request().method() === 'GET' && response.status() === 200,
-    )
+    await page.waitForResponse(isReservationListResponse)
   })
 
   test('予約更新失敗時にエラートーストが表示される', async ({ page }) => {
@@ -502,9 +486,7 @@ test.describe('Admin dashboard', () => {
 
     await page.goto('/admin/reservations')
     await expect(page.getByRole('heading', { name: '予約管理' })).toBeVisible()
-    await page.waitForResponse((response) =>
-      response.url().includes('/api/admin/reservations') && response.request().method() === 'GET' && response.status() === 200,
-    )
+    await page.waitForResponse(isReservationListResponse)
 
     const card = page.getByTestId('reservation-card').filter({ hasText: targetReservationId }).first()
     await expect(card).toBeVisible({ timeout: 10_000 })
@@ -543,9 +525,7 @@ test.describe('Admin dashboard', () => {
 
     await page.goto('/admin/reservations')
     await expect(page.getByRole('heading', { name: '予約管理' })).toBeVisible()
-    await page.waitForResponse((response) =>
-      response.url().includes('/api/admin/reservations') && response.request().method() === 'GET' && response.status() === 200,
-    )
+    await page.waitForResponse(isReservationListResponse)
 
     const card = page.getByTestId('reservation-card').filter({ hasText: targetReservationId }).first()
     await expect(card).toBeVisible({ timeout: 10_000 })
@@ -584,9 +564,7 @@ test.describe('Admin dashboard', () => {
 
     await page.goto('/admin/reservations')
     await expect(page.getByRole('heading', { name: '予約管理' })).toBeVisible()
-    await page.waitForResponse((response) =>
-      response.url().includes('/api/admin/reservations') && response.request().method() === 'GET' && response.status() === 200,
-    )
+    await page.waitForResponse(isReservationListResponse)
 
     const cards = page.getByTestId('reservation-card')
     const card = cards.filter({ hasText: targetReservationId }).first()
@@ -2,10 +2,13 @@
 
 import { useEffect, useMemo, useRef, useState, useTransition } from 'react'
 import { useToast, ToastContainer } from '@/components/useToast'
+import { useEventStream } from '@/hooks/useEventStream'
 import { usePolling } from '@/hooks/usePolling'
 
 const STATUSES = ['pending', 'confirmed', 'declined', 'cancelled', 'expired'] as const
 const PAGE_SIZE = 10
+const POLL_INTERVAL_MS = 15000
+const RESERVATION_EVENTS = ['reservation.created', 'reservation.status_changed', 'reset'] as const
 
 type ReservationAdminItem = {
   id: string
@@ -94,6 +97,17 @@ export default function AdminReservationsPage() {
     })
   }
 
+  // Events only say that something changed; the current page is refetched (coalescing bursts).
+  const eventRefreshTimer = useRef<NodeJS.Timeout | null>(null)
+  const { connected: live } = useEventStream('/api/admin/reservations/events', RESERVATION_EVENTS, () => {
+    if (eventRefreshTimer.current) clearTimeout(eventRefreshTimer.current)
+    eventRefreshTimer.current = setTimeout(() => {
+      eventRefreshTimer.current = null
+      refresh()
+    }, 300)
+  })
+
+  // Polling only runs while the event stream is down.
   const { loading: isLoading, refresh } = usePolling(async () => {
     const params = new URLSearchParams()
     if (statusFilter) params.set('status', statusFilter)
@@ -131,7 +145,7 @@ export default function AdminReservationsPage() {
     })
     setNotesDraft(drafts)
     return json
-  }, { intervalMs: 15000, enabled: true })
+  }, { intervalMs: POLL_INTERVAL_MS, enabled: !live })
 
   useEffect(() => {
     setPageNumber(1)
@@ -174,6 +188,7 @@ export default function AdminReservationsPage() {
 
   useEffect(() => () => {
     Object.values(highlightTimers.current).forEach(timer => clearTimeout(timer))
+    if (eventRefreshTimer.current) clearTimeout(eventRefreshTimer.current)
   }, [])
 
   return (
@@ -209,8 +224,13 @@ export default function AdminReservationsPage() {
         </div>
       </div>
 
-      <div className="text-sm text-slate-500">
-        {isLoading ? '読み込み中…' : `${data.total}件中 ${data.items.length}件を表示（${pageNumber} / ${Math.max(1, Math.ceil(data.total / PAGE_SIZE))}ページ）`}
+      <div className="flex items-center justify-between text-sm text-slate-500">
+        <span>
+          {isLoading ? '読み込み中…' : `${data.total}件中 ${data.items.length}件を表示（${pageNumber} / ${Math.max(1, Math.ceil(data.total / PAGE_SIZE))}ページ）`}
+        </span>
+        <span className="text-xs" data-testid="reservations-live">
+          {live ? 'リアルタイム更新中' : `${POLL_INTERVAL_MS / 1000}秒ごとに自動更新`}
+        </span>
       </div>
 
       <div className="flex justify-end items-center gap-2 text-sm">
@@ -115,8 +115,20 @@ function emptySlot(): AvailabilitySlot {
 const SERVICE_TYPES = ['store', 'dispatch'] as const
 type ServiceType = typeof SERVICE_TYPES[number]
 
+const SHOP_PAGE_SIZE = 50
+const SHOP_STATUSES = ['draft', 'published', 'hidden'] as const
+
+type ShopFilters = {
+  q: string
+  area: string
+  status: string
+}
+
 export default function AdminShopsPage() {
   const [shops, setShops] = useState<ShopSummary[]>([])
+  const [shopsCursor, setShopsCursor] = useState<string | null>(null)
+  const [shopFilters, setShopFilters] = useState<ShopFilters>({ q: '', area: '', status: '' })
+  const [loadingShops, setLoadingShops] = useState<boolean>(false)
   const [selectedId, setSelectedId] = useState<string | null>(null)
   const [isCreating, setIsCreating] = useState<boolean>(false)
   const [detail, setDetail] = useState<ShopDetail | null>(null)
@@ -159,19 +171,29 @@ export default function AdminShopsPage() {
     }
   }
 
-  async function fetchShops(selectFirst: boolean = true) {
+  async function fetchShops(selectFirst: boolean = true, cursor: string | null = null) {
+    setLoadingShops(true)
     try {
-      const resp = await fetch('/api/admin/shops', { cache: 'no-store' })
+      const params = new URLSearchParams()
+      if (shopFilters.q.trim()) params.set('q', shopFilters.q.trim())
+      if (shopFilters.area.trim()) params.set('area', shopFilters.area.trim())
+      if (shopFilters.status) params.set('status', shopFilters.status)
+      params.set('limit', String(SHOP_PAGE_SIZE))
+      if (cursor) params.set('cursor', cursor)
+      const resp = await fetch(`/api/admin/shops?${params.toString()}`, { cache: 'no-store' })
       if (!resp.ok) throw new Error('failed to load shops')
       const json = await resp.json()
-      const items: ShopSummary[] = json.items || []
-      setShops(items)
-      if (selectFirst && items.length > 0 && !isCreating) {
+      const items = (json.items || []) as ShopSummary[]
+      setShops(prev => (cursor ? [...prev, ...items] : items))
+      setShopsCursor(json.next_cursor || null)
+      if (!cursor && selectFirst && items.length > 0 && !isCreating) {
         setSelectedId(items[0].id)
       }
     } catch (err) {
       console.error(err)
       push('error', '店舗一覧の取得に失敗しました')
+    } finally {
+      setLoadingShops(false)
     }
   }
 
@@ -596,6 +618,45 @@ export default function AdminShopsPage() {
               新規
             </button>
           </div>
+          <form
+            className="space-y-2 border-b px-3 py-2"
+            onSubmit={e => {
+              e.preventDefault()
+              fetchShops(false)
+            }}
+          >
+            <input
+              value={shopFilters.q}
+              onChange={e => setShopFilters(prev => ({ ...prev, q: e.target.value }))}
+              placeholder="店舗名（前方一致）"
+              className="w-full rounded border border-slate-300 px-2 py-1 text-xs"
+            />
+            <div className="flex gap-2">
+              <input
+                value={shopFilters.area}
+                onChange={e => setShopFilters(prev => ({ ...prev, area: e.target.value }))}
+                placeholder="エリア"
+                className="w-1/2 rounded border border-slate-300 px-2 py-1 text-xs"
+              />
+              <select
+                value={shopFilters.status}
+                onChange={e => setShopFilters(prev => ({ ...prev, status: e.target.value }))}
+                className="w-1/2 rounded border border-slate-300 px-1 py-1 text-xs"
+              >
+                <option value="">すべて</option>
+                {SHOP_STATUSES.map(status => (
+                  <option key={status} value={status}>{status}</option>
+                ))}
+              </select>
+            </div>
+            <button
+              type="submit"
+              disabled={loadingShops}
+              className="w-full rounded border border-slate-300 px-2 py-1 text-xs hover:bg-slate-50"
+            >
+              絞り込み
+            </button>
+          </form>
           <ul className="max-h-[60vh] overflow-y-auto">
             {shops.map(shop => (
               <li key={shop.id}>
@@ -608,7 +669,22 @@ export default function AdminShopsPage() {
                 </button>
               </li>
             ))}
+            {shops.length === 0 && !loadingShops ? (
+              <li className="px-3 py-2 text-xs text-slate-500">該当する店舗がありません</li>
+            ) : null}
           </ul>
+          {shopsCursor ? (
+            <div className="border-t px-3 py-2">
+              <button
+                type="button"
+                onClick={() => fetchShops(false, shopsCursor)}
+                disabled={loadingShops}
+                className="w-full rounded border border-slate-300 px-2 py-1 text-xs hover:bg-slate-50"
+              >
+                {loadingShops ? '読み込み中…' : 'さらに読み込む'}
+              </button>
+            </div>
+          ) : null}
         </aside>
 
         <section className="flex-1 space-y-6">
@@ -0,0 +1,50 @@
+import { NextResponse } from 'next/server'
+
+const ADMIN_KEY = process.env.ADMIN_API_KEY
+const PUBLIC_BASE = process.env.NEXT_PUBLIC_OSAKAMENESU_API_BASE || process.env.NEXT_PUBLIC_API_BASE || '/api'
+const INTERNAL_BASE = process.env.OSAKAMENESU_API_INTERNAL_BASE || process.env.API_INTERNAL_BASE || 'http://osakamenesu-api:8000'
+
+export const dynamic = 'force-dynamic'
+
+function bases() {
+  return [INTERNAL_BASE, PUBLIC_BASE]
+}
+
+// Relays the API's server-sent event stream; the browser cannot send the admin key itself.
+export async function GET(req: Request) {
+  if (!ADMIN_KEY) {
+    return NextResponse.json({ detail: 'admin key not configured' }, { status: 500 })
+  }
+  const headers: Record<string, string> = {
+    'X-Admin-Key': ADMIN_KEY,
+    Accept: 'text/event-stream',
+  }
+  const lastEventId = req.headers.get('last-event-id')
+  if (lastEventId) headers['Last-Event-ID'] = lastEventId
+
+  let lastStatus = 503
+  for (const base of bases()) {
+    try {
+      const resp = await fetch(`${base}/api/admin/reservations/events`, {
+        method: 'GET',
+        headers,
+        cache: 'no-store',
+        signal: req.signal,
+      })
+      if (resp.ok && resp.body) {
+        return new Response(resp.body, {
+          status: 200,
+          headers: {
+            'Content-Type': 'text/event-stream',
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no',
+          },
+        })
+      }
+      lastStatus = resp.status
+    } catch {
+      // try the next base
+    }
+  }
+  return NextResponse.json({ detail: 'admin reservation events unavailable' }, { status: lastStatus })
+}
@@ -12,15 +12,16 @@ function bases() {
   return [INTERNAL_BASE, PUBLIC_BASE]
 }
 
-export async function GET() {
+export async function GET(req: Request) {
   if (!ADMIN_KEY) {
     return NextResponse.json({ detail: 'admin key not configured' }, { status: 500 })
   }
+  const query = new URL(req.url).search
   const headers = { 'X-Admin-Key': ADMIN_KEY }
   let lastError: any = null
   for (const base of bases()) {
     try {
-      const resp = await fetch(`${base}/api/admin/shops`, {
+      const resp = await fetch(`${base}/api/admin/shops${query}`, {
         method: 'GET',
         headers,
         cache: 'no-store',
@@ -50,6 +50,7 @@ type FormState = {
   channels: DashboardNotificationChannels
   emailInput: string
   lineTokenInput: string
+  lineToInput: string
   slackUrlInput: string
 }
 
@@ -60,6 +61,7 @@ function buildInitialState(data: DashboardNotificationSettingsResponse): FormSta
     channels: JSON.parse(JSON.stringify(data.channels)) as DashboardNotificationChannels,
     emailInput: toRecipientsText(data.channels.email.recipients),
     lineTokenInput: data.channels.line.token ?? '',
+    lineToInput: data.channels.line.to ?? '',
     slackUrlInput: data.channels.slack.webhook_url ?? '',
   }
 }
@@ -90,10 +92,13 @@ function validateForm(state: FormState): { formError?: string; fieldErrors: Fiel
 
   if (channels.line.enabled) {
     const token = state.lineTokenInput.trim()
+    const to = state.lineToInput.trim()
     if (!token) {
-      fieldErrors.line = 'トークンを入力してください。'
-    } else if (token.length < 40 || token.length > 60 || !/^[0-9A-Za-z_-]+$/.test(token)) {
-      fieldErrors.line = 'LINE Notify トークンの形式が正しくありません。'
+      fieldErrors.line = 'チャネルアクセストークンを入力してください。'
+    } else if (token.length < 100 || token.length > 512 || !/^[0-9A-Za-z+/=._-]+$/.test(token)) {
+      fieldErrors.line = 'LINE チャネルアクセストークンの形式が正しくありません。'
+    } else if (!/^[UCR][0-9a-f]{32}$/.test(to)) {
+      fieldErrors.line = '送信先 ID (U/C/R から始まる 33 文字) を入力してください。'
     }
   }
 
@@ -122,6 +127,7 @@ function extractPayload(state: FormState): DashboardNotificationChannels {
     line: {
       enabled: state.channels.line.enabled,
       token: state.channels.line.enabled ? state.lineTokenInput.trim() || null : null,
+      to: state.channels.line.enabled ? state.lineToInput.trim() || null : null,
     },
     slack: {
       enabled: state.channels.slack.enabled,
@@ -137,6 +143,7 @@ function mergeConflict(conflict: DashboardNotificationSettingsResponse): FormSta
     channels: JSON.parse(JSON.stringify(conflict.channels)) as DashboardNotificationChannels,
     emailInput: toRecipientsText(conflict.channels.email.recipients),
     lineTokenInput: conflict.channels.line.token ?? '',
+    lineToInput: conflict.channels.line.to ?? '',
     slackUrlInput: conflict.channels.slack.webhook_url ?? '',
   }
 }
@@ -166,7 +173,7 @@ export function NotificationSettingsForm({ profileId, initialData }: Props) {
         [key]: { ...prev.channels[key], enabled: !prev.channels[key].enabled },
       }
       if (key === 'line' && !nextChannels.line.enabled) {
-        nextChannels.line = { enabled: false, token: null }
+        nextChannels.line = { enabled: false, token: null, to: null }
       }
       if (key === 'slack' && !nextChannels.slack.enabled) {
         nextChannels.slack = { enabled: false, webhook_url: null }
@@ -368,9 +375,11 @@ export function NotificationSettingsForm({ profileId, initialData }: Props) {
             />
             <div className="flex-1">
               <label htmlFor="channel-line" className="font-medium text-neutral-800">
-                LINE Notify
+                LINE
               </label>
-              <p className="text-sm text-neutral-600">店舗が取得した LINE Notify トークンを入力します。</p>
+              <p className="text-sm text-neutral-600">
+                店舗の LINE 公式アカウント (Messaging API) のチャネルアクセストークンと、通知を受け取るユーザーまたはグループの ID を入力します。
+              </p>
               <input
                 type="text"
                 className="mt-2 w-full rounded border border-neutral-300 px-3 py-2 text-sm disabled:bg-neutral-100"
@@ -382,7 +391,20 @@ export function NotificationSettingsForm({ profileId, initialData }: Props) {
                     lineTokenInput: event.target.value,
                   }))
                 }
-                placeholder="LINE Notify トークン"
+                placeholder="チャネルアクセストークン (長期)"
+              />
+              <input
+                type="text"
+                className="mt-2 w-full rounded border border-neutral-300 px-3 py-2 text-sm disabled:bg-neutral-100"
+                value={formState.lineToInput}
+                disabled={!formState.channels.line.enabled || isPending}
+                onChange={(event) =>
+                  setFormState((prev) => ({
+                    ...prev,
+                    lineToInput: event.target.value,
+                  }))
+                }
+                placeholder="送信先 ID (例: U0123...)"
               />
               {formState.channels.line.enabled && fieldErrors.line && (
                 <p className="mt-1 text-sm text-red-600">{fieldErrors.line}</p>
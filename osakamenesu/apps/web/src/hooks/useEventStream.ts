@@ -0,0 +1,63 @@
+"use client"
+
+import { useEffect, useRef, useState } from 'react'
+
+type Options = {
+  enabled?: boolean
+  retryMs?: number
+}
+
+type EventStreamResult = {
+  connected: boolean
+}
+
+/**
+ * Follows a server-sent event stream and calls `onEvent` with each named event.
+ * `connected` is false until the stream opens and whenever it drops, so callers
+ * can fall back to polling. The browser reconnects on its own after network
+ * errors; a stream the server refused is retried after `retryMs`.
+ */
+export function useEventStream(
+  url: string,
+  eventTypes: readonly string[],
+  onEvent: (type: string, event: MessageEvent) => void,
+  { enabled = true, retryMs = 30000 }: Options = {},
+): EventStreamResult {
+  const [connected, setConnected] = useState(false)
+  const onEventRef = useRef(onEvent)
+  onEventRef.current = onEvent
+  const typesKey = eventTypes.join(',')
+
+  useEffect(() => {
+    if (!enabled || typeof window === 'undefined' || typeof EventSource === 'undefined') return
+
+    let source: EventSource | null = null
+    let retryTimer: NodeJS.Timeout | null = null
+    let closed = false
+
+    const open = () => {
+      source = new EventSource(url)
+      source.onopen = () => setConnected(true)
+      source.onerror = () => {
+        setConnected(false)
+        if (source?.readyState === EventSource.CLOSED && !closed) {
+          source = null
+          retryTimer = setTimeout(open, retryMs)
+        }
+      }
+      typesKey.split(',').forEach(type => {
+        source?.addEventListener(type, event => onEventRef.current(type, event as MessageEvent))
+      })
+    }
+    open()
+
+    return () => {
+      closed = true
+      if (retryTimer) clearTimeout(retryTimer)
+      source?.close()
+      setConnected(false)
+    }
+  }, [enabled, url, typesKey, retryMs])
+
+  return { connected }
+}
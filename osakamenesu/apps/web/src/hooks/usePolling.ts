@@ -21,6 +21,9 @@ export function usePolling<T>(fetcher: () => Promise<T>, { intervalMs = 30000, e
   const timerRef = useRef<NodeJS.Timeout | null>(null)
   const fetcherRef = useRef(fetcher)
   fetcherRef.current = fetcher
+  // Read when a fetch settles, so one that was in flight when polling got disabled does not restart it.
+  const enabledRef = useRef(enabled)
+  enabledRef.current = enabled
 
   const clearTimer = () => {
     if (timerRef.current) {
@@ -41,13 +44,14 @@ export function usePolling<T>(fetcher: () => Promise<T>, { intervalMs = 30000, e
         else setError(new Error('polling failed'))
       } finally {
         setLoading(false)
-        if (enabled) {
+        if (enabledRef.current) {
+          if (timerRef.current) clearTimeout(timerRef.current)
           timerRef.current = setTimeout(run, intervalMs)
         }
       }
     }
     return run
-  }, [enabled, intervalMs])
+  }, [intervalMs])
 
   const refresh = () => {
     clearTimer()
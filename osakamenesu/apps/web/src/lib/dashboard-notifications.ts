@@ -14,7 +14,9 @@ export type DashboardNotificationChannelEmail = {
 
 export type DashboardNotificationChannelLine = {
   enabled: boolean
+  // LINE Messaging API channel access token and the user/group id to push to.
   token: string | null
+  to: string | null
 }
 
 export type DashboardNotificationChannelSlack = {
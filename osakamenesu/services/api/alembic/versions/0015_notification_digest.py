@@ -0,0 +1,33 @@
+"""add urgent_status to dashboard notification settings
+
+Revision ID: 0015_notification_digest
+Revises: 0014_add_profile_slug
+Create Date: 2025-10-20 00:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "0015_notification_digest"
+down_revision = "0014_add_profile_slug"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "dashboard_notification_settings",
+        sa.Column(
+            "urgent_status",
+            postgresql.ARRAY(sa.String(length=32)),
+            nullable=False,
+            server_default="{}",
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("dashboard_notification_settings", "urgent_status")
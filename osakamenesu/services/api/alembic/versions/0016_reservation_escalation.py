@@ -0,0 +1,43 @@
+"""schedule reservation escalations
+
+Revision ID: 0016_reservation_escalation
+Revises: 0015_notification_digest
+Create Date: 2025-10-20 00:10:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0016_reservation_escalation"
+down_revision = "0015_notification_digest"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("reservations", sa.Column("escalate_at", sa.DateTime(timezone=True), nullable=True))
+    op.add_column("reservations", sa.Column("escalated_at", sa.DateTime(timezone=True), nullable=True))
+
+    # Existing pending rows were alerted by the old poller on every pass; schedule
+    # them once, with the default 30-minute threshold, so the new worker picks
+    # them up a single time.
+    op.execute(
+        "UPDATE reservations SET escalate_at = created_at + interval '30 minutes' "
+        "WHERE status = 'pending'"
+    )
+
+    op.create_index(
+        "ix_reservations_escalation_due",
+        "reservations",
+        ["escalate_at"],
+        unique=False,
+        postgresql_where=sa.text("status = 'pending' AND escalated_at IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_reservations_escalation_due", table_name="reservations")
+    op.drop_column("reservations", "escalated_at")
+    op.drop_column("reservations", "escalate_at")
@@ -0,0 +1,38 @@
+"""partial indexes for live reservations and expiry scans
+
+Revision ID: 0017_reservation_expiry_indexes
+Revises: 0016_reservation_escalation
+Create Date: 2025-10-20 00:20:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0017_reservation_expiry_indexes"
+down_revision = "0016_reservation_escalation"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_reservations_live_slots",
+        "reservations",
+        ["shop_id", "desired_start", "desired_end"],
+        unique=False,
+        postgresql_where=sa.text("status IN ('pending', 'confirmed')"),
+    )
+    op.create_index(
+        "ix_reservations_pending_desired_end",
+        "reservations",
+        ["desired_end"],
+        unique=False,
+        postgresql_where=sa.text("status = 'pending'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_reservations_pending_desired_end", table_name="reservations")
+    op.drop_index("ix_reservations_live_slots", table_name="reservations")
@@ -0,0 +1,38 @@
+"""composite indexes for keyset pagination of admin listings
+
+Revision ID: 0018_admin_keyset_indexes
+Revises: 0017_reservation_expiry_indexes
+Create Date: 2025-10-20 00:30:00
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0018_admin_keyset_indexes"
+down_revision = "0017_reservation_expiry_indexes"
+branch_labels = None
+depends_on = None
+
+
+INDEXES = (
+    ("ix_reservations_created_at_id", "reservations", ["created_at", "id"]),
+    ("ix_reservations_status_created_at_id", "reservations", ["status", "created_at", "id"]),
+    ("ix_reservations_shop_created_at_id", "reservations", ["shop_id", "created_at", "id"]),
+    ("ix_reviews_created_at_id", "reviews", ["created_at", "id"]),
+    ("ix_reviews_status_created_at_id", "reviews", ["status", "created_at", "id"]),
+    ("ix_reviews_profile_created_at_id", "reviews", ["profile_id", "created_at", "id"]),
+)
+
+
+def upgrade() -> None:
+    # Built concurrently so the listings keep taking writes while they build.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
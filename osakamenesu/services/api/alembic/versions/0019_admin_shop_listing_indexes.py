@@ -0,0 +1,31 @@
+"""indexes for the paginated admin shop listing
+
+Revision ID: 0019_admin_shop_listing_indexes
+Revises: 0018_admin_keyset_indexes
+Create Date: 2025-10-20 00:40:00
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0019_admin_shop_listing_indexes"
+down_revision = "0018_admin_keyset_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_profiles_name_id ON profiles (name, id)")
+        # Backs the case-insensitive name prefix filter (lower(name) LIKE 'abc%').
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_profiles_lower_name_pattern "
+            "ON profiles (lower(name) text_pattern_ops)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_profiles_lower_name_pattern")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_profiles_name_id")
@@ -0,0 +1,162 @@
+"""monthly range partitions on ts for clicks, admin_logs and admin_change_logs
+
+Each table is converted without rewriting or long-locking it: the existing
+table is renamed and attached as the first partition (``<table>_legacy``,
+everything before the first monthly boundary). The expensive checks run
+beforehand outside the swap transaction: a NOT VALID range CHECK validated
+under a SHARE UPDATE EXCLUSIVE lock and a concurrently built (id, ts) unique
+index. ATTACH PARTITION and SET NOT NULL can then prove their constraints
+without scanning, so the ACCESS EXCLUSIVE swap is metadata-only. Monthly
+partitions after the legacy one are created here and kept ahead by
+``app.jobs.partitions``.
+
+Revision ID: 0020_partition_log_tables
+Revises: 0019_admin_shop_listing_indexes
+Create Date: 2025-10-20 01:00:00
+"""
+
+from datetime import date, datetime, timezone
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0020_partition_log_tables"
+down_revision = "0019_admin_shop_listing_indexes"
+branch_labels = None
+depends_on = None
+
+
+PREMAKE_MONTHS = 3
+
+TABLES = {
+    "clicks": {
+        "columns": """
+            id uuid NOT NULL,
+            outlink_id uuid REFERENCES outlinks (id) ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED,
+            ts timestamptz NOT NULL DEFAULT now(),
+            referer text,
+            ua text,
+            ip_hash varchar(128)
+        """,
+        "indexes": ["outlink_id", "ts", "ip_hash"],
+    },
+    "admin_logs": {
+        "columns": """
+            id uuid NOT NULL,
+            ts timestamptz NOT NULL DEFAULT now(),
+            method varchar(8),
+            path varchar(200),
+            ip_hash varchar(128),
+            admin_key_hash varchar(128),
+            details jsonb
+        """,
+        "indexes": ["ts", "path", "ip_hash"],
+    },
+    "admin_change_logs": {
+        "columns": """
+            id uuid NOT NULL,
+            ts timestamptz NOT NULL DEFAULT now(),
+            target_type varchar(64) NOT NULL,
+            target_id uuid,
+            action varchar(32) NOT NULL,
+            before_json jsonb,
+            after_json jsonb,
+            admin_key_hash varchar(128),
+            ip_hash varchar(128)
+        """,
+        "indexes": ["ts", "target_type", "target_id", "admin_key_hash", "ip_hash"],
+    },
+}
+
+
+def _add_months(value: date, months: int) -> date:
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _bound(month: date) -> str:
+    return f"'{month.isoformat()} 00:00:00+00'"
+
+
+def _is_partitioned(bind, table: str) -> bool:
+    relkind = bind.execute(
+        sa.text("SELECT relkind FROM pg_class WHERE oid = to_regclass(:table)"), {"table": table}
+    ).scalar()
+    return relkind == "p"
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+    inspector = sa.inspect(bind)
+    this_month = datetime.now(timezone.utc).date().replace(day=1)
+    # Rows written while the migration runs must still fit the legacy range.
+    boundary = _add_months(this_month, 1)
+
+    for table, spec in TABLES.items():
+        if not inspector.has_table(table) or _is_partitioned(bind, table):
+            continue
+        legacy = f"{table}_legacy"
+        check = f"{table}_legacy_range"
+
+        with op.get_context().autocommit_block():
+            op.execute(f"UPDATE {table} SET ts = to_timestamp(0) WHERE ts IS NULL")
+            op.execute(
+                f"ALTER TABLE {table} ADD CONSTRAINT {check} "
+                f"CHECK (ts IS NOT NULL AND ts < {_bound(boundary)}) NOT VALID"
+            )
+            op.execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {check}")
+            op.execute(f"CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS {table}_id_ts_key ON {table} (id, ts)")
+
+        op.execute("SET LOCAL lock_timeout = '10s'")
+        op.execute(f"LOCK TABLE {table} IN ACCESS EXCLUSIVE MODE")
+        # ATTACH only adopts an index for the parent's primary key if it backs a constraint.
+        op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {table}_id_ts_key UNIQUE USING INDEX {table}_id_ts_key")
+        op.execute(f"ALTER TABLE {table} RENAME TO {legacy}")
+        # Free the index names for the parent; the legacy indexes get attached to them.
+        index_names = bind.execute(
+            sa.text("SELECT indexname FROM pg_indexes WHERE schemaname = current_schema() AND tablename = :t"),
+            {"t": legacy},
+        ).scalars().all()
+        for name in index_names:
+            op.execute(f'ALTER INDEX "{name}" RENAME TO "{name[:56]}_legacy"')
+        op.execute(f"ALTER TABLE {legacy} ALTER COLUMN ts SET NOT NULL")
+
+        op.execute(
+            f"CREATE TABLE {table} ({spec['columns'].strip()}, "
+            f"CONSTRAINT {table}_pkey PRIMARY KEY (id, ts)) PARTITION BY RANGE (ts)"
+        )
+        for column in spec["indexes"]:
+            op.execute(f"CREATE INDEX ix_{table}_{column} ON {table} ({column})")
+        op.execute(f"ALTER TABLE {table} ATTACH PARTITION {legacy} FOR VALUES FROM (MINVALUE) TO ({_bound(boundary)})")
+        op.execute(f"ALTER TABLE {legacy} DROP CONSTRAINT {check}")
+
+        month = boundary
+        while month <= _add_months(this_month, PREMAKE_MONTHS):
+            op.execute(
+                f"CREATE TABLE {table}_p{month:%Y%m} PARTITION OF {table} "
+                f"FOR VALUES FROM ({_bound(month)}) TO ({_bound(_add_months(month, 1))})"
+            )
+            month = _add_months(month, 1)
+        op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+
+
+def downgrade() -> None:
+    # Copies every row back into a plain table: run during a maintenance window.
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+    for table, spec in TABLES.items():
+        if not _is_partitioned(bind, table):
+            continue
+        flat = f"{table}_flat"
+        op.execute(f"CREATE TABLE {flat} ({spec['columns'].strip()}, CONSTRAINT {flat}_pkey PRIMARY KEY (id))")
+        op.execute(f"INSERT INTO {flat} SELECT * FROM {table}")
+        op.execute(f"DROP TABLE {table} CASCADE")
+        op.execute(f"ALTER TABLE {flat} RENAME TO {table}")
+        op.execute(f"ALTER INDEX {flat}_pkey RENAME TO {table}_pkey")
+        for column in spec["indexes"]:
+            op.execute(f"CREATE INDEX ix_{table}_{column} ON {table} ({column})")
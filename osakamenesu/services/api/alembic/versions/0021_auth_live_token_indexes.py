@@ -0,0 +1,62 @@
+"""partial token_hash indexes covering only live auth tokens and sessions
+
+Lookups by token_hash only ever want unconsumed magic links and unrevoked
+sessions, so the full unique indexes are replaced by partial unique ones that
+stay small as dead rows accumulate between purges. Built CONCURRENTLY first so
+there is never a window without a usable index.
+
+Revision ID: 0021_auth_live_token_indexes
+Revises: 0020_partition_log_tables
+Create Date: 2025-10-20 01:10:00
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0021_auth_live_token_indexes"
+down_revision = "0020_partition_log_tables"
+branch_labels = None
+depends_on = None
+
+
+LIVE_INDEXES = (
+    ("ix_user_auth_tokens_live_token_hash", "user_auth_tokens", "consumed_at IS NULL"),
+    ("ix_user_sessions_live_token_hash", "user_sessions", "revoked_at IS NULL"),
+)
+
+
+def _token_hash_uniques(bind, table: str) -> list[str]:
+    inspector = sa.inspect(bind)
+    return [
+        constraint["name"]
+        for constraint in inspector.get_unique_constraints(table)
+        if constraint["column_names"] == ["token_hash"] and constraint["name"]
+    ]
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    with op.get_context().autocommit_block():
+        for name, table, predicate in LIVE_INDEXES:
+            op.execute(f"CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} (token_hash) WHERE {predicate}")
+        # Lets the purge find revoked sessions without scanning live ones.
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_user_sessions_revoked_at "
+            "ON user_sessions (revoked_at) WHERE revoked_at IS NOT NULL"
+        )
+        for _, table, _ in LIVE_INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS ix_{table}_token_hash")
+
+    for _, table, _ in LIVE_INDEXES:
+        for constraint in _token_hash_uniques(bind, table):
+            op.drop_constraint(constraint, table, type_="unique")
+
+
+def downgrade() -> None:
+    for _, table, _ in LIVE_INDEXES:
+        op.create_unique_constraint(f"{table}_token_hash_key", table, ["token_hash"])
+    op.drop_index("ix_user_sessions_revoked_at", table_name="user_sessions")
+    for name, table, _ in LIVE_INDEXES:
+        op.drop_index(name, table_name=table)
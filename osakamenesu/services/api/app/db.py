@@ -1,17 +1,269 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict
+
+from sqlalchemy import event, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from .settings import settings
 from . import models
+from . import metrics
+from . import slow_queries
+
+logger = logging.getLogger("app.db")
+
+
+# Connection-level info key holding how long opening that connection took, set by
+# the ``connect`` event and consumed by ``InstrumentedPool.connect``.
+_OPEN_SECONDS = "pool_open_seconds"
+_OPEN_STARTED = "pool_open_started"
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long callers wait for a connection.
+
+    Only the public ``Pool.connect()`` is wrapped. When the checkout had to open
+    a new connection, the time spent opening it (between the ``do_connect`` and
+    ``connect`` events, see ``_instrument``) is left out, so the histogram shows
+    queueing for a free slot rather than connection setup.
+    """
+
+    metrics_name = "primary"
+
+    def connect(self):  # type: ignore[override]
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            metrics.DB_POOL_CHECKOUT_TIMEOUTS.labels(self.metrics_name).inc()
+            metrics.DB_POOL_CHECKOUT_WAIT.labels(self.metrics_name).observe(time.perf_counter() - started)
+            raise
+        opening = connection.info.pop(_OPEN_SECONDS, 0.0)
+        metrics.DB_POOL_CHECKOUT_WAIT.labels(self.metrics_name).observe(
+            max(0.0, time.perf_counter() - started - opening)
+        )
+        return connection
+
+
+def _connect_args() -> Dict[str, Any]:
+    args: Dict[str, Any] = {
+        "prepared_statement_cache_size": int(getattr(settings, "db_prepared_statement_cache_size", 100)),
+    }
+    timeout_ms = int(getattr(settings, "db_statement_timeout_ms", 0) or 0)
+    if timeout_ms > 0:
+        args["server_settings"] = {"statement_timeout": str(timeout_ms)}
+    return args
+
+
+def _instrument(engine_: Any, name: str) -> None:
+    sync_engine = engine_.sync_engine
+    pool = sync_engine.pool
+    pool.metrics_name = name
+    in_use = metrics.DB_POOL_IN_USE.labels(name)
+    open_connections = metrics.DB_POOL_SIZE.labels(name)
+
+    @event.listens_for(sync_engine, "do_connect")
+    def _on_do_connect(dialect, connection_record, cargs, cparams) -> None:
+        connection_record.info[_OPEN_STARTED] = time.perf_counter()
+
+    @event.listens_for(pool, "connect")
+    def _on_connect(dbapi_connection, connection_record) -> None:
+        open_connections.inc()
+        started = connection_record.info.pop(_OPEN_STARTED, None)
+        if started is not None:
+            connection_record.info[_OPEN_SECONDS] = time.perf_counter() - started
+
+    @event.listens_for(pool, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+        in_use.inc()
+
+    @event.listens_for(pool, "checkin")
+    def _on_checkin(dbapi_connection, connection_record) -> None:
+        in_use.dec()
+
+    @event.listens_for(pool, "close")
+    def _on_close(dbapi_connection, connection_record) -> None:
+        open_connections.dec()
+
+
+_QUERY_OPERATIONS = {"select", "insert", "update", "delete", "with"}
+
+
+def _statement_operation(statement: str) -> str:
+    head = statement.lstrip()[:8].split(None, 1)
+    operation = head[0].lower() if head else ""
+    return operation if operation in _QUERY_OPERATIONS else "other"
+
+
+def _instrument_queries(sync_engine: Any) -> None:
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany) -> None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany) -> None:
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        metrics.DB_QUERY_DURATION.labels(_statement_operation(statement)).observe(elapsed)
+        slow_queries.record(statement, parameters, elapsed, getattr(cursor, "rowcount", None))
+        counter = metrics.request_query_count.get()
+        if counter is not None:
+            counter[0] += 1
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _on_error(context) -> None:
+        stack = context.connection.info.get("query_started") if context.connection is not None else None
+        if stack:
+            stack.pop()
+
+
+def create_engine(url: str, name: str):
+    engine = create_async_engine(
+        url,
+        echo=False,
+        future=True,
+        poolclass=InstrumentedPool,
+        pool_size=int(getattr(settings, "db_pool_size", 5)),
+        max_overflow=int(getattr(settings, "db_max_overflow", 10)),
+        pool_timeout=float(getattr(settings, "db_pool_timeout_seconds", 30.0)),
+        pool_recycle=int(getattr(settings, "db_pool_recycle_seconds", 1800)),
+        pool_pre_ping=bool(getattr(settings, "db_pool_pre_ping", True)),
+        connect_args=_connect_args(),
+    )
+    _instrument(engine, name)
+    _instrument_queries(engine.sync_engine)
+    return engine
+
 
+def pool_status(engine_: Any = None) -> Dict[str, Any]:
+    pool = (engine_ or engine).sync_engine.pool
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "timeout_seconds": pool.timeout(),
+    }
 
-engine = create_async_engine(settings.database_url, echo=False, future=True)
+
+engine = create_engine(settings.database_url, "primary")
 SessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
+_read_url = getattr(settings, "database_read_url", None)
+read_engine = create_engine(_read_url, "replica") if _read_url else None
+ReadSessionLocal = (
+    async_sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False) if read_engine else None
+)
+
+REPLICA_MAX_LAG_SECONDS = float(getattr(settings, "db_replica_max_lag_seconds", 10.0))
+REPLICA_CHECK_INTERVAL_SECONDS = float(getattr(settings, "db_replica_check_interval_seconds", 5.0))
+REPLICA_CHECK_TIMEOUT_SECONDS = 1.0
+
+# Lag is 0 when the replica has replayed everything it received, so an idle
+# primary (old replay timestamp, nothing to replay) does not look lagging.
+_REPLICA_LAG_SQL = text(
+    "SELECT CASE "
+    "WHEN NOT pg_is_in_recovery() THEN 0 "
+    "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+class _ReplicaHealth:
+    checked_at: float = float("-inf")
+    healthy: bool = False
+    lag_seconds: float | None = None
+
+
+_replica_health = _ReplicaHealth()
+
+
+async def _probe_replica() -> None:
+    assert read_engine is not None
+    try:
+        async with read_engine.connect() as conn:
+            lag = await asyncio.wait_for(conn.scalar(_REPLICA_LAG_SQL), REPLICA_CHECK_TIMEOUT_SECONDS)
+        lag_seconds = float(lag or 0.0)
+        healthy = lag_seconds <= REPLICA_MAX_LAG_SECONDS
+        if not healthy and _replica_health.healthy:
+            logger.warning("read replica lagging %.1fs; routing reads to primary", lag_seconds)
+        _replica_health.lag_seconds = lag_seconds
+        _replica_health.healthy = healthy
+    except Exception as exc:
+        if _replica_health.healthy:
+            logger.warning("read replica unavailable; routing reads to primary: %s", exc)
+        _replica_health.lag_seconds = None
+        _replica_health.healthy = False
+
+
+_probe_task: "asyncio.Task[None] | None" = None
+
+
+def replica_available() -> bool:
+    """Whether reads may go to the replica, from the last cached probe.
+
+    A stale verdict schedules a background re-probe instead of making the
+    request wait on it.
+    """
+    global _probe_task
+    if read_engine is None:
+        return False
+    now = time.monotonic()
+    if now - _replica_health.checked_at >= REPLICA_CHECK_INTERVAL_SECONDS and (
+        _probe_task is None or _probe_task.done()
+    ):
+        _replica_health.checked_at = now
+        try:
+            _probe_task = asyncio.get_running_loop().create_task(_probe_replica())
+        except RuntimeError:
+            pass
+    return _replica_health.healthy
+
+
+def is_replica_session(session: AsyncSession) -> bool:
+    return read_engine is not None and session.bind is read_engine
+
+
+async def release_session(db: AsyncSession) -> None:
+    """Hand a request's connection back to the pool before the route finishes.
+
+    Only for routes that keep running long after their last query, such as a
+    response that streams for minutes. Anything not yet committed is rolled
+    back. The session stays usable: a later query checks out a new connection.
+    """
+    await db.close()
+
 
 async def get_session() -> AsyncSession:
     async with SessionLocal() as session:
         yield session
 
 
+def _read_factory() -> AsyncSession:
+    if ReadSessionLocal is not None and replica_available():
+        return ReadSessionLocal()
+    return SessionLocal()
+
+
+async def get_read_session() -> AsyncSession:
+    """Session for read-only routes: the replica when healthy, else the primary."""
+    async with _read_factory() as session:
+        yield session
+
+
+@asynccontextmanager
+async def read_session_scope() -> AsyncIterator[AsyncSession]:
+    """Read session owned by a piece of work rather than a request.
+
+    Coalesced reads run on behalf of several requests, so they must not borrow
+    the session of whichever request happened to start them.
+    """
+    async with _read_factory() as session:
+        yield session
+
+
 async def init_db() -> None:
     """Create tables if they do not exist (dev convenience)."""
     async with engine.begin() as conn:
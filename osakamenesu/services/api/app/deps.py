@@ -65,7 +65,10 @@ async def get_optional_user(
         return None
 
     token_hash = hash_token(raw_token)
-    stmt = select(models.UserSession).where(models.UserSession.token_hash == token_hash)
+    stmt = select(models.UserSession).where(
+        models.UserSession.token_hash == token_hash,
+        models.UserSession.revoked_at.is_(None),
+    )
     result = await db.execute(stmt)
     session = result.scalar_one_or_none()
     if not session:
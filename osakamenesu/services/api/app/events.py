@@ -0,0 +1,248 @@
+"""Reservation events for the dashboard's server-sent event stream.
+
+Routes and jobs stage an event on their session before committing; it is only
+delivered once the transaction commits. With the ``memory`` backend the event
+goes straight to this process's broker, which is enough for a single API
+process. With ``postgres`` it is sent through ``NOTIFY`` inside the same
+transaction and every API process delivers it from one shared ``LISTEN``
+connection, so events from other replicas and from the job workers arrive too.
+
+The broker keeps the last ``BUFFER_SIZE`` events per shop, and across all shops
+for ``ALL_SHOPS`` subscribers (the admin dashboard), for ``Last-Event-ID``
+resume. Subscribers hold a small bounded queue; an idle stream is one parked
+task, and a subscriber that falls too far behind is told to reload instead of
+slowing the broker down.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import secrets
+import time
+from collections import OrderedDict, deque
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import event as sa_event, func, select
+from sqlalchemy.orm import Session
+
+from .metrics import DASHBOARD_EVENTS
+from .settings import settings
+
+logger = logging.getLogger("app.events")
+
+CHANNEL = "reservation_events"
+ALL_SHOPS = "*"
+BACKEND = str(getattr(settings, "dashboard_events_backend", "memory") or "memory").lower()
+BUFFER_SIZE = max(1, int(getattr(settings, "dashboard_events_buffer_size", 200) or 200))
+HEARTBEAT_SECONDS = max(1.0, float(getattr(settings, "dashboard_events_heartbeat_seconds", 15.0) or 15.0))
+QUEUE_SIZE = 100
+MAX_SHOPS = 2048
+RECONNECT_MAX_SECONDS = 30.0
+
+_PENDING_KEY = "reservation_events"
+
+
+@dataclass(frozen=True)
+class ReservationEvent:
+    id: str
+    type: str
+    shop_id: str
+    reservation_id: str
+    status: str
+    at: str
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, raw: str) -> "ReservationEvent":
+        return cls(**json.loads(raw))
+
+    def frame(self) -> str:
+        return f"id: {self.id}\nevent: {self.type}\ndata: {self.to_json()}\n\n"
+
+
+def reservation_event(
+    type: str,
+    shop_id: Any,
+    reservation_id: Any,
+    status: str,
+    at: Optional[datetime] = None,
+) -> ReservationEvent:
+    # Ids only need to be unique: resume looks them up, it never compares them.
+    return ReservationEvent(
+        id=f"{time.time_ns() // 1000}-{secrets.token_hex(3)}",
+        type=type,
+        shop_id=str(shop_id),
+        reservation_id=str(reservation_id),
+        status=status,
+        at=(at or datetime.now(timezone.utc)).isoformat(),
+    )
+
+
+class Subscription:
+    """One stream's view of a shop. ``None`` in the queue means "reload"."""
+
+    def __init__(self, shop_id: str, queue_size: int = QUEUE_SIZE) -> None:
+        self.shop_id = shop_id
+        self._queue: "asyncio.Queue[Optional[ReservationEvent]]" = asyncio.Queue(maxsize=queue_size)
+
+    def offer(self, item: Optional[ReservationEvent]) -> None:
+        try:
+            self._queue.put_nowait(item)
+        except asyncio.QueueFull:
+            # Whatever is queued is now incomplete; drop it and ask for a reload.
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            self._queue.put_nowait(None)
+
+    async def get(self, timeout: float) -> Optional[ReservationEvent]:
+        """Next event, ``None`` for a reload; raises ``asyncio.TimeoutError`` when idle."""
+        return await asyncio.wait_for(self._queue.get(), timeout)
+
+
+class ReservationEventBroker:
+    def __init__(self, buffer_size: int = BUFFER_SIZE, max_shops: int = MAX_SHOPS) -> None:
+        self.buffer_size = buffer_size
+        self.max_shops = max_shops
+        self._buffers: "OrderedDict[str, Deque[ReservationEvent]]" = OrderedDict()
+        self._recent: Deque[ReservationEvent] = deque(maxlen=buffer_size)
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+        self._listener: Optional["asyncio.Task[None]"] = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return sum(len(subs) for subs in self._subscribers.values())
+
+    def publish(self, event: ReservationEvent) -> None:
+        buffer = self._buffers.get(event.shop_id)
+        if buffer is None:
+            buffer = self._buffers[event.shop_id] = deque(maxlen=self.buffer_size)
+            while len(self._buffers) > self.max_shops:
+                self._buffers.popitem(last=False)
+        else:
+            self._buffers.move_to_end(event.shop_id)
+        buffer.append(event)
+        self._recent.append(event)
+        DASHBOARD_EVENTS.labels(event.type).inc()
+        for shop_id in (event.shop_id, ALL_SHOPS):
+            for subscription in self._subscribers.get(shop_id, ()):
+                subscription.offer(event)
+
+    def subscribe(
+        self, shop_id: str, last_event_id: Optional[str] = None
+    ) -> Tuple[Subscription, List[ReservationEvent], bool]:
+        """Register a stream and return ``(subscription, missed events, resumed)``.
+
+        ``shop_id`` may be ``ALL_SHOPS`` to follow every shop. ``resumed`` is
+        false when ``last_event_id`` is no longer buffered, in which case the
+        client has to reload before following the stream. Registration and the backlog snapshot happen without yielding, so no
+        event can fall between them.
+        """
+        subscription = Subscription(shop_id)
+        self._subscribers.setdefault(shop_id, set()).add(subscription)
+        if not last_event_id:
+            return subscription, [], True
+        buffered = list(self._recent if shop_id == ALL_SHOPS else self._buffers.get(shop_id, ()))
+        for index, event in enumerate(buffered):
+            if event.id == last_event_id:
+                return subscription, buffered[index + 1 :], True
+        return subscription, [], False
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subs = self._subscribers.get(subscription.shop_id)
+        if subs is None:
+            return
+        subs.discard(subscription)
+        if not subs:
+            del self._subscribers[subscription.shop_id]
+
+    def reset_all(self) -> None:
+        """Tell every stream to reload, e.g. after missing notifications."""
+        for subs in self._subscribers.values():
+            for subscription in subs:
+                subscription.offer(None)
+
+    # -- postgres LISTEN ---------------------------------------------------
+
+    def _on_notify(self, _connection: Any, _pid: int, _channel: str, payload: str) -> None:
+        try:
+            self.publish(ReservationEvent.from_json(payload))
+        except Exception as exc:  # pragma: no cover - defensive logging
+            logger.warning("dropping malformed reservation event: %s", exc)
+
+    async def _listen_forever(self) -> None:
+        import asyncpg
+
+        dsn = settings.database_url.replace("postgresql+asyncpg://", "postgresql://", 1)
+        backoff = 1.0
+        connected_before = False
+        while True:
+            try:
+                connection = await asyncpg.connect(dsn)
+            except Exception as exc:
+                logger.warning("reservation event listener connect failed: %s", exc)
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, RECONNECT_MAX_SECONDS)
+                continue
+            backoff = 1.0
+            try:
+                await connection.add_listener(CHANNEL, self._on_notify)
+                if connected_before:
+                    # Anything sent while we were disconnected is gone.
+                    self.reset_all()
+                connected_before = True
+                # A cheap ping per heartbeat notices a dead connection that
+                # would otherwise never report itself.
+                while True:
+                    await asyncio.sleep(HEARTBEAT_SECONDS)
+                    await connection.execute("SELECT 1")
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("reservation event listener lost: %s", exc)
+            finally:
+                if not connection.is_closed():
+                    connection.terminate()
+
+    def start(self) -> None:
+        if BACKEND == "postgres" and self._listener is None:
+            self._listener = asyncio.get_running_loop().create_task(self._listen_forever())
+
+    async def stop(self) -> None:
+        listener, self._listener = self._listener, None
+        if listener is not None:
+            listener.cancel()
+            try:
+                await listener
+            except asyncio.CancelledError:
+                pass
+
+
+broker = ReservationEventBroker()
+
+
+async def stage(session: Any, *events: ReservationEvent) -> None:
+    """Queue events on ``session``; they are delivered only if its transaction commits."""
+    if not events:
+        return
+    if BACKEND == "postgres":
+        for event in events:
+            await session.execute(select(func.pg_notify(CHANNEL, event.to_json())))
+        return
+    session.sync_session.info.setdefault(_PENDING_KEY, []).extend(events)
+
+
+@sa_event.listens_for(Session, "after_commit")
+def _deliver_staged(session: Session) -> None:
+    for event in session.info.pop(_PENDING_KEY, ()):
+        broker.publish(event)
+
+
+@sa_event.listens_for(Session, "after_rollback")
+def _discard_staged(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
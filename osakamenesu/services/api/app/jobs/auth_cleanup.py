@@ -0,0 +1,89 @@
+"""Purge dead magic-link tokens and sessions in small batches.
+
+Tokens are deleted once they have been expired for ``GRACE``; sessions once
+they have been expired or revoked for as long. The grace keeps recent tokens
+around for the magic-link rate limit, which counts rows issued in the last few
+minutes. Each batch deletes at most ``BATCH_SIZE`` rows by ``ctid`` in its own
+short transaction, so the purge never holds many row locks or bloats WAL in one
+go and the live ``token_hash`` indexes stay small enough to remain cached.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..db import SessionLocal
+from ..metrics import AUTH_CLEANUP_DELETED
+from ..settings import settings
+from .locks import try_advisory_xact_lock
+
+logger = logging.getLogger("app.jobs.auth_cleanup")
+
+LOCK_NAME = "auth.cleanup"
+GRACE = timedelta(minutes=max(10, int(getattr(settings, "auth_cleanup_grace_minutes", 60) or 60)))
+BATCH_SIZE = max(1, int(getattr(settings, "auth_cleanup_batch_size", 1000) or 1000))
+INTERVAL_SECONDS = max(1, int(getattr(settings, "auth_cleanup_interval_minutes", 60) or 60)) * 60
+
+# Table -> predicate on :cutoff selecting rows that can no longer authenticate.
+PURGE_CONDITIONS: Dict[str, str] = {
+    "user_auth_tokens": "expires_at < :cutoff",
+    "user_sessions": "expires_at < :cutoff OR revoked_at < :cutoff",
+}
+
+
+async def purge_batch(session: AsyncSession, table: str, cutoff: datetime, batch_size: int = BATCH_SIZE) -> Optional[int]:
+    """Delete up to ``batch_size`` dead rows from ``table``; ``None`` if another replica is purging."""
+    if not await try_advisory_xact_lock(session, LOCK_NAME):
+        await session.rollback()
+        return None
+    result = await session.execute(
+        text(
+            f"DELETE FROM {table} WHERE ctid IN "
+            f"(SELECT ctid FROM {table} WHERE {PURGE_CONDITIONS[table]} LIMIT :limit)"
+        ),
+        {"cutoff": cutoff, "limit": batch_size},
+    )
+    await session.commit()
+    return int(result.rowcount or 0)
+
+
+async def run_once(*, now: Optional[datetime] = None, batch_size: int = BATCH_SIZE) -> Dict[str, int]:
+    """Purge every table until a batch comes back short. Returns rows deleted per table."""
+    cutoff = (now or datetime.now(timezone.utc)) - GRACE
+    report: Dict[str, int] = {}
+    started = time.perf_counter()
+    for table in PURGE_CONDITIONS:
+        deleted = 0
+        while True:
+            async with SessionLocal() as session:
+                batch = await purge_batch(session, table, cutoff, batch_size)
+            if batch is None:
+                break
+            deleted += batch
+            AUTH_CLEANUP_DELETED.labels(table).inc(batch)
+            if batch < batch_size:
+                break
+        report[table] = deleted
+    logger.info(
+        "auth cleanup deleted %s in %.2fs (cutoff=%s)",
+        ", ".join(f"{table}={count}" for table, count in report.items()),
+        time.perf_counter() - started,
+        cutoff.isoformat(),
+    )
+    return report
+
+
+async def run_loop() -> None:
+    while True:
+        try:
+            await run_once()
+        except Exception as exc:
+            logger.exception("auth cleanup loop error: %s", exc)
+        await asyncio.sleep(INTERVAL_SECONDS)
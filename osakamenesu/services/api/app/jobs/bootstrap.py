@@ -0,0 +1,55 @@
+"""One-off deploy bootstrap: migrations, tables and search index settings.
+
+Run once per deploy (e.g. as a Cloud Run job) so API instances can start with
+``FAST_START=true`` and skip this work on every cold start.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from pathlib import Path
+
+from ..settings import settings
+
+logger = logging.getLogger("app.jobs.bootstrap")
+
+API_ROOT = Path(__file__).resolve().parents[2]
+
+
+def run_migrations() -> None:
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config(str(API_ROOT / "alembic.ini"))
+    config.set_main_option("script_location", str(API_ROOT / "alembic"))
+    command.upgrade(config, "head")
+
+
+async def _init_db() -> None:
+    from ..db import engine, init_db
+
+    try:
+        await init_db()
+    finally:
+        await engine.dispose()
+
+
+def run(*, migrate: bool = True, force_index_settings: bool = False) -> None:
+    started = time.perf_counter()
+    if migrate:
+        run_migrations()
+        logger.info("migrations applied (%.2fs)", time.perf_counter() - started)
+    if settings.init_db_on_startup:
+        asyncio.run(_init_db())
+        logger.info("tables ensured (%.2fs)", time.perf_counter() - started)
+
+    from ..meili import ensure_indexes
+
+    pushed = ensure_indexes(force=force_index_settings)
+    logger.info(
+        "search index settings %s (%.2fs)",
+        "applied" if pushed else "already current",
+        time.perf_counter() - started,
+    )
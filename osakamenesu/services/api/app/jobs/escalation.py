@@ -0,0 +1,196 @@
+"""Escalate reservations that are still pending once their ``escalate_at`` passes."""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, List, Optional
+from uuid import UUID
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .. import models
+from ..db import SessionLocal
+from ..notifications import (
+    ReservationNotification,
+    SLACK_WEBHOOK,
+    _Delivery,
+    build_deliveries,
+    dispatch,
+    http_client,
+    routing_from_setting,
+)
+from ..settings import settings
+from .locks import try_advisory_xact_lock
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger("app.jobs.escalation")
+
+LOCK_NAME = "reservations.escalation"
+THRESHOLD = timedelta(minutes=max(1, settings.escalation_pending_threshold_minutes))
+MAX_SLEEP_SECONDS = max(1, settings.escalation_check_interval_minutes) * 60
+BATCH_SIZE = max(1, int(getattr(settings, "escalation_batch_size", 100) or 100))
+# A claimed row is due again after this long unless its alerts went out.
+RETRY_AFTER = timedelta(seconds=max(1, int(getattr(settings, "escalation_retry_seconds", 300) or 300)))
+
+
+def escalation_due_at(created_at: datetime) -> datetime:
+    return created_at + THRESHOLD
+
+
+def _alert_delivery(payload: ReservationNotification, created_at: datetime) -> _Delivery:
+    return _Delivery(
+        "escalation_slack",
+        SLACK_WEBHOOK or "",
+        json={
+            "text": f":rotating_light: 未処理予約アラート ({payload.reservation_id})",
+            "attachments": [
+                {
+                    "color": "#ff0033",
+                    "fields": [
+                        {"title": "店舗", "value": payload.shop_name, "short": True},
+                        {"title": "顧客", "value": payload.customer_name, "short": True},
+                        {"title": "希望日時", "value": f"{payload.desired_start}〜", "short": False},
+                        {"title": "登録日時", "value": created_at.isoformat(), "short": False},
+                    ],
+                }
+            ],
+        },
+    )
+
+
+async def process_due(
+    session: AsyncSession,
+    client: httpx.AsyncClient,
+    *,
+    now: Optional[datetime] = None,
+    batch_size: int = BATCH_SIZE,
+) -> int:
+    """Claim and alert one batch of due reservations. Returns the batch size handled.
+
+    The batch is claimed in one short transaction: the due rows are selected
+    with ``FOR UPDATE SKIP LOCKED`` under an advisory lock, joined to each
+    shop's name and notification settings, and their ``escalate_at`` is pushed
+    ``RETRY_AFTER`` ahead before committing. The alerts are sent after that
+    commit, so no row lock is held while webhooks respond. Only reservations
+    whose alerts all went out get ``escalated_at``; the others, and the batch of
+    a worker that dies mid-send, come due again once the claim runs out.
+    """
+    now = now or datetime.now(timezone.utc)
+    if not await try_advisory_xact_lock(session, LOCK_NAME):
+        await session.rollback()
+        return 0
+
+    stmt = (
+        select(models.Reservation, models.Profile.name, models.DashboardNotificationSetting)
+        .join(models.Profile, models.Profile.id == models.Reservation.shop_id)
+        .outerjoin(
+            models.DashboardNotificationSetting,
+            models.DashboardNotificationSetting.profile_id == models.Reservation.shop_id,
+        )
+        .where(models.Reservation.status == 'pending')
+        .where(models.Reservation.escalated_at.is_(None))
+        .where(models.Reservation.escalate_at <= now)
+        .order_by(models.Reservation.escalate_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True, of=models.Reservation)
+    )
+    rows = (await session.execute(stmt)).all()
+    if not rows:
+        await session.commit()
+        return 0
+
+    # Build the alerts while the rows are loaded; the claim commit expires them otherwise.
+    alerts: List[tuple[UUID, List[_Delivery]]] = []
+    for reservation, shop_name, setting in rows:
+        payload = ReservationNotification(
+            reservation_id=str(reservation.id),
+            shop_id=str(reservation.shop_id),
+            shop_name=shop_name or 'unknown',
+            customer_name=reservation.customer_name,
+            customer_phone=reservation.customer_phone,
+            desired_start=reservation.desired_start.isoformat(),
+            desired_end=reservation.desired_end.isoformat(),
+            status=reservation.status,
+            channel=reservation.channel,
+            notes=reservation.notes,
+        )
+        routing = routing_from_setting(payload.shop_name, setting)
+        # Escalations are urgent by definition; never hold them in a digest.
+        deliveries = build_deliveries(payload, dataclasses.replace(routing, digest_seconds=()))
+        if SLACK_WEBHOOK:
+            deliveries.append(_alert_delivery(payload, reservation.created_at))
+        alerts.append((reservation.id, deliveries))
+
+    await session.execute(
+        update(models.Reservation)
+        .where(models.Reservation.id.in_([reservation_id for reservation_id, _ in alerts]))
+        .values(escalate_at=now + RETRY_AFTER)
+        .execution_options(synchronize_session=False)
+    )
+    await session.commit()
+
+    logger.warning("escalating %d pending reservations", len(alerts))
+    sent = await dispatch([d for _, deliveries in alerts for d in deliveries], client=client)
+    delivered: List[UUID] = []
+    offset = 0
+    for reservation_id, deliveries in alerts:
+        if all(sent[offset : offset + len(deliveries)]):
+            delivered.append(reservation_id)
+        offset += len(deliveries)
+    if len(delivered) < len(alerts):
+        logger.warning("%d escalations will be retried", len(alerts) - len(delivered))
+    if delivered:
+        await session.execute(
+            update(models.Reservation)
+            .where(models.Reservation.id.in_(delivered))
+            .where(models.Reservation.escalated_at.is_(None))
+            .values(escalated_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        await session.commit()
+    return len(alerts)
+
+
+async def next_due_at(session: AsyncSession) -> Optional[datetime]:
+    stmt = (
+        select(func.min(models.Reservation.escalate_at))
+        .where(models.Reservation.status == 'pending')
+        .where(models.Reservation.escalated_at.is_(None))
+    )
+    return (await session.execute(stmt)).scalar()
+
+
+async def run_once() -> int:
+    """Escalate every reservation that is already due. Returns how many were handled."""
+    total = 0
+    async with http_client() as client:
+        while True:
+            async with SessionLocal() as session:
+                handled = await process_due(session, client)
+            total += handled
+            if handled < BATCH_SIZE:
+                return total
+
+
+async def run_loop() -> None:
+    async with http_client() as client:
+        while True:
+            delay = float(MAX_SLEEP_SECONDS)
+            try:
+                async with SessionLocal() as session:
+                    handled = await process_due(session, client)
+                    if handled >= BATCH_SIZE:
+                        continue
+                    due = await next_due_at(session)
+                if due is not None:
+                    wait = (due - datetime.now(timezone.utc)).total_seconds()
+                    delay = min(delay, max(1.0, wait))
+            except Exception as exc:
+                logger.exception("escalation loop error: %s", exc)
+            await asyncio.sleep(delay)
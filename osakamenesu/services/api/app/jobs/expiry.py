@@ -0,0 +1,152 @@
+"""Move stale pending reservations to ``expired`` in set-based batches."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from sqlalchemy import insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .. import models
+from ..db import SessionLocal
+from ..events import reservation_event, stage
+from ..notifications import ReservationNotification, send_reservation_notification
+from ..settings import settings
+from .locks import try_advisory_xact_lock
+
+logger = logging.getLogger("app.jobs.expiry")
+
+LOCK_NAME = "reservations.expiry"
+GRACE = timedelta(minutes=max(0, int(getattr(settings, "reservation_expiry_grace_minutes", 0) or 0)))
+_SLA_HOURS = getattr(settings, "reservation_pending_sla_hours", None)
+PENDING_SLA: Optional[timedelta] = timedelta(hours=_SLA_HOURS) if _SLA_HOURS else None
+BATCH_SIZE = max(1, int(getattr(settings, "reservation_expiry_batch_size", 500) or 500))
+INTERVAL_SECONDS = max(1, int(getattr(settings, "reservation_expiry_interval_minutes", 5) or 5)) * 60
+
+
+def _expiry_condition(now: datetime):
+    conditions = [models.Reservation.desired_end <= now - GRACE]
+    if PENDING_SLA is not None:
+        conditions.append(models.Reservation.created_at <= now - PENDING_SLA)
+    return or_(*conditions)
+
+
+async def expire_batch(
+    session: AsyncSession,
+    *,
+    now: Optional[datetime] = None,
+    batch_size: int = BATCH_SIZE,
+) -> List[ReservationNotification]:
+    """Expire up to ``batch_size`` reservations and return their notification payloads."""
+    now = now or datetime.now(timezone.utc)
+    if not await try_advisory_xact_lock(session, LOCK_NAME):
+        await session.rollback()
+        return []
+
+    due_ids = (
+        select(models.Reservation.id)
+        .where(models.Reservation.status == 'pending')
+        .where(_expiry_condition(now))
+        .order_by(models.Reservation.desired_end)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    stmt = (
+        update(models.Reservation)
+        .where(models.Reservation.id.in_(due_ids.scalar_subquery()))
+        .values(status='expired', updated_at=now)
+        .returning(
+            models.Reservation.id,
+            models.Reservation.shop_id,
+            models.Reservation.customer_name,
+            models.Reservation.customer_phone,
+            models.Reservation.desired_start,
+            models.Reservation.desired_end,
+            models.Reservation.channel,
+            models.Reservation.notes,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    rows = (await session.execute(stmt)).all()
+    if not rows:
+        await session.commit()
+        return []
+
+    shop_names = dict(
+        (
+            await session.execute(
+                select(models.Profile.id, models.Profile.name).where(
+                    models.Profile.id.in_({row.shop_id for row in rows})
+                )
+            )
+        ).all()
+    )
+
+    await session.execute(
+        insert(models.ReservationStatusEvent),
+        [
+            {
+                "id": uuid.uuid4(),
+                "reservation_id": row.id,
+                "status": 'expired',
+                "changed_at": now,
+                "changed_by": "system",
+                "note": "auto-expired",
+            }
+            for row in rows
+        ],
+    )
+    await stage(
+        session,
+        *(reservation_event("reservation.status_changed", row.shop_id, row.id, 'expired', now) for row in rows),
+    )
+    await session.commit()
+
+    return [
+        ReservationNotification(
+            reservation_id=str(row.id),
+            shop_id=str(row.shop_id),
+            shop_name=shop_names.get(row.shop_id) or 'unknown',
+            customer_name=row.customer_name,
+            customer_phone=row.customer_phone,
+            desired_start=row.desired_start.isoformat(),
+            desired_end=row.desired_end.isoformat(),
+            status='expired',
+            channel=row.channel,
+            notes=row.notes,
+        )
+        for row in rows
+    ]
+
+
+async def run_once(*, now: Optional[datetime] = None) -> int:
+    """Drain every due reservation, notifying shops per batch. Returns the total expired."""
+    total = 0
+    while True:
+        async with SessionLocal() as session:
+            expired = await expire_batch(session, now=now)
+        if expired:
+            logger.info("expired %d pending reservations", len(expired))
+            results = await asyncio.gather(
+                *(send_reservation_notification(payload) for payload in expired),
+                return_exceptions=True,
+            )
+            for payload, result in zip(expired, results):
+                if isinstance(result, Exception):
+                    logger.warning("expiry notification failed (%s): %s", payload.reservation_id, result)
+        total += len(expired)
+        if len(expired) < BATCH_SIZE:
+            return total
+
+
+async def run_loop() -> None:
+    while True:
+        try:
+            await run_once()
+        except Exception as exc:
+            logger.exception("expiry loop error: %s", exc)
+        await asyncio.sleep(INTERVAL_SECONDS)
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+import zlib
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def advisory_lock_key(name: str) -> int:
+    """Map a job name to a stable signed 64-bit key for ``pg_*advisory*`` calls."""
+    value = zlib.crc32(name.encode("utf-8"))
+    return value - (1 << 32) if value >= (1 << 31) else value
+
+
+async def try_advisory_xact_lock(session: AsyncSession, name: str) -> bool:
+    """Take a transaction-scoped advisory lock; released on commit/rollback.
+
+    Returns ``False`` immediately when another replica already holds it.
+    """
+    result = await session.execute(
+        text("SELECT pg_try_advisory_xact_lock(:key)"),
+        {"key": advisory_lock_key(name)},
+    )
+    return bool(result.scalar())
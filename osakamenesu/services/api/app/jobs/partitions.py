@@ -0,0 +1,200 @@
+"""Create upcoming monthly partitions for the log tables and retire old ones.
+
+``clicks``, ``admin_logs`` and ``admin_change_logs`` are range-partitioned by
+month on ``ts`` (migration ``0020_partition_log_tables``). Each run makes sure
+the current month and the next ``PREMAKE_MONTHS`` have a partition, then drops
+(or, with ``log_partition_archive``, detaches) partitions that ended before the
+table's retention cutoff. Rows that arrive for a month without a partition land
+in the table's ``_default`` partition, which is reported so it stays empty.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..db import SessionLocal
+from ..settings import settings
+from .locks import try_advisory_xact_lock
+
+logger = logging.getLogger("app.jobs.partitions")
+
+LOCK_NAME = "log_partitions.maintain"
+RETENTION_MONTHS: Dict[str, int] = {
+    "clicks": max(1, int(getattr(settings, "clicks_retention_months", 13) or 13)),
+    "admin_logs": max(1, int(getattr(settings, "admin_logs_retention_months", 24) or 24)),
+    "admin_change_logs": max(1, int(getattr(settings, "admin_logs_retention_months", 24) or 24)),
+}
+PREMAKE_MONTHS = max(1, int(getattr(settings, "log_partition_premake_months", 3) or 3))
+ARCHIVE = bool(getattr(settings, "log_partition_archive", False))
+INTERVAL_SECONDS = max(1, int(getattr(settings, "log_partition_interval_hours", 24) or 24)) * 3600
+# DDL on a partition briefly locks the parent; never queue the hot-path inserts behind it for long.
+LOCK_TIMEOUT = "5s"
+
+_BOUND = re.compile(r"FROM \((?P<lower>[^)]*)\) TO \((?P<upper>[^)]*)\)")
+
+
+@dataclass
+class Partition:
+    name: str
+    lower: Optional[datetime]
+    upper: Optional[datetime]
+    is_default: bool = False
+
+
+@dataclass
+class MaintenanceResult:
+    created: List[str] = field(default_factory=list)
+    retired: List[str] = field(default_factory=list)
+    default_rows: int = 0
+
+
+def month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(value: date, months: int) -> date:
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month:%Y%m}"
+
+
+def _bound_literal(month: date) -> str:
+    return f"'{month.isoformat()} 00:00:00+00'"
+
+
+def _parse_bound(raw: str) -> Optional[datetime]:
+    raw = raw.strip()
+    if raw.upper() == "MINVALUE":
+        return None
+    return datetime.fromisoformat(raw.strip("'"))
+
+
+def parse_partition(name: str, bound: str) -> Partition:
+    if bound.strip().upper() == "DEFAULT":
+        return Partition(name, None, None, is_default=True)
+    match = _BOUND.search(bound)
+    if not match:
+        raise ValueError(f"unexpected partition bound for {name}: {bound}")
+    return Partition(name, _parse_bound(match["lower"]), _parse_bound(match["upper"]))
+
+
+async def list_partitions(session: AsyncSession, table: str) -> List[Partition]:
+    rows = await session.execute(
+        text(
+            "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) "
+            "FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass(:table)"
+        ),
+        {"table": table},
+    )
+    return [parse_partition(name, bound) for name, bound in rows.all()]
+
+
+async def _ensure_partitions(
+    session: AsyncSession, table: str, partitions: List[Partition], today: date
+) -> List[str]:
+    ranged = [p for p in partitions if not p.is_default]
+    covered_until = max((p.upper.date() for p in ranged if p.upper is not None), default=None)
+    # Months before the current one are never back-filled: their rows already
+    # sit in the default partition, which would make the CREATE fail.
+    month = max(filter(None, [covered_until, month_start(today)]))
+    last = add_months(month_start(today), PREMAKE_MONTHS)
+    created: List[str] = []
+    while month <= last:
+        name = partition_name(table, month)
+        await session.execute(
+            text(
+                f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{table}" '
+                f"FOR VALUES FROM ({_bound_literal(month)}) TO ({_bound_literal(add_months(month, 1))})"
+            )
+        )
+        created.append(name)
+        month = add_months(month, 1)
+    return created
+
+
+async def _retire_partitions(
+    session: AsyncSession, table: str, partitions: List[Partition], today: date
+) -> List[str]:
+    cutoff = add_months(month_start(today), -RETENTION_MONTHS[table])
+    retired: List[str] = []
+    for partition in partitions:
+        if partition.is_default or partition.upper is None or partition.upper.date() > cutoff:
+            continue
+        if ARCHIVE:
+            await session.execute(text(f'ALTER TABLE "{table}" DETACH PARTITION "{partition.name}"'))
+        else:
+            await session.execute(text(f'DROP TABLE "{partition.name}"'))
+        retired.append(partition.name)
+    return retired
+
+
+async def maintain(session: AsyncSession, *, today: Optional[date] = None) -> Dict[str, MaintenanceResult]:
+    """Run one maintenance pass over every partitioned log table in a single transaction."""
+    today = today or datetime.now(timezone.utc).date()
+    if not await try_advisory_xact_lock(session, LOCK_NAME):
+        await session.rollback()
+        return {}
+    # Bounds are rendered in the session time zone; pin it so they parse as UTC.
+    await session.execute(text("SET LOCAL timezone = 'UTC'"))
+    await session.execute(text(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'"))
+
+    results: Dict[str, MaintenanceResult] = {}
+    for table in RETENTION_MONTHS:
+        partitions = await list_partitions(session, table)
+        if not partitions:
+            continue
+        result = MaintenanceResult()
+        result.created = await _ensure_partitions(session, table, partitions, today)
+        result.retired = await _retire_partitions(session, table, partitions, today)
+        default = next((p for p in partitions if p.is_default), None)
+        if default is not None:
+            result.default_rows = int(
+                (await session.execute(text(f'SELECT count(*) FROM (SELECT 1 FROM "{default.name}" LIMIT 1000) d'))).scalar()
+                or 0
+            )
+        results[table] = result
+    await session.commit()
+    return results
+
+
+async def run_once(*, today: Optional[date] = None) -> Dict[str, MaintenanceResult]:
+    async with SessionLocal() as session:
+        results = await maintain(session, today=today)
+    for table, result in results.items():
+        if result.retired:
+            logger.info(
+                "%s %d partitions of %s: %s",
+                "detached" if ARCHIVE else "dropped",
+                len(result.retired),
+                table,
+                ", ".join(result.retired),
+            )
+        if result.default_rows:
+            logger.warning(
+                "%s_default holds %s%d rows; create the missing partitions and move them out",
+                table,
+                "at least " if result.default_rows >= 1000 else "",
+                result.default_rows,
+            )
+    return results
+
+
+async def run_loop() -> None:
+    while True:
+        try:
+            await run_once()
+        except Exception as exc:
+            logger.exception("partition maintenance error: %s", exc)
+        await asyncio.sleep(INTERVAL_SECONDS)
@@ -0,0 +1,352 @@
+"""Run the periodic background jobs on a schedule, once across all replicas.
+
+Every process may run a ``Scheduler`` (inside the API with
+``scheduler_enabled``, or as ``tools/scheduler_service.py``). Each job has a
+leader: the first process to take its session-level ``pg_try_advisory_lock``
+keeps it on one dedicated connection and runs every firing of that job; the
+others try again at each firing and skip it while the lock is held. A leader
+that dies drops its connection and with it the lock, so another replica takes
+over at the next firing.
+
+Schedules are five-field cron expressions evaluated in UTC or ``@every <n>s|m|h``
+intervals aligned to the epoch, so every replica computes the same firing
+times. Each firing is delayed by a random jitter (at most half the gap to the
+next firing) so replicas and jobs do not all hit the database at once. A firing
+that arrives while the previous run of the same job is still going is skipped.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import random
+import re
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, Iterable, List, Optional, Protocol, Set
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from ..metrics import JOB_LAST_SUCCESS, JOB_RUN_DURATION, JOB_SKIPPED, observe
+from ..settings import settings
+from .locks import advisory_lock_key
+
+logger = logging.getLogger("app.jobs.scheduler")
+
+JITTER_SECONDS = max(0.0, float(getattr(settings, "scheduler_jitter_seconds", 10.0) or 0.0))
+SCHEDULE_OVERRIDES: Dict[str, str] = dict(getattr(settings, "scheduler_schedules", None) or {})
+
+
+class Schedule(Protocol):
+    def next_after(self, now: datetime) -> datetime: ...
+
+
+@dataclass(frozen=True)
+class IntervalSchedule:
+    seconds: float
+
+    def __str__(self) -> str:
+        return f"@every {self.seconds:g}s"
+
+    def next_after(self, now: datetime) -> datetime:
+        ticks = math.floor(now.timestamp() / self.seconds) + 1
+        return datetime.fromtimestamp(ticks * self.seconds, tz=timezone.utc)
+
+
+# (name, lowest value, highest value); weekday 0 and 7 are both Sunday.
+_CRON_FIELDS = (("minute", 0, 59), ("hour", 0, 23), ("day", 1, 31), ("month", 1, 12), ("weekday", 0, 7))
+
+
+def _parse_cron_field(raw: str, name: str, low: int, high: int) -> FrozenSet[int]:
+    values: Set[int] = set()
+    for part in raw.split(","):
+        expr, _, step_raw = part.partition("/")
+        try:
+            step = int(step_raw) if step_raw else 1
+            if expr == "*":
+                start, end = low, high
+            elif "-" in expr:
+                start, end = (int(v) for v in expr.split("-", 1))
+            else:
+                start = int(expr)
+                end = high if step_raw else start
+        except ValueError:
+            raise ValueError(f"invalid cron {name} field: {raw!r}") from None
+        if step < 1 or not low <= start <= end <= high:
+            raise ValueError(f"invalid cron {name} field: {raw!r}")
+        values.update(range(start, end + 1, step))
+    if name == "weekday":
+        values = {value % 7 for value in values}
+    return frozenset(values)
+
+
+@dataclass(frozen=True)
+class CronSchedule:
+    expression: str
+    minutes: FrozenSet[int]
+    hours: FrozenSet[int]
+    days: FrozenSet[int]
+    months: FrozenSet[int]
+    weekdays: FrozenSet[int]
+    # Like cron, a restricted day-of-month and day-of-week match if either does.
+    day_or_weekday: bool
+
+    def __str__(self) -> str:
+        return self.expression
+
+    @classmethod
+    def parse(cls, expression: str) -> "CronSchedule":
+        fields = expression.split()
+        if len(fields) != len(_CRON_FIELDS):
+            raise ValueError(f"cron expression needs 5 fields: {expression!r}")
+        parsed = [_parse_cron_field(raw, *spec) for raw, spec in zip(fields, _CRON_FIELDS)]
+        return cls(expression, *parsed, day_or_weekday=fields[2] != "*" and fields[4] != "*")
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day = moment.day in self.days
+        weekday = (moment.weekday() + 1) % 7 in self.weekdays
+        return (day or weekday) if self.day_or_weekday else (day and weekday)
+
+    def next_after(self, now: datetime) -> datetime:
+        moment = now.astimezone(timezone.utc).replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = moment + timedelta(days=366 * 5)
+        while moment < limit:
+            if moment.month not in self.months:
+                year, month = (moment.year + 1, 1) if moment.month == 12 else (moment.year, moment.month + 1)
+                moment = moment.replace(year=year, month=month, day=1, hour=0, minute=0)
+            elif not self._day_matches(moment):
+                moment = (moment + timedelta(days=1)).replace(hour=0, minute=0)
+            elif moment.hour not in self.hours:
+                moment = (moment + timedelta(hours=1)).replace(minute=0)
+            elif moment.minute not in self.minutes:
+                moment += timedelta(minutes=1)
+            else:
+                return moment
+        raise ValueError(f"cron expression never fires: {self.expression!r}")
+
+
+_EVERY = re.compile(r"@every\s+(?P<count>\d+)\s*(?P<unit>[smh])")
+_UNIT_SECONDS = {"s": 1, "m": 60, "h": 3600}
+_ALIASES = {"@hourly": "0 * * * *", "@daily": "0 0 * * *", "@weekly": "0 0 * * 0", "@monthly": "0 0 1 * *"}
+
+
+def parse_schedule(expression: str) -> Schedule:
+    expression = expression.strip()
+    match = _EVERY.fullmatch(expression)
+    if match:
+        seconds = int(match["count"]) * _UNIT_SECONDS[match["unit"]]
+        if seconds <= 0:
+            raise ValueError(f"interval must be positive: {expression!r}")
+        return IntervalSchedule(seconds)
+    return CronSchedule.parse(_ALIASES.get(expression, expression))
+
+
+@dataclass
+class Job:
+    name: str
+    schedule: Schedule
+    run: Callable[[], Awaitable[Any]]
+    running: bool = field(default=False, init=False)
+
+
+class Leadership(Protocol):
+    async def acquire(self, name: str) -> bool: ...
+
+    async def close(self) -> None: ...
+
+
+class PgLeadership:
+    """Per-job session-level advisory locks held on one dedicated connection.
+
+    The connection comes from a private ``NullPool`` engine, never from the
+    request pool, so holding it for the life of the process costs that pool
+    nothing. The lock transaction is committed right away so the connection
+    never sits idle in a transaction between firings. A broken connection is
+    closed, which releases every lock it held, and leadership is re-contested on
+    the next firing.
+    """
+
+    def __init__(self, url: Optional[str] = None) -> None:
+        self._url = url or settings.database_url
+        self._engine: Optional[AsyncEngine] = None
+        self._conn: Optional[AsyncConnection] = None
+        self._held: Set[str] = set()
+        self._mutex = asyncio.Lock()
+
+    async def acquire(self, name: str) -> bool:
+        async with self._mutex:
+            try:
+                if self._conn is None:
+                    self._conn = await self.lock_engine().connect()
+                if name in self._held:
+                    # Still leading as long as the connection that holds the lock is alive.
+                    await self._conn.execute(text("SELECT 1"))
+                    await self._conn.commit()
+                    return True
+                acquired = bool(
+                    (
+                        await self._conn.execute(
+                            text("SELECT pg_try_advisory_lock(:key)"),
+                            {"key": advisory_lock_key(f"scheduler.{name}")},
+                        )
+                    ).scalar()
+                )
+                await self._conn.commit()
+            except Exception:
+                await self._drop()
+                raise
+            if acquired:
+                self._held.add(name)
+                logger.info("this process now leads job %s", name)
+            return acquired
+
+    def lock_engine(self) -> AsyncEngine:
+        if self._engine is None:
+            self._engine = create_async_engine(self._url, poolclass=NullPool)
+        return self._engine
+
+    async def _drop(self) -> None:
+        conn, self._conn = self._conn, None
+        self._held.clear()
+        if conn is not None:
+            try:
+                await conn.invalidate()
+                await conn.close()
+            except Exception:  # pragma: no cover - already broken
+                pass
+
+    async def close(self) -> None:
+        async with self._mutex:
+            conn = self._conn
+            if conn is not None:
+                try:
+                    # Hand leadership over explicitly rather than waiting for the backend to notice.
+                    await conn.execute(text("SELECT pg_advisory_unlock_all()"))
+                    await conn.commit()
+                    await conn.close()
+                    self._conn = None
+                    self._held.clear()
+                except Exception:
+                    await self._drop()
+            engine, self._engine = self._engine, None
+            if engine is not None:
+                await engine.dispose()
+
+
+class Scheduler:
+    def __init__(
+        self,
+        jobs: Iterable[Job] = (),
+        *,
+        leadership: Optional[Leadership] = None,
+        jitter_seconds: float = JITTER_SECONDS,
+    ) -> None:
+        self.jobs: Dict[str, Job] = {}
+        self.leadership: Leadership = leadership or PgLeadership()
+        self.jitter_seconds = jitter_seconds
+        self._loops: List["asyncio.Task[None]"] = []
+        self._runs: Set["asyncio.Task[str]"] = set()
+        for job in jobs:
+            self.add(job)
+
+    def add(self, job: Job) -> None:
+        if job.name in self.jobs:
+            raise ValueError(f"job {job.name!r} is already scheduled")
+        self.jobs[job.name] = job
+
+    async def run_job(self, job: Job) -> str:
+        """Run one firing of ``job`` if this process leads it. Returns the outcome."""
+        if job.running:
+            JOB_SKIPPED.labels(job.name, "overlap").inc()
+            logger.warning("job %s is still running; skipping this firing", job.name)
+            return "overlap"
+        job.running = True
+        try:
+            try:
+                leading = await self.leadership.acquire(job.name)
+            except Exception as exc:
+                JOB_SKIPPED.labels(job.name, "lock_error").inc()
+                logger.warning("job %s skipped, leader lock unavailable: %s", job.name, exc)
+                return "lock_error"
+            if not leading:
+                JOB_SKIPPED.labels(job.name, "follower").inc()
+                return "follower"
+            try:
+                with observe(JOB_RUN_DURATION, job.name):
+                    await job.run()
+            except Exception as exc:
+                logger.exception("job %s failed: %s", job.name, exc)
+                return "error"
+            JOB_LAST_SUCCESS.labels(job.name).set_to_current_time()
+            return "ok"
+        finally:
+            job.running = False
+
+    def _jitter(self, schedule: Schedule, due: datetime) -> float:
+        gap = (schedule.next_after(due) - due).total_seconds()
+        return random.uniform(0.0, min(self.jitter_seconds, gap / 2))
+
+    async def _job_loop(self, job: Job) -> None:
+        while True:
+            now = datetime.now(timezone.utc)
+            due = job.schedule.next_after(now)
+            await asyncio.sleep((due - now).total_seconds() + self._jitter(job.schedule, due))
+            # Runs in its own task so a slow run is noticed as an overlap at the next firing.
+            run = asyncio.get_running_loop().create_task(self.run_job(job))
+            self._runs.add(run)
+            run.add_done_callback(self._runs.discard)
+
+    def start(self) -> None:
+        if self._loops:
+            return
+        loop = asyncio.get_running_loop()
+        self._loops = [loop.create_task(self._job_loop(job)) for job in self.jobs.values()]
+        logger.info("scheduler started: %s", ", ".join(self.jobs) or "no jobs")
+
+    async def stop(self) -> None:
+        tasks = [*self._loops, *self._runs]
+        self._loops = []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await self.leadership.close()
+
+    async def run_forever(self) -> None:
+        self.start()
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await self.stop()
+
+
+def default_schedules() -> Dict[str, str]:
+    schedules = {
+        # Escalations are due at arbitrary times; poll often, each pass is one indexed query.
+        "escalation": "@every 30s",
+        "expiry": f"@every {max(1, int(getattr(settings, 'reservation_expiry_interval_minutes', 5) or 5))}m",
+        "auth_cleanup": f"@every {max(1, int(getattr(settings, 'auth_cleanup_interval_minutes', 60) or 60))}m",
+        "partitions": f"@every {max(1, int(getattr(settings, 'log_partition_interval_hours', 24) or 24))}h",
+    }
+    schedules.update(SCHEDULE_OVERRIDES)
+    return schedules
+
+
+def default_jobs() -> List[Job]:
+    """The built-in jobs; a job whose schedule is overridden with ``""`` is left out."""
+    from . import auth_cleanup, escalation, expiry, partitions
+
+    runners: Dict[str, Callable[[], Awaitable[Any]]] = {
+        "escalation": escalation.run_once,
+        "expiry": expiry.run_once,
+        "auth_cleanup": auth_cleanup.run_once,
+        "partitions": partitions.run_once,
+    }
+    schedules = default_schedules()
+    return [Job(name, parse_schedule(schedules[name]), run) for name, run in runners.items() if schedules.get(name)]
+
+
+def build_scheduler() -> Scheduler:
+    return Scheduler(default_jobs())
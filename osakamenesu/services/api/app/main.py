@@ -1,19 +1,25 @@
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, Depends, HTTPException, Request
+from fastapi import FastAPI, Depends, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from .settings import settings
 import logging
 from .meili import ensure_indexes
+from .metrics import PrometheusMiddleware, observe_redis_call, render_latest
+from .request_context import RequestContextMiddleware
+from .startup import StartupTimingMiddleware, record as record_startup, since_process_start
 from .utils.ratelimit import create_rate_limiter, shutdown_rate_limiter
 from .routers.profiles import router as profiles_router
 from .routers.admin import router as admin_router
+from .routers.admin_exports import router as admin_exports_router
 from .routers.shops import router as shops_router
 from .routers.reservations import router as reservations_router
 from .routers.auth import router as auth_router
 from .routers.favorites import router as favorites_router
 from .routers.dashboard_notifications import router as dashboard_notifications_router
 from .routers.dashboard_shops import router as dashboard_shops_router
+from .routers.dashboard_events import router as dashboard_events_router
+from .events import broker as reservation_events
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from .db import get_session
@@ -33,23 +39,55 @@ app_logger.propagate = False
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger = logging.getLogger("app.startup")
+    imports_done = since_process_start()
+    record_startup("imports", imports_done)
 
-    if settings.init_db_on_startup:
-        try:
-            from .db import init_db
+    if getattr(settings, "fast_start", False):
+        logger.info("fast start: skipping DB and search index bootstrap")
+    else:
+        if settings.init_db_on_startup:
+            try:
+                from .db import init_db
+
+                await init_db()
+            except Exception as exc:  # pragma: no cover - defensive logging
+                logger.warning("DB init error: %s", exc)
 
-            await init_db()
+        try:
+            ensure_indexes()
         except Exception as exc:  # pragma: no cover - defensive logging
-            logger.warning("DB init error: %s", exc)
+            logger.warning("Meili init error: %s", exc)
 
-    try:
-        ensure_indexes()
-    except Exception as exc:  # pragma: no cover - defensive logging
-        logger.warning("Meili init error: %s", exc)
+    reservation_events.start()
+    scheduler = None
+    if getattr(settings, "scheduler_enabled", False):
+        from .jobs.scheduler import build_scheduler
+
+        scheduler = build_scheduler()
+        scheduler.start()
+
+    ready = since_process_start()
+    record_startup("lifespan", ready)
+    logger.info(
+        "startup ready in %.3fs (imports %.3fs, lifespan %.3fs)",
+        ready,
+        imports_done,
+        ready - imports_done,
+    )
 
     yield
 
     await shutdown_rate_limiter(_outlink_rate)
+    await reservation_events.stop()
+    if scheduler is not None:
+        await scheduler.stop()
+
+    try:
+        from .notifications import flush_pending_digests
+
+        await flush_pending_digests()
+    except Exception as exc:  # pragma: no cover - defensive logging
+        logger.warning("notification digest flush error: %s", exc)
 
 
 app = FastAPI(title="Osaka Men-Esu API", version="0.1.0", lifespan=lifespan)
@@ -63,6 +101,7 @@ _outlink_rate = create_rate_limiter(
     redis_client=redis_client,
     namespace=settings.rate_limit_namespace,
     redis_error_cooldown=settings.rate_limit_redis_error_cooldown,
+    on_redis_call=observe_redis_call,
 )
 
 app.add_middleware(
@@ -74,11 +113,22 @@ app.add_middleware(
 )
 
 
+app.add_middleware(PrometheusMiddleware)
+app.add_middleware(RequestContextMiddleware)
+app.add_middleware(StartupTimingMiddleware)
+
+
 @app.get("/healthz")
 async def healthz():
     return {"ok": True}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics_endpoint() -> Response:
+    body, content_type = render_latest()
+    return Response(content=body, media_type=content_type)
+
+
 @app.get("/api/out/{token}")
 async def out_redirect(token: str, request: Request, db: AsyncSession = Depends(get_session)):
     """Resolve outlink token from DB and redirect. Optionally logs a click."""
@@ -111,9 +161,11 @@ async def out_redirect(token: str, request: Request, db: AsyncSession = Depends(
     return RedirectResponse(ol.target_url, status_code=302)
 app.include_router(profiles_router)
 app.include_router(admin_router)
+app.include_router(admin_exports_router)
 app.include_router(shops_router)
 app.include_router(reservations_router)
 app.include_router(auth_router)
 app.include_router(favorites_router)
 app.include_router(dashboard_notifications_router)
 app.include_router(dashboard_shops_router)
+app.include_router(dashboard_events_router)
@@ -1,11 +1,81 @@
-from typing import Any
+from __future__ import annotations
+
+import hashlib
+import json
+from functools import wraps
+from typing import TYPE_CHECKING, Any, Callable, Optional, TypeVar
 
-from meilisearch import Client
 from .settings import settings
+from .metrics import MEILI_REQUEST_DURATION, observe
+
+if TYPE_CHECKING:
+    from meilisearch import Client
 
 INDEX = "profiles"
+# Holds one document per index with the fingerprint of the settings last applied.
+META_INDEX = "app_meta"
+
+INDEX_SETTINGS: dict[str, Any] = {
+    "filterableAttributes": [
+        "area",
+        "bust_tag",
+        "service_type",
+        "body_tags",
+        "price_min",
+        "price_max",
+        "price_band",
+        "status",
+        "today",
+        "height_cm",
+        "age",
+        "ranking_badges",
+        "has_promotions",
+        "has_discounts",
+        "has_diaries",
+        "nearest_station",
+        "station_line",
+        "station_walk_minutes",
+        "id_rank",
+    ],
+    "sortableAttributes": [
+        "price_min",
+        "price_max",
+        "updated_at",
+        "ctr7d",
+        "today",
+        "height_cm",
+        "age",
+        "ranking_weight",
+        "ranking_score",
+        "review_score",
+        "review_count",
+        "id_rank",
+    ],
+    "searchableAttributes": ["name", "store_name", "area", "nearest_station", "station_line", "body_tags", "ranking_badges"],
+    # Keep default ranking rules; use `sort` at query time for ordering
+    "rankingRules": [
+        "words", "typo", "proximity", "attribute", "sort", "exactness"
+    ],
+}
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def _timed(operation: str) -> Callable[[F], F]:
+    def decorator(fn: F) -> F:
+        @wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with observe(MEILI_REQUEST_DURATION, operation):
+                return fn(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
 
 def get_client() -> Client:
+    # Deferred: the meilisearch/requests import chain is a noticeable share of cold start.
+    from meilisearch import Client
+
     return Client(settings.meili_host, settings.meili_master_key)
 
 
@@ -24,65 +94,58 @@ def _wait_for_task(task: Any, client: Client | None = None) -> None:
     (client or get_client()).wait_for_task(uid)
 
 
-def ensure_indexes() -> None:
+def settings_fingerprint(index_settings: dict[str, Any] | None = None) -> str:
+    raw = json.dumps(index_settings or INDEX_SETTINGS, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _stored_fingerprint(client: Client) -> Optional[str]:
+    try:
+        doc = client.index(META_INDEX).get_document(INDEX)
+    except Exception:
+        return None
+    if isinstance(doc, dict):
+        return doc.get("settings_fingerprint")
+    return getattr(doc, "settings_fingerprint", None)
+
+
+@_timed("ensure_indexes")
+def ensure_indexes(*, force: bool = False) -> bool:
+    """Create the index and apply INDEX_SETTINGS unless Meili already has them.
+
+    Returns True when settings were pushed. The fingerprint lookup is a single
+    document fetch, so an instance whose settings are current skips the
+    settings task and its ``wait_for_task`` entirely.
+    """
     client = get_client()
     try:
         client.get_index(INDEX)
     except Exception:
         create_task = client.create_index(INDEX, {"primaryKey": "id"})
         _wait_for_task(create_task, client)
-    idx = client.index(INDEX)
+        force = True
+    fingerprint = settings_fingerprint()
+    if not force and _stored_fingerprint(client) == fingerprint:
+        return False
     # Use default ranking rules and avoid invalid custom rules for Meilisearch v1.x
     # Custom ordering can be achieved via the `sort` parameter at query time.
-    settings_task = idx.update_settings({
-        "filterableAttributes": [
-            "area",
-            "bust_tag",
-            "service_type",
-            "body_tags",
-            "price_min",
-            "price_max",
-            "price_band",
-            "status",
-            "today",
-            "height_cm",
-            "age",
-            "ranking_badges",
-            "has_promotions",
-            "has_discounts",
-            "has_diaries",
-            "nearest_station",
-            "station_line",
-            "station_walk_minutes",
-        ],
-        "sortableAttributes": [
-            "price_min",
-            "price_max",
-            "updated_at",
-            "ctr7d",
-            "today",
-            "height_cm",
-            "age",
-            "ranking_weight",
-            "ranking_score",
-            "review_score",
-            "review_count",
-        ],
-        "searchableAttributes": ["name", "store_name", "area", "nearest_station", "station_line", "body_tags", "ranking_badges"],
-        # Keep default ranking rules; use `sort` at query time for ordering
-        "rankingRules": [
-            "words", "typo", "proximity", "attribute", "sort", "exactness"
-        ],
-    })
+    settings_task = client.index(INDEX).update_settings(INDEX_SETTINGS)
     _wait_for_task(settings_task, client)
+    # Not awaited: a lost write only means the next start re-applies settings.
+    client.index(META_INDEX).add_documents(
+        [{"id": INDEX, "settings_fingerprint": fingerprint}], primary_key="id"
+    )
+    return True
 
 
+@_timed("index_profile")
 def index_profile(doc: dict):
     client = get_client()
     task = client.index(INDEX).add_documents([doc])
     _wait_for_task(task, client)
 
 
+@_timed("index_bulk")
 def index_bulk(docs: list[dict]):
     if not docs:
         return
@@ -91,12 +154,14 @@ def index_bulk(docs: list[dict]):
     _wait_for_task(task, client)
 
 
+@_timed("delete_profile")
 def delete_profile(doc_id: str):
     client = get_client()
     task = client.index(INDEX).delete_document(doc_id)
     _wait_for_task(task, client)
 
 
+@_timed("purge_all")
 def purge_all():
     """Delete all documents in the index (keeps settings)."""
     client = get_client()
@@ -163,6 +228,40 @@ def build_filter(
     return " AND ".join(parts)
 
 
+def _filter_literal(value: Any) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    escaped = str(value).replace("\\", "\\\\").replace("'", "\\'")
+    return f"'{escaped}'"
+
+
+def build_after_filter(sort: list[str], values: list[Any], tiebreak: int) -> str:
+    """Filter for the documents that come strictly after a hit in ``sort`` order.
+
+    ``values`` are the hit's values for each ``attr:dir`` in ``sort`` and
+    ``tiebreak`` its ``id_rank``, which callers must append as the final
+    ``id_rank:asc`` sort. Meilisearch places null sort values last in either
+    direction, so a null key only ever ties with other nulls.
+    """
+    branches: list[str] = []
+    equal: list[str] = []
+    for spec, value in zip(sort, values):
+        attr, _, direction = spec.partition(":")
+        if value is None:
+            equal.append(f"({attr} IS NULL OR {attr} NOT EXISTS)")
+            continue
+        op = "<" if direction == "desc" else ">"
+        literal = _filter_literal(value)
+        after = f"{attr} {op} {literal} OR {attr} IS NULL OR {attr} NOT EXISTS"
+        branches.append(" AND ".join(equal + [f"({after})"]))
+        equal.append(f"{attr} = {literal}")
+    branches.append(" AND ".join(equal + [f"id_rank > {tiebreak}"]))
+    return " OR ".join(f"({branch})" for branch in branches)
+
+
+@_timed("search")
 def search(
     q: str | None,
     filter_expr: str | None,
@@ -170,11 +269,19 @@ def search(
     page: int,
     page_size: int,
     facets: list[str] | None = None,
+    attributes: list[str] | None = None,
+    *,
+    after: str | None = None,
 ) -> dict:
+    """Run a search; ``after`` (from :func:`build_after_filter`) replaces the offset."""
     idx = get_client().index(INDEX)
-    options: dict = {"limit": page_size, "offset": (page - 1) * page_size}
+    options: dict = {"limit": page_size, "offset": 0 if after else (page - 1) * page_size}
+    if after:
+        filter_expr = f"({filter_expr}) AND ({after})" if filter_expr else after
     if filter_expr:
         options["filter"] = filter_expr
+    if attributes:
+        options["attributesToRetrieve"] = attributes
     if sort:
         if isinstance(sort, list):
             options["sort"] = sort
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a connection from the SQLAlchemy pool.",
+    ["pool"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+DB_POOL_CHECKOUT_TIMEOUTS = Counter(
+    "db_pool_checkout_timeouts_total",
+    "Connection checkouts that gave up after pool_timeout.",
+    ["pool"],
+)
+DB_POOL_IN_USE = Gauge(
+    "db_pool_connections_in_use",
+    "Connections currently checked out of the pool.",
+    ["pool"],
+)
+DB_POOL_SIZE = Gauge(
+    "db_pool_connections_open",
+    "Connections currently held open by the pool (idle and in use).",
+    ["pool"],
+)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ["method", "route"],
+)
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP responses by route template and status code.",
+    ["method", "route", "status"],
+)
+STARTUP_SECONDS = Gauge(
+    "app_startup_seconds",
+    "Seconds since process start at the end of each cold-start phase.",
+    ["phase"],
+)
+HTTP_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being handled.",
+    ["method"],
+)
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "Database statement execution time.",
+    ["operation"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request",
+    "Database statements issued while handling one HTTP request.",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89),
+)
+MEILI_REQUEST_DURATION = Histogram(
+    "meili_request_duration_seconds",
+    "Meilisearch call latency.",
+    ["operation", "outcome"],
+)
+REDIS_COMMAND_DURATION = Histogram(
+    "redis_command_duration_seconds",
+    "Redis round trips made by the rate limiter.",
+    ["operation", "outcome"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+NOTIFICATION_POST_DURATION = Histogram(
+    "notification_post_duration_seconds",
+    "Outbound notification webhook latency.",
+    ["kind", "outcome"],
+)
+COALESCED_CALLS = Counter(
+    "coalesced_calls_total",
+    "Read calls by single-flight outcome (leader ran it, shared a result, bypassed a full key).",
+    ["name", "outcome"],
+)
+AUTH_CLEANUP_DELETED = Counter(
+    "auth_cleanup_deleted_rows_total",
+    "Expired, consumed or revoked auth rows purged by the cleanup job.",
+    ["table"],
+)
+JOB_RUN_DURATION = Histogram(
+    "job_run_duration_seconds",
+    "Scheduled background job run time on the replica leading the job.",
+    ["job", "outcome"],
+    buckets=(0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 900.0),
+)
+JOB_SKIPPED = Counter(
+    "job_skipped_total",
+    "Scheduled job firings not run here: another replica leads the job, the lock could not be checked, or the last run was still going.",
+    ["job", "reason"],
+)
+JOB_LAST_SUCCESS = Gauge(
+    "job_last_success_timestamp_seconds",
+    "Unix time of the last successful run of a scheduled job in this process.",
+    ["job"],
+)
+DASHBOARD_EVENT_STREAMS = Gauge(
+    "dashboard_event_streams",
+    "Open dashboard reservation event streams in this process.",
+)
+DASHBOARD_EVENTS = Counter(
+    "dashboard_events_total",
+    "Reservation events delivered to this process's dashboard broker.",
+    ["type"],
+)
+
+# Per-request statement counter; the middleware installs a fresh one-element
+# list and the engine listeners increment it in place.
+request_query_count: ContextVar[Optional[List[int]]] = ContextVar("request_query_count", default=None)
+
+
+@contextmanager
+def observe(histogram: Histogram, *labels: str) -> Iterator[None]:
+    """Time a block into ``histogram`` with an extra trailing ``outcome`` label."""
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        histogram.labels(*labels, outcome).observe(time.perf_counter() - started)
+
+
+def observe_redis_call(operation: str, seconds: float, ok: bool) -> None:
+    REDIS_COMMAND_DURATION.labels(operation, "ok" if ok else "error").observe(seconds)
+
+
+def coalesce_observer(name: str) -> Callable[[str], None]:
+    return lambda outcome: COALESCED_CALLS.labels(name, outcome).inc()
+
+
+def _route_label(scope: Dict[str, Any]) -> str:
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    return path or "unmatched"
+
+
+class PrometheusMiddleware:
+    """ASGI middleware recording latency, status codes and in-flight requests per route."""
+
+    def __init__(self, app: Any, *, skip_paths: tuple[str, ...] = ("/metrics",)) -> None:
+        self.app = app
+        self.skip_paths = skip_paths
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http" or scope.get("path") in self.skip_paths:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope.get("method", "GET")
+        status_code = 500
+
+        async def send_wrapper(message: Dict[str, Any]) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        counter = [0]
+        token = request_query_count.set(counter)
+        in_flight = HTTP_IN_FLIGHT.labels(method)
+        in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            in_flight.dec()
+            request_query_count.reset(token)
+            route = _route_label(scope)
+            HTTP_REQUEST_DURATION.labels(method, route).observe(elapsed)
+            HTTP_REQUESTS.labels(method, route, str(status_code)).inc()
+            DB_QUERIES_PER_REQUEST.labels(route).observe(counter[0])
+
+
+def render_latest() -> tuple[bytes, str]:
+    return generate_latest(), CONTENT_TYPE_LATEST
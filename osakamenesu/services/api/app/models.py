@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from sqlalchemy.orm import declarative_base, relationship, Mapped, mapped_column
-from sqlalchemy import String, Text, Integer, Enum, DateTime, ForeignKey, Date, Boolean, UniqueConstraint, Float
+from sqlalchemy import String, Text, Integer, Enum, DateTime, ForeignKey, Date, Boolean, UniqueConstraint, Float, Index, column, func, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB, ARRAY
 import uuid
 from datetime import datetime, date, UTC
@@ -28,6 +28,15 @@ def now_utc() -> datetime:
 
 class Profile(Base):
     __tablename__ = 'profiles'
+    __table_args__ = (
+        Index('ix_profiles_name_id', 'name', 'id'),
+        # Backs the case-insensitive name prefix filter (lower(name) LIKE 'abc%').
+        Index(
+            'ix_profiles_lower_name_pattern',
+            func.lower(column('name')).label('lower_name'),
+            postgresql_ops={'lower_name': 'text_pattern_ops'},
+        ),
+    )
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     slug: Mapped[str | None] = mapped_column(String(160), unique=True, index=True, nullable=True)
     name: Mapped[str] = mapped_column(String(160), nullable=False)
@@ -88,10 +97,14 @@ class User(Base):
 
 class UserAuthToken(Base):
     __tablename__ = 'user_auth_tokens'
+    # Lookups only ever want unconsumed tokens and must repeat this predicate to use the index.
+    __table_args__ = (
+        Index('ix_user_auth_tokens_live_token_hash', 'token_hash', unique=True, postgresql_where=text('consumed_at IS NULL')),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey('users.id', ondelete='CASCADE'), index=True)
-    token_hash: Mapped[str] = mapped_column(String(128), unique=True, index=True)
+    token_hash: Mapped[str] = mapped_column(String(128))
     expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True)
     consumed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     ip_hash: Mapped[str | None] = mapped_column(String(128), nullable=True)
@@ -103,10 +116,14 @@ class UserAuthToken(Base):
 
 class UserSession(Base):
     __tablename__ = 'user_sessions'
+    __table_args__ = (
+        Index('ix_user_sessions_live_token_hash', 'token_hash', unique=True, postgresql_where=text('revoked_at IS NULL')),
+        Index('ix_user_sessions_revoked_at', 'revoked_at', postgresql_where=text('revoked_at IS NOT NULL')),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey('users.id', ondelete='CASCADE'), index=True)
-    token_hash: Mapped[str] = mapped_column(String(128), unique=True, index=True)
+    token_hash: Mapped[str] = mapped_column(String(128))
     issued_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=now_utc, nullable=False)
     expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
     revoked_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
@@ -171,7 +188,8 @@ class Click(Base):
     __tablename__ = 'clicks'
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     outlink_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey('outlinks.id', ondelete='CASCADE'), index=True)
-    ts: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=now_utc, index=True)
+    # Partitioned by month on ts (see app.jobs.partitions), which must be part of the key.
+    ts: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True, default=now_utc, index=True)
     referer: Mapped[str | None] = mapped_column(Text)
     ua: Mapped[str | None] = mapped_column(Text)
     ip_hash: Mapped[str | None] = mapped_column(String(128), index=True)
@@ -202,6 +220,9 @@ class Review(Base):
     __tablename__ = 'reviews'
     __table_args__ = (
         UniqueConstraint('profile_id', 'external_id', name='uq_reviews_profile_external'),
+        Index('ix_reviews_created_at_id', 'created_at', 'id'),
+        Index('ix_reviews_status_created_at_id', 'status', 'created_at', 'id'),
+        Index('ix_reviews_profile_created_at_id', 'profile_id', 'created_at', 'id'),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -226,6 +247,9 @@ class DashboardNotificationSetting(Base):
         UUID(as_uuid=True), ForeignKey('profiles.id', ondelete='CASCADE'), primary_key=True
     )
     trigger_status: Mapped[list[str]] = mapped_column(ARRAY(String(32)), nullable=False, default=list)
+    urgent_status: Mapped[list[str]] = mapped_column(
+        ARRAY(String(32)), nullable=False, default=list, server_default='{}'
+    )
     channels: Mapped[dict[str, Any]] = mapped_column(JSONB, nullable=False, default=dict)
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=now_utc, nullable=False)
     updated_by: Mapped[Optional[uuid.UUID]] = mapped_column(
@@ -239,7 +263,7 @@ class DashboardNotificationSetting(Base):
 class AdminLog(Base):
     __tablename__ = 'admin_logs'
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    ts: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=now_utc, index=True)
+    ts: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True, default=now_utc, index=True)
     method: Mapped[str] = mapped_column(String(8))
     path: Mapped[str] = mapped_column(String(200), index=True)
     ip_hash: Mapped[str | None] = mapped_column(String(128), index=True)
@@ -251,7 +275,7 @@ class AdminChangeLog(Base):
     __tablename__ = 'admin_change_logs'
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    ts: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=now_utc, index=True)
+    ts: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True, default=now_utc, index=True)
     target_type: Mapped[str] = mapped_column(String(64), index=True)
     target_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), nullable=True, index=True)
     action: Mapped[str] = mapped_column(String(32))
@@ -282,6 +306,31 @@ class Reservation(Base):
     customer_remark: Mapped[str | None] = mapped_column(Text)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=now_utc, nullable=False)
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=now_utc, onupdate=now_utc, nullable=False)
+    escalate_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    escalated_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index(
+            'ix_reservations_escalation_due',
+            'escalate_at',
+            postgresql_where=text("status = 'pending' AND escalated_at IS NULL"),
+        ),
+        Index(
+            'ix_reservations_live_slots',
+            'shop_id',
+            'desired_start',
+            'desired_end',
+            postgresql_where=text("status IN ('pending', 'confirmed')"),
+        ),
+        Index(
+            'ix_reservations_pending_desired_end',
+            'desired_end',
+            postgresql_where=text("status = 'pending'"),
+        ),
+        Index('ix_reservations_created_at_id', 'created_at', 'id'),
+        Index('ix_reservations_status_created_at_id', 'status', 'created_at', 'id'),
+        Index('ix_reservations_shop_created_at_id', 'shop_id', 'created_at', 'id'),
+    )
 
     status_events: Mapped[list['ReservationStatusEvent']] = relationship(
         back_populates='reservation', cascade='all, delete-orphan', order_by='ReservationStatusEvent.changed_at'
@@ -3,18 +3,28 @@ from __future__ import annotations
 import asyncio
 import logging
 import json
-from dataclasses import dataclass
-from typing import Optional, Dict, Any
-
-import httpx
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Optional, Dict, Any, Awaitable, Callable, List, Set
 
+from .metrics import NOTIFICATION_POST_DURATION, observe
 from .settings import settings
+from .utils.cache import TTLCache
+
+if TYPE_CHECKING:
+    import httpx
 
 logger = logging.getLogger("app.notifications")
 
 SLACK_WEBHOOK = getattr(settings, "slack_webhook_url", None)
 EMAIL_ENDPOINT = getattr(settings, "notify_email_endpoint", None)
 LINE_ENDPOINT = getattr(settings, "notify_line_endpoint", None)
+LINE_PUSH_API = getattr(settings, "notify_line_api_url", None) or "https://api.line.me/v2/bot/message/push"
+# Messaging API rejects text messages longer than this.
+LINE_TEXT_LIMIT = 5000
+MAX_CONCURRENCY = max(1, int(getattr(settings, "notify_max_concurrency", 10) or 10))
+ROUTING_CACHE_TTL = float(getattr(settings, "notify_settings_cache_ttl_seconds", 300.0) or 0.0)
+
+DEFAULT_TRIGGER_STATUS = ("pending", "confirmed")
 
 
 @dataclass
@@ -31,64 +41,454 @@ class ReservationNotification:
     notes: Optional[str] = None
 
 
-async def _post_json(url: str, payload: Dict[str, Any]) -> None:
-    async with httpx.AsyncClient(timeout=5.0) as client:
-        await client.post(url, json=payload)
+@dataclass(frozen=True)
+class LinePushTarget:
+    """A shop's LINE Messaging API channel: who to push to, and with which channel access token."""
+
+    to: str
+    token: str
+
+
+@dataclass(frozen=True)
+class ShopNotificationRouting:
+    """Per-shop delivery targets resolved from ``DashboardNotificationSetting``."""
+
+    shop_name: str = ""
+    trigger_status: frozenset[str] = frozenset(DEFAULT_TRIGGER_STATUS)
+    email_recipients: tuple[str, ...] = ()
+    line: Optional[LinePushTarget] = None
+    slack_webhook_url: Optional[str] = None
+    urgent_status: frozenset[str] = frozenset()
+    digest_seconds: tuple[tuple[str, int], ...] = ()
+
+    def wants(self, status: str) -> bool:
+        return status in self.trigger_status
+
+    def digest_window(self, channel: str) -> int:
+        for name, seconds in self.digest_seconds:
+            if name == channel:
+                return seconds
+        return 0
+
+
+@dataclass
+class _Delivery:
+    kind: str
+    url: str
+    json: Optional[Dict[str, Any]] = None
+    data: Optional[Dict[str, Any]] = None
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+RoutingLoader = Callable[[str], Awaitable[ShopNotificationRouting]]
+
+_routing_cache: TTLCache[str, ShopNotificationRouting] = TTLCache(ROUTING_CACHE_TTL, max_entries=5000)
+# Bumped by every invalidation, so a load that overlaps one is not cached.
+_routing_generations: Dict[str, int] = {}
+_semaphore: asyncio.Semaphore | None = None
+_background_tasks: Set[asyncio.Task] = set()
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    global _semaphore
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+    return _semaphore
+
+
+def routing_from_setting(shop_name: str, setting: Any) -> ShopNotificationRouting:
+    """Build routing from a settings row (or ``None`` when the shop never configured one)."""
+    if setting is None:
+        return ShopNotificationRouting(shop_name=shop_name)
+
+    trigger_status = frozenset(setting.trigger_status or DEFAULT_TRIGGER_STATUS)
+    channels = setting.channels if isinstance(setting.channels, dict) else {}
+
+    email = channels.get("email") if isinstance(channels.get("email"), dict) else {}
+    line = channels.get("line") if isinstance(channels.get("line"), dict) else {}
+    slack = channels.get("slack") if isinstance(channels.get("slack"), dict) else {}
+
+    recipients: tuple[str, ...] = ()
+    if email.get("enabled"):
+        recipients = tuple(str(r) for r in (email.get("recipients") or []) if r)
+
+    digest_seconds = []
+    for name, channel in (("email", email), ("line", line), ("slack", slack)):
+        try:
+            minutes = int(channel.get("digest_window_minutes") or 0)
+        except (TypeError, ValueError):
+            minutes = 0
+        if minutes > 0:
+            digest_seconds.append((name, minutes * 60))
 
+    line_target: Optional[LinePushTarget] = None
+    if line.get("enabled"):
+        if line.get("token") and line.get("to"):
+            line_target = LinePushTarget(to=str(line["to"]), token=str(line["token"]))
+        else:
+            # Settings saved for the retired LINE Notify have a token but no recipient.
+            logger.warning("LINE channel enabled without a Messaging API token and recipient (shop=%s)", shop_name)
 
-async def send_reservation_notification(payload: ReservationNotification) -> None:
-    tasks = []
-    message = (
+    return ShopNotificationRouting(
+        shop_name=shop_name,
+        trigger_status=trigger_status,
+        email_recipients=recipients,
+        line=line_target,
+        slack_webhook_url=(slack.get("webhook_url") or None) if slack.get("enabled") else None,
+        urgent_status=frozenset(getattr(setting, "urgent_status", None) or ()),
+        digest_seconds=tuple(digest_seconds),
+    )
+
+
+async def _load_routing(shop_id: str) -> ShopNotificationRouting:
+    from uuid import UUID
+
+    from sqlalchemy import select
+
+    from . import models
+    from .db import SessionLocal
+
+    try:
+        profile_id = UUID(str(shop_id))
+    except ValueError:
+        return ShopNotificationRouting()
+
+    stmt = (
+        select(models.Profile.name, models.DashboardNotificationSetting)
+        .outerjoin(
+            models.DashboardNotificationSetting,
+            models.DashboardNotificationSetting.profile_id == models.Profile.id,
+        )
+        .where(models.Profile.id == profile_id)
+    )
+    async with SessionLocal() as session:
+        row = (await session.execute(stmt)).first()
+    if row is None:
+        return ShopNotificationRouting()
+    shop_name, setting = row
+    return routing_from_setting(shop_name or "", setting)
+
+
+async def resolve_shop_routing(shop_id: str, *, loader: RoutingLoader | None = None) -> ShopNotificationRouting:
+    """Return cached routing for a shop, loading it from the database on a miss."""
+    key = str(shop_id)
+    cached = _routing_cache.get(key)
+    if cached is not None:
+        return cached
+    generation = _routing_generations.get(key, 0)
+    routing = await (loader or _load_routing)(key)
+    # A settings save during the load may have been read too early; don't cache it.
+    if _routing_generations.get(key, 0) == generation:
+        _routing_cache.set(key, routing)
+    return routing
+
+
+def invalidate_shop_routing(shop_id: Any) -> None:
+    key = str(shop_id)
+    _routing_generations[key] = _routing_generations.get(key, 0) + 1
+    _routing_cache.invalidate(key)
+
+
+def _format_message(payload: ReservationNotification, shop_name: str) -> str:
+    return (
         f"予約ID: {payload.reservation_id}\n"
-        f"店舗: {payload.shop_name} ({payload.shop_id})\n"
+        f"店舗: {shop_name} ({payload.shop_id})\n"
         f"ステータス: {payload.status}\n"
         f"来店希望: {payload.desired_start} 〜 {payload.desired_end}\n"
         f"顧客: {payload.customer_name} ({payload.customer_phone})\n"
         f"メモ: {payload.notes or '-'}"
     )
 
-    if SLACK_WEBHOOK:
-        slack_payload = {
-            "text": f"*予約更新通知*: {payload.status}",
-            "attachments": [
-                {
-                    "color": "#36a64f" if payload.status == "confirmed" else "#f4c542",
-                    "text": message,
-                }
-            ],
-        }
-        tasks.append(_post_json(SLACK_WEBHOOK, slack_payload))
 
-    if EMAIL_ENDPOINT:
-        email_payload = {
-            "subject": f"予約更新: {payload.shop_name} ({payload.status})",
-            "message": message,
-            "reservation_id": payload.reservation_id,
-            "shop_id": payload.shop_id,
-        }
-        tasks.append(_post_json(EMAIL_ENDPOINT, email_payload))
+def _slack_payload(payload: ReservationNotification, message: str) -> Dict[str, Any]:
+    return {
+        "text": f"*予約更新通知*: {payload.status}",
+        "attachments": [
+            {
+                "color": "#36a64f" if payload.status == "confirmed" else "#f4c542",
+                "text": message,
+            }
+        ],
+    }
+
+
+def _shop_delivery(channel: str, target: Any, *, title: str, color: str, subject: str, message: str, extra: Dict[str, Any]) -> _Delivery:
+    if channel == "slack":
+        return _Delivery("shop_slack", target, json={"text": title, "attachments": [{"color": color, "text": message}]})
+    if channel == "line":
+        return _Delivery(
+            "shop_line",
+            LINE_PUSH_API,
+            json={"to": target.to, "messages": [{"type": "text", "text": message[:LINE_TEXT_LIMIT]}]},
+            headers={"Authorization": f"Bearer {target.token}"},
+        )
+    return _Delivery(
+        "shop_email",
+        EMAIL_ENDPOINT or "",
+        json={"to": target, "subject": subject, "message": message, **extra},
+    )
+
+
+def _shop_targets(payload: ReservationNotification, routing: ShopNotificationRouting) -> List[tuple[str, Any]]:
+    targets: List[tuple[str, Any]] = []
+    if routing.slack_webhook_url:
+        targets.append(("slack", routing.slack_webhook_url))
+    if routing.line is not None:
+        targets.append(("line", routing.line))
+    if routing.email_recipients:
+        if not EMAIL_ENDPOINT:
+            logger.warning("shop email recipients configured but NOTIFY_EMAIL_ENDPOINT is not set (shop=%s)", payload.shop_id)
+        else:
+            targets.extend(("email", recipient) for recipient in routing.email_recipients)
+    return targets
+
 
+def plan_deliveries(
+    payload: ReservationNotification,
+    routing: ShopNotificationRouting,
+) -> tuple[List[_Delivery], List[tuple[str, Any, int]]]:
+    """Split an event into immediate deliveries and ``(channel, target, window)`` digest entries."""
+    shop_name = payload.shop_name or routing.shop_name or "unknown"
+    message = _format_message(payload, shop_name)
+    deliveries: List[_Delivery] = []
+    digested: List[tuple[str, Any, int]] = []
+
+    # Operator-wide channels always receive every event.
+    if SLACK_WEBHOOK:
+        deliveries.append(_Delivery("slack", SLACK_WEBHOOK, json=_slack_payload(payload, message)))
+    if EMAIL_ENDPOINT:
+        deliveries.append(
+            _Delivery(
+                "email",
+                EMAIL_ENDPOINT,
+                json={
+                    "subject": f"予約更新: {shop_name} ({payload.status})",
+                    "message": message,
+                    "reservation_id": payload.reservation_id,
+                    "shop_id": payload.shop_id,
+                },
+            )
+        )
     if LINE_ENDPOINT:
-        line_payload = {
-            "message": message,
-            "reservation_id": payload.reservation_id,
-            "shop_id": payload.shop_id,
-        }
-        tasks.append(_post_json(LINE_ENDPOINT, line_payload))
-
-    if not tasks:
-        logger.info("reservation_notification", extra={"payload": json.dumps(message, ensure_ascii=False)})
+        deliveries.append(
+            _Delivery(
+                "line",
+                LINE_ENDPOINT,
+                json={
+                    "message": message,
+                    "reservation_id": payload.reservation_id,
+                    "shop_id": payload.shop_id,
+                },
+            )
+        )
+
+    if not routing.wants(payload.status):
+        return deliveries, digested
+
+    urgent = payload.status in routing.urgent_status
+    slack = _slack_payload(payload, message)
+    for channel, target in _shop_targets(payload, routing):
+        window = routing.digest_window(channel)
+        if window > 0 and not urgent:
+            digested.append((channel, target, window))
+            continue
+        deliveries.append(
+            _shop_delivery(
+                channel,
+                target,
+                title=slack["text"],
+                color=slack["attachments"][0]["color"],
+                subject=f"予約更新: {shop_name} ({payload.status})",
+                message=message,
+                extra={"reservation_id": payload.reservation_id, "shop_id": payload.shop_id},
+            )
+        )
+    return deliveries, digested
+
+
+def build_deliveries(
+    payload: ReservationNotification,
+    routing: ShopNotificationRouting,
+) -> List[_Delivery]:
+    deliveries, _ = plan_deliveries(payload, routing)
+    return deliveries
+
+
+@dataclass
+class _DigestBuffer:
+    shop_id: str
+    shop_name: str
+    channel: str
+    target: Any
+    events: List[ReservationNotification] = field(default_factory=list)
+    timer: Optional[asyncio.Task] = None
+
+
+class NotificationDigester:
+    """Buffers shop channel events and sends one aggregated message per window."""
+
+    def __init__(self, max_events: int = 50) -> None:
+        self.max_events = max(1, max_events)
+        self._buffers: Dict[tuple[str, str, Any], _DigestBuffer] = {}
+
+    def __len__(self) -> int:
+        return len(self._buffers)
+
+    def add(
+        self,
+        payload: ReservationNotification,
+        shop_name: str,
+        channel: str,
+        target: Any,
+        window_seconds: int,
+    ) -> None:
+        key = (payload.shop_id, channel, target)
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            buffer = _DigestBuffer(shop_id=payload.shop_id, shop_name=shop_name, channel=channel, target=target)
+            self._buffers[key] = buffer
+            buffer.timer = asyncio.get_running_loop().create_task(self._flush_after(key, window_seconds))
+        buffer.events.append(payload)
+        if len(buffer.events) >= self.max_events:
+            if buffer.timer is not None:
+                buffer.timer.cancel()
+            fire_and_forget(self.flush(key))
+
+    async def _flush_after(self, key: tuple[str, str, Any], window_seconds: int) -> None:
+        await asyncio.sleep(window_seconds)
+        await self.flush(key)
+
+    async def flush(self, key: tuple[str, str, Any]) -> None:
+        buffer = self._buffers.pop(key, None)
+        if buffer is None or not buffer.events:
+            return
+        await dispatch([_digest_delivery(buffer)])
+
+    async def flush_all(self) -> None:
+        keys = list(self._buffers)
+        for key in keys:
+            buffer = self._buffers.get(key)
+            if buffer is not None and buffer.timer is not None and buffer.timer is not asyncio.current_task():
+                buffer.timer.cancel()
+        await asyncio.gather(*(self.flush(key) for key in keys), return_exceptions=True)
+
+
+def _digest_delivery(buffer: _DigestBuffer) -> _Delivery:
+    count = len(buffer.events)
+    lines = [f"{buffer.shop_name} の予約更新 {count}件"]
+    for event in buffer.events:
+        lines.append(f"・[{event.status}] {event.desired_start} {event.customer_name} (予約ID: {event.reservation_id})")
+    return _shop_delivery(
+        buffer.channel,
+        buffer.target,
+        title=f"*予約更新まとめ*: {count}件",
+        color="#f4c542",
+        subject=f"予約更新まとめ: {buffer.shop_name} ({count}件)",
+        message="\n".join(lines),
+        extra={"shop_id": buffer.shop_id, "reservation_ids": [e.reservation_id for e in buffer.events]},
+    )
+
+
+digester = NotificationDigester(max_events=int(getattr(settings, "notify_digest_max_events", 50) or 50))
+
+
+def http_client() -> httpx.AsyncClient:
+    """Client for outgoing notification posts.
+
+    httpx is imported on first use rather than at module load, which keeps it
+    off the API's cold-start path.
+    """
+    import httpx
+
+    return httpx.AsyncClient(timeout=5.0)
+
+
+async def _deliver(client: httpx.AsyncClient, delivery: _Delivery) -> None:
+    async with _get_semaphore():
+        with observe(NOTIFICATION_POST_DURATION, delivery.kind):
+            resp = await client.post(
+                delivery.url,
+                json=delivery.json,
+                data=delivery.data,
+                headers=delivery.headers or None,
+            )
+            if resp.status_code >= 400:
+                raise RuntimeError(f"{delivery.kind} responded {resp.status_code}")
+
+
+async def dispatch(deliveries: List[_Delivery], *, client: httpx.AsyncClient | None = None) -> List[bool]:
+    """Send deliveries concurrently, reusing ``client`` when the caller owns one.
+
+    Failures are logged, not raised; the result says which deliveries went out.
+    """
+    if not deliveries:
+        return []
+    if client is None:
+        async with http_client() as owned:
+            results = await asyncio.gather(*(_deliver(owned, d) for d in deliveries), return_exceptions=True)
+    else:
+        results = await asyncio.gather(*(_deliver(client, d) for d in deliveries), return_exceptions=True)
+    for delivery, result in zip(deliveries, results):
+        if isinstance(result, Exception):
+            logger.warning("notification dispatch failed (%s): %s", delivery.kind, result)
+    return [not isinstance(result, Exception) for result in results]
+
+
+async def _post_json(url: str, payload: Dict[str, Any]) -> None:
+    await dispatch([_Delivery("webhook", url, json=payload)])
+
+
+async def send_reservation_notification(
+    payload: ReservationNotification,
+    *,
+    routing: ShopNotificationRouting | None = None,
+) -> None:
+    if routing is None:
+        try:
+            routing = await resolve_shop_routing(payload.shop_id)
+        except Exception as exc:
+            logger.warning("failed to resolve notification routing for %s: %s", payload.shop_id, exc)
+            routing = ShopNotificationRouting()
+
+    deliveries, digested = plan_deliveries(payload, routing)
+    shop_name = payload.shop_name or routing.shop_name or "unknown"
+    for channel, target, window in digested:
+        digester.add(payload, shop_name, channel, target, window)
+
+    if not deliveries:
+        if not digested:
+            message = _format_message(payload, shop_name)
+            logger.info("reservation_notification", extra={"payload": json.dumps(message, ensure_ascii=False)})
         return
 
-    try:
-        await asyncio.gather(*tasks)
-    except Exception as exc:
-        logger.warning("notification dispatch failed: %s", exc)
+    await dispatch(deliveries)
+
+
+async def flush_pending_digests() -> None:
+    """Send every buffered digest immediately (used on shutdown)."""
+    await digester.flush_all()
+
+
+def reservation_notification_from_model(reservation: Any, shop_name: str = "") -> ReservationNotification:
+    return ReservationNotification(
+        reservation_id=str(reservation.id),
+        shop_id=str(reservation.shop_id),
+        shop_name=shop_name,
+        customer_name=reservation.customer_name,
+        customer_phone=reservation.customer_phone,
+        desired_start=reservation.desired_start.isoformat(),
+        desired_end=reservation.desired_end.isoformat(),
+        status=reservation.status,
+        channel=reservation.channel,
+        notes=reservation.notes,
+    )
 
 
 def fire_and_forget(coro):
     try:
         loop = asyncio.get_running_loop()
-        loop.create_task(coro)
+        task = loop.create_task(coro)
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
     except RuntimeError:
         asyncio.run(coro)
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import uuid
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+REQUEST_ID_HEADER = "x-request-id"
+
+
+@dataclass
+class RequestContext:
+    request_id: str
+    method: str
+    path: str
+    scope: Dict[str, Any] = field(repr=False, default_factory=dict)
+
+    @property
+    def route(self) -> str:
+        # FastAPI stores the matched route on the scope once routing has run.
+        route = self.scope.get("route")
+        return getattr(route, "path", None) or self.path
+
+
+_current: ContextVar[Optional[RequestContext]] = ContextVar("request_context", default=None)
+
+
+def current_request() -> Optional[RequestContext]:
+    return _current.get()
+
+
+def _incoming_request_id(scope: Dict[str, Any]) -> Optional[str]:
+    for name, value in scope.get("headers") or []:
+        if name.decode("latin-1").lower() == REQUEST_ID_HEADER:
+            candidate = value.decode("latin-1").strip()
+            if candidate and len(candidate) <= 128:
+                return candidate
+    return None
+
+
+class RequestContextMiddleware:
+    """Assigns a request id (honouring an incoming ``X-Request-ID``) and echoes it back."""
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        ctx = RequestContext(
+            request_id=_incoming_request_id(scope) or uuid.uuid4().hex,
+            method=scope.get("method", "GET"),
+            path=scope.get("path", ""),
+            scope=scope,
+        )
+
+        async def send_wrapper(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers") or [])
+                headers.append((REQUEST_ID_HEADER.encode("latin-1"), ctx.request_id.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        token = _current.set(ctx)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
@@ -1,14 +1,17 @@
 import inspect
 
-from fastapi import APIRouter, Depends, HTTPException, Request, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Query
 from fastapi.encoders import jsonable_encoder
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.orm import selectinload
 from uuid import UUID
 import uuid
 import hashlib
-from ..db import get_session
-from .. import models
+from ..db import get_session, pool_status
+from .. import models, slow_queries
+from ..events import ALL_SHOPS, reservation_event, stage
 from ..meili import index_profile, index_bulk, purge_all
 from ..utils.profiles import build_profile_doc
 from ..schemas import (
@@ -42,12 +45,64 @@ from datetime import datetime, timezone, date
 from typing import Optional, Any, List
 import uuid
 from ..deps import require_admin, audit_admin
-from .shops import _fetch_availability, _normalize_menus, _normalize_staff, serialize_review
+from ..notifications import fire_and_forget, reservation_notification_from_model, send_reservation_notification
+from .dashboard_events import event_stream_response
+from .shops import (
+    _availability_window,
+    _fetch_availability,
+    _fetch_availability_many,
+    _normalize_menus,
+    _normalize_staff,
+    invalidate_availability_cache,
+    serialize_review,
+)
 from ..utils.slug import slugify
+from ..utils.cache import TTLCache
+from ..utils.pagination import (
+    InvalidCursor,
+    after_keyset,
+    before_keyset,
+    decode_created_cursor,
+    decode_cursor,
+    encode_created_cursor,
+    encode_cursor,
+)
+from ..settings import settings
 
 router = APIRouter(dependencies=[Depends(require_admin), Depends(audit_admin)])
 JST = ZoneInfo("Asia/Tokyo")
 
+
+_total_cache: TTLCache[tuple, int] = TTLCache(
+    float(getattr(settings, "admin_count_cache_ttl_seconds", 30.0) or 0.0),
+    max_entries=512,
+)
+
+
+def _created_keyset(model: Any, cursor: str):
+    try:
+        created_at, row_id = decode_created_cursor(cursor)
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="invalid cursor")
+    return before_keyset((model.created_at, model.id), (created_at, row_id))
+
+
+def _next_created_cursor(rows: List[Any], page_size: int) -> Optional[str]:
+    if len(rows) < page_size:
+        return None
+    last = rows[-1]
+    return encode_created_cursor(last.created_at, last.id)
+
+
+async def _cached_total(db: AsyncSession, model: Any, conditions: list, cache_key: tuple) -> int:
+    """COUNT(*) for a filtered listing, cached briefly so paging does not recount."""
+    cached = _total_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    total = int(await db.scalar(select(func.count()).select_from(model).where(*conditions)) or 0)
+    _total_cache.set(cache_key, total)
+    return total
+
 def _build_doc(
     p: models.Profile,
     has_today: bool,
@@ -62,6 +117,29 @@ def _build_doc(
     )
 
 
+def _change_log(
+    request: Request,
+    target_type: str,
+    target_id: UUID | None,
+    action: str,
+    before: Any,
+    after: Any,
+) -> models.AdminChangeLog:
+    ip = request.headers.get("x-forwarded-for") or (request.client.host if request.client else "")
+    ip_hash = hashlib.sha256(ip.encode("utf-8")).hexdigest() if ip else None
+    key = request.headers.get("x-admin-key")
+    key_hash = hashlib.sha256(key.encode("utf-8")).hexdigest() if key else None
+    return models.AdminChangeLog(
+        target_type=target_type,
+        target_id=target_id,
+        action=action,
+        before_json=jsonable_encoder(before) if before is not None else None,
+        after_json=jsonable_encoder(after) if after is not None else None,
+        admin_key_hash=key_hash,
+        ip_hash=ip_hash,
+    )
+
+
 async def _record_change(
     request: Request,
     db: AsyncSession,
@@ -72,20 +150,7 @@ async def _record_change(
     after: Any,
 ) -> None:
     try:
-        ip = request.headers.get("x-forwarded-for") or (request.client.host if request.client else "")
-        ip_hash = hashlib.sha256(ip.encode("utf-8")).hexdigest() if ip else None
-        key = request.headers.get("x-admin-key")
-        key_hash = hashlib.sha256(key.encode("utf-8")).hexdigest() if key else None
-        log = models.AdminChangeLog(
-            target_type=target_type,
-            target_id=target_id,
-            action=action,
-            before_json=jsonable_encoder(before) if before is not None else None,
-            after_json=jsonable_encoder(after) if after is not None else None,
-            admin_key_hash=key_hash,
-            ip_hash=ip_hash,
-        )
-        db.add(log)
+        db.add(_change_log(request, target_type, target_id, action, before, after))
         await db.commit()
     except Exception:
         # Never block on audit logging
@@ -125,23 +190,28 @@ async def reindex_all(purge: bool = False, db: AsyncSession = Depends(get_sessio
             purge_all()
         except Exception as e:
             raise HTTPException(status_code=503, detail=f"meili_unavailable: {e}")
-    res = await db.execute(select(models.Profile).where(models.Profile.status == 'published'))
+    res = await db.execute(
+        select(models.Profile)
+        .where(models.Profile.status == 'published')
+        .options(selectinload(models.Profile.reviews), selectinload(models.Profile.diaries))
+    )
     profiles = res.scalars().all()
     today = datetime.now(JST).date()
-    docs = []
-    for p in profiles:
-        await db.refresh(p, attribute_names=["reviews"])
-        res2 = await db.execute(
-            select(func.count())
-            .select_from(models.Availability)
-            .where(models.Availability.profile_id == p.id, models.Availability.date == today)
-        )
-        has_today = (res2.scalar_one() or 0) > 0
-        res3 = await db.execute(
-            select(models.Outlink).where(models.Outlink.profile_id == p.id)
-        )
-        outlinks = list(res3.scalars().all())
-        docs.append(_build_doc(p, has_today, outlinks))
+    # One query each for today's availability and outlinks instead of two per profile.
+    res_today = await db.execute(
+        select(models.Availability.profile_id).where(models.Availability.date == today).distinct()
+    )
+    available_today = set(res_today.scalars().all())
+    outlinks_by_profile: dict[UUID, list[models.Outlink]] = {}
+    profile_ids = [p.id for p in profiles]
+    if profile_ids:
+        res_out = await db.execute(select(models.Outlink).where(models.Outlink.profile_id.in_(profile_ids)))
+        for outlink in res_out.scalars().all():
+            outlinks_by_profile.setdefault(outlink.profile_id, []).append(outlink)
+    docs = [
+        _build_doc(p, p.id in available_today, outlinks_by_profile.get(p.id, []))
+        for p in profiles
+    ]
     try:
         index_bulk(docs)
     except Exception as e:
@@ -159,6 +229,7 @@ async def create_availability(profile_id: str, date: str, slots_json: Optional[d
     avail = models.Availability(profile_id=pid, date=dt, slots_json=slots_json or {}, is_today=False)
     db.add(avail)
     await db.commit()
+    invalidate_availability_cache(pid)
     # reindex profile (today flag might change if date == today)
     res_p = await db.execute(select(models.Profile).where(models.Profile.id == pid))
     p = res_p.scalar_one()
@@ -214,28 +285,77 @@ async def create_availability_bulk(payload: list[AvailabilityCreate], db: AsyncS
         created.append(str(avail.id))
 
     await db.commit()
+    for item in payload:
+        invalidate_availability_cache(item.profile_id)
     return {"created": created}
 
 
+@router.get("/api/admin/db/pool", summary="Database pool snapshot")
+async def admin_db_pool():
+    return pool_status()
+
+
+@router.get("/api/admin/db/slow-queries", summary="Heaviest statements by total time since start or last reset")
+async def admin_slow_queries(limit: int = Query(default=20, ge=1, le=200)):
+    return {
+        "threshold_ms": slow_queries.THRESHOLD_SECONDS * 1000,
+        "items": slow_queries.stats.top(limit),
+    }
+
+
+@router.delete("/api/admin/db/slow-queries", summary="Reset statement stats")
+async def admin_reset_slow_queries():
+    slow_queries.stats.reset()
+    return {"ok": True}
+
+
 @router.get("/api/admin/reviews", summary="List reviews", response_model=ReviewListResponse)
 async def admin_list_reviews(
     status: Optional[str] = Query(default=None),
+    profile_id: Optional[UUID] = Query(default=None),
+    since: Optional[datetime] = Query(default=None, description="created_at >= since"),
+    until: Optional[datetime] = Query(default=None, description="created_at < until"),
+    cursor: Optional[str] = Query(default=None, description="Opaque cursor from a previous page"),
+    include_total: Optional[bool] = Query(default=None),
     page: int = Query(default=1, ge=1),
     page_size: int = Query(default=20, ge=1, le=100),
     db: AsyncSession = Depends(get_session),
 ):
-    stmt = select(models.Review).order_by(models.Review.created_at.desc())
-    count_stmt = select(func.count()).select_from(models.Review)
+    conditions = []
     if status:
-        stmt = stmt.where(models.Review.status == status)
-        count_stmt = count_stmt.where(models.Review.status == status)
+        conditions.append(models.Review.status == status)
+    if profile_id:
+        conditions.append(models.Review.profile_id == profile_id)
+    if since:
+        conditions.append(models.Review.created_at >= since)
+    if until:
+        conditions.append(models.Review.created_at < until)
+
+    stmt = (
+        select(models.Review)
+        .where(*conditions)
+        .order_by(models.Review.created_at.desc(), models.Review.id.desc())
+    )
+    if cursor:
+        stmt = stmt.where(_created_keyset(models.Review, cursor))
+    else:
+        stmt = stmt.offset((page - 1) * page_size)
+    reviews = list(await db.scalars(stmt.limit(page_size)))
+
+    total = None
+    want_total = cursor is None if include_total is None else include_total
+    if want_total:
+        total = await _cached_total(
+            db,
+            models.Review,
+            conditions,
+            ("reviews", status, profile_id, since, until),
+        )
 
-    total = await db.scalar(count_stmt)
-    offset = (page - 1) * page_size
-    reviews = await db.scalars(stmt.offset(offset).limit(page_size))
     return ReviewListResponse(
-        total=int(total or 0),
+        total=total,
         items=[serialize_review(r) for r in reviews],
+        next_cursor=_next_created_cursor(reviews, page_size),
     )
 
 
@@ -318,9 +438,22 @@ async def update_marketing(profile_id: str, payload: ProfileMarketingUpdate, db:
     return {"ok": True}
 
 
+@router.get("/api/admin/reservations/events", summary="Stream reservation events for every shop")
+async def stream_reservation_events(
+    last_event_id: Optional[str] = Header(default=None, alias="Last-Event-ID"),
+):
+    """Server-sent reservation events across all shops; same frames as the shop dashboard stream."""
+    return event_stream_response(ALL_SHOPS, last_event_id)
+
+
 @router.get("/api/admin/reservations", summary="List reservations", response_model=ReservationAdminList)
 async def list_reservations(
     status: str | None = None,
+    shop_id: UUID | None = None,
+    since: datetime | None = Query(default=None, description="created_at >= since"),
+    until: datetime | None = Query(default=None, description="created_at < until"),
+    cursor: str | None = Query(default=None, description="Opaque cursor from a previous page"),
+    include_total: bool | None = None,
     limit: int = 50,
     offset: int = 0,
     db: AsyncSession = Depends(get_session),
@@ -328,16 +461,38 @@ async def list_reservations(
     limit = max(1, min(limit, 200))
     offset = max(0, offset)
 
-    stmt = select(models.Reservation).order_by(models.Reservation.created_at.desc())
-    count_stmt = select(func.count()).select_from(models.Reservation)
+    conditions = []
     if status:
-        stmt = stmt.where(models.Reservation.status == status)
-        count_stmt = count_stmt.where(models.Reservation.status == status)
+        conditions.append(models.Reservation.status == status)
+    if shop_id:
+        conditions.append(models.Reservation.shop_id == shop_id)
+    if since:
+        conditions.append(models.Reservation.created_at >= since)
+    if until:
+        conditions.append(models.Reservation.created_at < until)
+
+    stmt = (
+        select(models.Reservation)
+        .where(*conditions)
+        .order_by(models.Reservation.created_at.desc(), models.Reservation.id.desc())
+    )
+    if cursor:
+        stmt = stmt.where(_created_keyset(models.Reservation, cursor))
+    else:
+        stmt = stmt.offset(offset)
 
-    result = await db.execute(stmt.offset(offset).limit(limit))
+    result = await db.execute(stmt.limit(limit))
     reservations = result.scalars().all()
 
-    total = (await db.execute(count_stmt)).scalar_one()
+    total = None
+    want_total = cursor is None if include_total is None else include_total
+    if want_total:
+        total = await _cached_total(
+            db,
+            models.Reservation,
+            conditions,
+            ("reservations", status, shop_id, since, until),
+        )
 
     shop_ids = [r.shop_id for r in reservations]
     shop_names: dict[UUID, str] = {}
@@ -366,7 +521,11 @@ async def list_reservations(
         for r in reservations
     ]
 
-    return ReservationAdminList(total=total, items=items)
+    return ReservationAdminList(
+        total=total,
+        items=items,
+        next_cursor=_next_created_cursor(reservations, limit),
+    )
 
 
 @router.patch("/api/admin/reservations/{reservation_id}", summary="Update reservation status")
@@ -409,8 +568,12 @@ async def update_reservation_admin(
             note=payload.notes,
         )
         db.add(event)
+    if status_changed:
+        await stage(db, reservation_event("reservation.status_changed", reservation.shop_id, reservation.id, reservation.status))
 
     await db.commit()
+    if status_changed:
+        invalidate_availability_cache(reservation.shop_id)
     await db.refresh(reservation)
 
     after = {
@@ -420,6 +583,8 @@ async def update_reservation_admin(
         "desired_end": reservation.desired_end.isoformat(),
     }
     await _record_change(request, db, "reservation", reservation.id, "update", before, after)
+    if status_changed:
+        fire_and_forget(send_reservation_notification(reservation_notification_from_model(reservation)))
 
     return {
         "id": str(reservation.id),
@@ -429,21 +594,56 @@ async def update_reservation_admin(
 
 
 @router.get("/api/admin/shops", summary="List shops", response_model=ShopAdminList)
-async def admin_list_shops(db: AsyncSession = Depends(get_session)):
-    res = await db.execute(select(models.Profile))
-    profiles = res.scalars().all()
+async def admin_list_shops(
+    status: Optional[str] = Query(default=None),
+    area: Optional[str] = Query(default=None),
+    service_type: Optional[str] = Query(default=None),
+    q: Optional[str] = Query(default=None, description="Case-insensitive shop name prefix"),
+    cursor: Optional[str] = Query(default=None, description="Opaque cursor from a previous page"),
+    limit: int = Query(default=200, ge=1, le=500),
+    db: AsyncSession = Depends(get_session),
+):
+    stmt = select(
+        models.Profile.id,
+        models.Profile.name,
+        models.Profile.slug,
+        models.Profile.area,
+        models.Profile.status,
+        models.Profile.service_type,
+    )
+    if status:
+        stmt = stmt.where(models.Profile.status == status)
+    if area:
+        stmt = stmt.where(models.Profile.area == area)
+    if service_type:
+        stmt = stmt.where(models.Profile.service_type == service_type)
+    prefix = (q or "").strip().lower()
+    if prefix:
+        escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        stmt = stmt.where(func.lower(models.Profile.name).like(f"{escaped}%", escape="\\"))
+    if cursor:
+        try:
+            name, raw_id = decode_cursor(cursor, 2)
+            last_id = UUID(str(raw_id))
+        except (InvalidCursor, ValueError):
+            raise HTTPException(status_code=400, detail="invalid cursor")
+        stmt = stmt.where(after_keyset((models.Profile.name, models.Profile.id), (str(name), last_id)))
+
+    res = await db.execute(stmt.order_by(models.Profile.name, models.Profile.id).limit(limit))
+    rows = res.all()
     items = [
         ShopAdminSummary(
-            id=p.id,
-            name=p.name,
-            slug=p.slug,
-            area=p.area,
-            status=p.status,
-            service_type=p.service_type,
+            id=row.id,
+            name=row.name,
+            slug=row.slug,
+            area=row.area,
+            status=row.status,
+            service_type=row.service_type,
         )
-        for p in profiles
+        for row in rows
     ]
-    return ShopAdminList(items=items)
+    next_cursor = encode_cursor([rows[-1].name, str(rows[-1].id)]) if len(rows) == limit else None
+    return ShopAdminList(items=items, next_cursor=next_cursor)
 
 
 def _prepare_contact_output(contact_json: dict[str, Any] | None) -> dict[str, Any]:
@@ -480,14 +680,17 @@ async def admin_get_shop(shop_id: UUID, db: AsyncSession = Depends(get_session))
     if not profile:
         raise HTTPException(status_code=404, detail="shop not found")
 
+    start_date, end_date = _availability_window(None, None)
+    availability_calendar = await _fetch_availability(db, profile.id, start_date=start_date, end_date=end_date)
+    return _shop_admin_detail(profile, availability_calendar.days if availability_calendar else [])
+
+
+def _shop_admin_detail(profile: models.Profile, availability: List[Any]) -> ShopAdminDetail:
     contact_json = profile.contact_json or {}
     service_tags = contact_json.get("service_tags") or profile.body_tags or []
     menus = _normalize_menus(contact_json.get("menus"), profile.id)
     staff_members = _normalize_staff(contact_json.get("staff"), profile.id)
-    availability_calendar = await _fetch_availability(db, profile.id)
-
     contact = _prepare_contact_output(contact_json)
-    availability = availability_calendar.days if availability_calendar else []
     photos = profile.photos or []
 
     return ShopAdminDetail(
@@ -716,14 +919,32 @@ async def admin_bulk_ingest_shop_content(
     processed: List[BulkShopIngestResult] = []
     errors: List[dict[str, Any]] = []
 
+    shop_ids = {entry.shop_id for entry in payload.shops}
+    profiles_by_id: dict[UUID, models.Profile] = {}
+    if shop_ids:
+        res_profiles = await db.execute(select(models.Profile).where(models.Profile.id.in_(shop_ids)))
+        profiles_by_id = {p.id: p for p in res_profiles.scalars().all()}
+
+    # Snapshots, outlinks and the search documents are loaded for every shop at
+    # once, so the per-entry work is only the entry's own lookups and writes.
+    window = _availability_window(None, None)
+    before_days = await _fetch_availability_many(db, profiles_by_id, *window)
+    before_details = {
+        shop_id: _shop_admin_detail(profile, before_days.get(shop_id, [])).model_dump()
+        for shop_id, profile in profiles_by_id.items()
+    }
+    ingested: List[UUID] = []
+
     for entry in payload.shops:
-        profile = await db.get(models.Profile, entry.shop_id)
+        profile = profiles_by_id.get(entry.shop_id)
         if not profile:
             errors.append({"shop_id": str(entry.shop_id), "error": "shop_not_found"})
             continue
+        if sa_inspect(profile).expired:
+            # A previous entry rolled back, which expires everything in the session.
+            await db.refresh(profile)
 
         summary = BulkShopIngestResult(shop_id=entry.shop_id)
-        before_detail = await admin_get_shop(entry.shop_id, db)
 
         contact_json = dict(profile.contact_json or {})
 
@@ -760,14 +981,18 @@ async def admin_bulk_ingest_shop_content(
         profile.contact_json = contact_json
 
         if entry.reviews:
-            for review in entry.reviews:
-                existing_review = None
-                if review.external_id:
-                    stmt = select(models.Review).where(
+            review_external_ids = {review.external_id for review in entry.reviews if review.external_id}
+            existing_reviews: dict[str, models.Review] = {}
+            if review_external_ids:
+                res_reviews = await db.execute(
+                    select(models.Review).where(
                         models.Review.profile_id == profile.id,
-                        models.Review.external_id == review.external_id,
+                        models.Review.external_id.in_(review_external_ids),
                     )
-                    existing_review = (await db.execute(stmt)).scalar_one_or_none()
+                )
+                existing_reviews = {r.external_id: r for r in res_reviews.scalars().all() if r.external_id}
+            for review in entry.reviews:
+                existing_review = existing_reviews.get(review.external_id) if review.external_id else None
 
                 if existing_review:
                     target_review = existing_review
@@ -776,6 +1001,8 @@ async def admin_bulk_ingest_shop_content(
                     target_review = models.Review(profile_id=profile.id)
                     summary.reviews_created += 1
                     db.add(target_review)
+                    if review.external_id:
+                        existing_reviews[review.external_id] = target_review
 
                 target_review.external_id = review.external_id
                 target_review.score = review.score
@@ -786,14 +1013,18 @@ async def admin_bulk_ingest_shop_content(
                 target_review.status = review.status
 
         if entry.diaries:
-            for diary in entry.diaries:
-                existing_diary = None
-                if diary.external_id:
-                    stmt = select(models.Diary).where(
+            diary_external_ids = {diary.external_id for diary in entry.diaries if diary.external_id}
+            existing_diaries: dict[str, models.Diary] = {}
+            if diary_external_ids:
+                res_diaries = await db.execute(
+                    select(models.Diary).where(
                         models.Diary.profile_id == profile.id,
-                        models.Diary.external_id == diary.external_id,
+                        models.Diary.external_id.in_(diary_external_ids),
                     )
-                    existing_diary = (await db.execute(stmt)).scalar_one_or_none()
+                )
+                existing_diaries = {d.external_id: d for d in res_diaries.scalars().all() if d.external_id}
+            for diary in entry.diaries:
+                existing_diary = existing_diaries.get(diary.external_id) if diary.external_id else None
 
                 if existing_diary:
                     target_diary = existing_diary
@@ -802,6 +1033,8 @@ async def admin_bulk_ingest_shop_content(
                     target_diary = models.Diary(profile_id=profile.id)
                     summary.diaries_created += 1
                     db.add(target_diary)
+                    if diary.external_id:
+                        existing_diaries[diary.external_id] = target_diary
 
                 target_diary.external_id = diary.external_id
                 target_diary.title = diary.title
@@ -816,25 +1049,28 @@ async def admin_bulk_ingest_shop_content(
                     target_diary.created_at = created_at
 
         if entry.availability:
-            for availability in entry.availability:
-                slots_json = _slots_to_json(availability.slots)
-                stmt = select(models.Availability).where(
+            res_availability = await db.execute(
+                select(models.Availability).where(
                     models.Availability.profile_id == profile.id,
-                    models.Availability.date == availability.date,
+                    models.Availability.date.in_({a.date for a in entry.availability}),
                 )
-                existing_availability = (await db.execute(stmt)).scalar_one_or_none()
+            )
+            existing_by_date = {a.date: a for a in res_availability.scalars().all()}
+            today_jst = datetime.now(JST).date()
+            for availability in entry.availability:
+                slots_json = _slots_to_json(availability.slots)
+                existing_availability = existing_by_date.get(availability.date)
                 if existing_availability:
                     existing_availability.slots_json = slots_json
-                    existing_availability.is_today = availability.date == datetime.now(JST).date()
+                    existing_availability.is_today = availability.date == today_jst
                 else:
-                    db.add(
-                        models.Availability(
-                            profile_id=profile.id,
-                            date=availability.date,
-                            slots_json=slots_json,
-                            is_today=availability.date == datetime.now(JST).date(),
-                        )
+                    existing_by_date[availability.date] = models.Availability(
+                        profile_id=profile.id,
+                        date=availability.date,
+                        slots_json=slots_json,
+                        is_today=availability.date == today_jst,
                     )
+                    db.add(existing_by_date[availability.date])
                 summary.availability_upserts += 1
 
         try:
@@ -843,35 +1079,55 @@ async def admin_bulk_ingest_shop_content(
             await db.rollback()
             errors.append({"shop_id": str(entry.shop_id), "error": str(exc)})
             continue
+        if entry.availability:
+            invalidate_availability_cache(profile.id)
+        if profile.id not in ingested:
+            ingested.append(profile.id)
+        processed.append(summary)
 
+    if ingested:
+        res_ingested = await db.execute(
+            select(models.Profile)
+            .where(models.Profile.id.in_(ingested))
+            .options(selectinload(models.Profile.reviews), selectinload(models.Profile.diaries))
+            .execution_options(populate_existing=True)
+        )
+        ingested_profiles = {p.id: p for p in res_ingested.scalars().all()}
+        res_out = await db.execute(select(models.Outlink).where(models.Outlink.profile_id.in_(ingested)))
+        outlinks_by_shop: dict[UUID, list[models.Outlink]] = {}
+        for outlink in res_out.scalars().all():
+            outlinks_by_shop.setdefault(outlink.profile_id, []).append(outlink)
+        after_days = await _fetch_availability_many(db, ingested, *window)
+        # The window starts today (JST), so its rows tell whether today has any.
+        today = window[0]
+
+        docs = []
+        for shop_id in ingested:
+            profile = ingested_profiles[shop_id]
+            days = after_days.get(shop_id, [])
+            docs.append(
+                _build_doc(profile, any(day.date == today for day in days), outlinks_by_shop.get(shop_id, []))
+            )
+            db.add(
+                _change_log(
+                    request,
+                    "shop",
+                    shop_id,
+                    "bulk_ingest",
+                    before_details[shop_id],
+                    _shop_admin_detail(profile, days).model_dump(),
+                )
+            )
         try:
-            await db.refresh(profile, attribute_names=["reviews", "diaries"])
+            await db.commit()
         except Exception:
-            await db.refresh(profile)
-
-        today = datetime.now(JST).date()
-        res_today = await db.execute(
-            select(func.count())
-            .select_from(models.Availability)
-            .where(models.Availability.profile_id == profile.id, models.Availability.date == today)
-        )
-        has_today = (res_today.scalar_one() or 0) > 0
-        res_out = await db.execute(select(models.Outlink).where(models.Outlink.profile_id == profile.id))
-        outlinks = list(res_out.scalars().all())
-        index_profile(_build_doc(profile, has_today, outlinks))
-
-        after_detail = await admin_get_shop(profile.id, db)
-        await _record_change(
-            request,
-            db,
-            "shop",
-            profile.id,
-            "bulk_ingest",
-            before_detail.model_dump() if hasattr(before_detail, "model_dump") else jsonable_encoder(before_detail),
-            after_detail.model_dump() if hasattr(after_detail, "model_dump") else jsonable_encoder(after_detail),
-        )
-
-        processed.append(summary)
+            # Never block on audit logging
+            await db.rollback()
+        # The content and audit rows are committed; a search outage only leaves the index behind.
+        try:
+            index_bulk(docs)
+        except Exception as exc:
+            errors.extend({"shop_id": str(shop_id), "error": f"index: {exc}"} for shop_id in ingested)
 
     return BulkShopContentResponse(processed=processed, errors=errors)
 
@@ -922,6 +1178,7 @@ async def admin_upsert_availability(
         db.add(avail)
 
     await db.commit()
+    invalidate_availability_cache(shop_id)
 
     await _record_change(
         request,
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Dict, List, Literal, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select, func, select
+
+from .. import models
+from ..db import SessionLocal
+from ..deps import require_admin, audit_admin
+from ..settings import settings
+
+router = APIRouter(
+    prefix="/api/admin/exports",
+    tags=["admin"],
+    dependencies=[Depends(require_admin), Depends(audit_admin)],
+)
+
+ExportFormat = Literal["ndjson", "csv"]
+
+# Rows fetched per round trip from the server-side cursor; also the size of each
+# chunk handed to the ASGI server, so memory stays flat regardless of range.
+YIELD_PER = 1000
+# A large export legitimately outlives the API-wide statement_timeout.
+STATEMENT_TIMEOUT_MS = max(0, int(getattr(settings, "admin_export_statement_timeout_ms", 0) or 0))
+
+RESERVATION_COLUMNS = (
+    models.Reservation.id,
+    models.Reservation.shop_id,
+    models.Reservation.status,
+    models.Reservation.channel,
+    models.Reservation.desired_start,
+    models.Reservation.desired_end,
+    models.Reservation.customer_name,
+    models.Reservation.customer_phone,
+    models.Reservation.customer_email,
+    models.Reservation.marketing_opt_in,
+    models.Reservation.notes,
+    models.Reservation.created_at,
+    models.Reservation.updated_at,
+)
+
+CLICK_COLUMNS = (
+    models.Click.id,
+    models.Click.ts,
+    models.Click.outlink_id,
+    models.Outlink.profile_id,
+    models.Outlink.kind,
+    models.Click.referer,
+    models.Click.ua,
+    models.Click.ip_hash,
+)
+
+CHANGE_LOG_COLUMNS = (
+    models.AdminChangeLog.id,
+    models.AdminChangeLog.ts,
+    models.AdminChangeLog.target_type,
+    models.AdminChangeLog.target_id,
+    models.AdminChangeLog.action,
+    models.AdminChangeLog.before_json,
+    models.AdminChangeLog.after_json,
+    models.AdminChangeLog.admin_key_hash,
+    models.AdminChangeLog.ip_hash,
+)
+
+
+def _to_text(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def _csv_cell(value: Any) -> Any:
+    value = _to_text(value)
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    return "" if value is None else value
+
+
+async def _stream_rows(stmt: Select, fields: List[str], fmt: ExportFormat) -> AsyncIterator[str]:
+    # The request-scoped session from get_session is closed before a streaming
+    # body is consumed, so the export owns its session for the cursor lifetime.
+    async with SessionLocal() as session:
+        if session.bind.dialect.name == "postgresql":
+            # Transaction-local, so it ends with the export and never leaks to the pool.
+            await session.execute(select(func.set_config("statement_timeout", str(STATEMENT_TIMEOUT_MS), True)))
+        result = await session.stream(stmt.execution_options(yield_per=YIELD_PER))
+        buffer = io.StringIO()
+        writer = csv.writer(buffer) if fmt == "csv" else None
+        if writer is not None:
+            writer.writerow(fields)
+        async for partition in result.partitions():
+            for row in partition:
+                if writer is not None:
+                    writer.writerow([_csv_cell(value) for value in row])
+                else:
+                    record: Dict[str, Any] = {name: _to_text(value) for name, value in zip(fields, row)}
+                    buffer.write(json.dumps(record, ensure_ascii=False))
+                    buffer.write("\n")
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        if writer is not None and buffer.tell():
+            yield buffer.getvalue()
+
+
+def _export_response(stmt: Select, name: str, fmt: ExportFormat) -> StreamingResponse:
+    fields = [column.key for column in stmt.selected_columns]
+    media_type = "text/csv; charset=utf-8" if fmt == "csv" else "application/x-ndjson"
+    extension = "csv" if fmt == "csv" else "ndjson"
+    return StreamingResponse(
+        _stream_rows(stmt, fields, fmt),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{name}.{extension}"'},
+    )
+
+
+@router.get("/reservations", summary="Stream reservations")
+async def export_reservations(
+    format: ExportFormat = Query(default="ndjson"),
+    shop_id: Optional[UUID] = Query(default=None),
+    since: Optional[datetime] = Query(default=None, description="created_at >= since"),
+    until: Optional[datetime] = Query(default=None, description="created_at < until"),
+):
+    stmt = select(*RESERVATION_COLUMNS).order_by(models.Reservation.created_at, models.Reservation.id)
+    if shop_id:
+        stmt = stmt.where(models.Reservation.shop_id == shop_id)
+    if since:
+        stmt = stmt.where(models.Reservation.created_at >= since)
+    if until:
+        stmt = stmt.where(models.Reservation.created_at < until)
+    return _export_response(stmt, "reservations", format)
+
+
+@router.get("/clicks", summary="Stream outlink clicks")
+async def export_clicks(
+    format: ExportFormat = Query(default="ndjson"),
+    shop_id: Optional[UUID] = Query(default=None),
+    since: Optional[datetime] = Query(default=None, description="ts >= since"),
+    until: Optional[datetime] = Query(default=None, description="ts < until"),
+):
+    stmt = (
+        select(*CLICK_COLUMNS)
+        .join(models.Outlink, models.Outlink.id == models.Click.outlink_id)
+        .order_by(models.Click.ts, models.Click.id)
+    )
+    if shop_id:
+        stmt = stmt.where(models.Outlink.profile_id == shop_id)
+    if since:
+        stmt = stmt.where(models.Click.ts >= since)
+    if until:
+        stmt = stmt.where(models.Click.ts < until)
+    return _export_response(stmt, "clicks", format)
+
+
+@router.get("/admin-change-logs", summary="Stream admin change logs")
+async def export_admin_change_logs(
+    format: ExportFormat = Query(default="ndjson"),
+    shop_id: Optional[UUID] = Query(default=None, description="Matches target_id"),
+    target_type: Optional[str] = Query(default=None),
+    since: Optional[datetime] = Query(default=None, description="ts >= since"),
+    until: Optional[datetime] = Query(default=None, description="ts < until"),
+):
+    stmt = select(*CHANGE_LOG_COLUMNS).order_by(models.AdminChangeLog.ts, models.AdminChangeLog.id)
+    if shop_id:
+        stmt = stmt.where(models.AdminChangeLog.target_id == shop_id)
+    if target_type:
+        stmt = stmt.where(models.AdminChangeLog.target_type == target_type)
+    if since:
+        stmt = stmt.where(models.AdminChangeLog.ts >= since)
+    if until:
+        stmt = stmt.where(models.AdminChangeLog.ts < until)
+    return _export_response(stmt, "admin_change_logs", format)
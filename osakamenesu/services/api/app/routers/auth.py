@@ -84,7 +84,10 @@ async def _get_session_from_cookie(request: Request, db: AsyncSession) -> Option
     if not raw_token:
         return None
     token_hash = hash_token(raw_token)
-    stmt = select(models.UserSession).where(models.UserSession.token_hash == token_hash)
+    stmt = select(models.UserSession).where(
+        models.UserSession.token_hash == token_hash,
+        models.UserSession.revoked_at.is_(None),
+    )
     result = await db.execute(stmt)
     return result.scalar_one_or_none()
 
@@ -143,7 +146,10 @@ async def verify_token(
     try:
         now = datetime.now(UTC)
         token_hash = hash_token(payload.token)
-        stmt = select(models.UserAuthToken).where(models.UserAuthToken.token_hash == token_hash)
+        stmt = select(models.UserAuthToken).where(
+            models.UserAuthToken.token_hash == token_hash,
+            models.UserAuthToken.consumed_at.is_(None),
+        )
         result = await db.execute(stmt)
         auth_token = result.scalar_one_or_none()
         if not auth_token or auth_token.consumed_at or auth_token.expires_at < now:
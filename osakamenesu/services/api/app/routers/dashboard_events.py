@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import asyncio
+from typing import AsyncIterator, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .. import models
+from ..db import get_session, release_session
+from ..deps import require_user
+from ..events import HEARTBEAT_SECONDS, broker
+from ..metrics import DASHBOARD_EVENT_STREAMS
+
+
+router = APIRouter(prefix="/api/dashboard", tags=["dashboard"])
+
+RETRY_MS = 3000
+RESET_FRAME = "event: reset\ndata: {}\n\n"
+
+
+async def _event_stream(shop_id: str, last_event_id: Optional[str]) -> AsyncIterator[str]:
+    # Subscribing here rather than in the route means a client that goes away
+    # before the body starts never leaves a subscriber behind.
+    subscription, backlog, resumed = broker.subscribe(shop_id, last_event_id)
+    DASHBOARD_EVENT_STREAMS.inc()
+    try:
+        yield f"retry: {RETRY_MS}\n\n"
+        if not resumed:
+            yield RESET_FRAME
+        for event in backlog:
+            yield event.frame()
+        while True:
+            try:
+                event = await subscription.get(HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                # Keeps proxies from closing the idle connection.
+                yield ": keepalive\n\n"
+                continue
+            yield RESET_FRAME if event is None else event.frame()
+    finally:
+        broker.unsubscribe(subscription)
+        DASHBOARD_EVENT_STREAMS.dec()
+
+
+def event_stream_response(shop_id: str, last_event_id: Optional[str]) -> StreamingResponse:
+    return StreamingResponse(
+        _event_stream(shop_id, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/shops/{profile_id}/events")
+async def stream_dashboard_shop_events(
+    profile_id: UUID,
+    last_event_id: Optional[str] = Header(default=None, alias="Last-Event-ID"),
+    db: AsyncSession = Depends(get_session),
+    user: models.User = Depends(require_user),
+) -> StreamingResponse:
+    """Push reservation creations and status changes for one shop as server-sent events.
+
+    Each event carries ``reservation.created`` or ``reservation.status_changed``
+    with the reservation id and its new status; clients fetch the details they
+    need. A ``reset`` event means events were missed (the resume id is no longer
+    buffered, or the stream fell behind) and the client should reload its list.
+    """
+    _ = user
+    if await db.get(models.Profile, profile_id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="profile_not_found")
+    # The stream can stay open for hours; it must not pin a pooled connection.
+    await release_session(db)
+    return event_stream_response(str(profile_id), last_event_id)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import re
 from copy import deepcopy
 from datetime import datetime, timezone
 from typing import Any, Dict, List
@@ -11,6 +12,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from .. import models, schemas
 from ..db import get_session
 from ..deps import require_user
+from ..notifications import invalidate_shop_routing
 
 
 router = APIRouter(prefix="/api/dashboard", tags=["dashboard"])
@@ -18,10 +20,13 @@ router = APIRouter(prefix="/api/dashboard", tags=["dashboard"])
 _ALLOWED_STATUSES = {"pending", "confirmed", "declined", "cancelled", "expired"}
 _DEFAULT_TRIGGER_STATUS = ["pending", "confirmed"]
 _DEFAULT_CHANNELS: Dict[str, Dict[str, Any]] = {
-    "email": {"enabled": False, "recipients": []},
-    "line": {"enabled": False, "token": None},
-    "slack": {"enabled": False, "webhook_url": None},
+    "email": {"enabled": False, "recipients": [], "digest_window_minutes": 0},
+    "line": {"enabled": False, "token": None, "to": None, "digest_window_minutes": 0},
+    "slack": {"enabled": False, "webhook_url": None, "digest_window_minutes": 0},
 }
+_MAX_DIGEST_WINDOW_MINUTES = 60
+# Messaging API user, group and room ids.
+_LINE_RECIPIENT = re.compile(r"[UCR][0-9a-f]{32}")
 
 
 def _default_channels_dict() -> Dict[str, Dict[str, Any]]:
@@ -42,6 +47,22 @@ def _normalize_trigger_status(statuses: List[str]) -> List[str]:
     return unique
 
 
+def _normalize_urgent_status(statuses: List[str]) -> List[str]:
+    unique: List[str] = []
+    for value in statuses:
+        if value not in _ALLOWED_STATUSES:
+            raise HTTPException(status.HTTP_422_UNPROCESSABLE_ENTITY, detail={"field": "urgent_status", "message": "不正なステータスが含まれています。"})
+        if value not in unique:
+            unique.append(value)
+    return unique
+
+
+def _digest_window(field: str, value: int) -> int:
+    if value < 0 or value > _MAX_DIGEST_WINDOW_MINUTES:
+        raise HTTPException(status.HTTP_422_UNPROCESSABLE_ENTITY, detail={"field": field, "message": "まとめ送信の間隔は 0〜60 分で指定してください。"})
+    return value
+
+
 def _sanitize_email_recipients(recipients: List[str]) -> List[str]:
     cleaned: List[str] = []
     lowered = set()
@@ -73,13 +94,16 @@ def _normalize_channels(channels: schemas.DashboardNotificationChannels) -> Dict
 
     if channels.line.enabled:
         token = (channels.line.token or "").strip()
+        to = (channels.line.to or "").strip()
         if not token:
-            raise HTTPException(status.HTTP_422_UNPROCESSABLE_ENTITY, detail={"field": "line", "message": "LINE Notify トークンを入力してください。"})
-        if len(token) < 40 or len(token) > 60 or not all(c.isalnum() or c in "-_" for c in token):
-            raise HTTPException(status.HTTP_422_UNPROCESSABLE_ENTITY, detail={"field": "line", "message": "LINE Notify トークンの形式が正しくありません。"})
-        normalized["line"] = {"enabled": True, "token": token}
+            raise HTTPException(status.HTTP_422_UNPROCESSABLE_ENTITY, detail={"field": "line", "message": "LINE チャネルアクセストークンを入力してください。"})
+        if len(token) < 100 or len(token) > 512 or not all(c.isalnum() or c in "+/=-_." for c in token):
+            raise HTTPException(status.HTTP_422_UNPROCESSABLE_ENTITY, detail={"field": "line", "message": "LINE チャネルアクセストークンの形式が正しくありません。"})
+        if not _LINE_RECIPIENT.fullmatch(to):
+            raise HTTPException(status.HTTP_422_UNPROCESSABLE_ENTITY, detail={"field": "line", "message": "LINE の送信先 ID (U/C/R から始まる 33 文字) を入力してください。"})
+        normalized["line"] = {"enabled": True, "token": token, "to": to}
     else:
-        normalized["line"] = {"enabled": False, "token": None}
+        normalized["line"] = {"enabled": False, "token": None, "to": None}
 
     if channels.slack.enabled:
         url = (channels.slack.webhook_url or "").strip()
@@ -91,6 +115,10 @@ def _normalize_channels(channels: schemas.DashboardNotificationChannels) -> Dict
     else:
         normalized["slack"] = {"enabled": False, "webhook_url": None}
 
+    normalized["email"]["digest_window_minutes"] = _digest_window("email", channels.email.digest_window_minutes)
+    normalized["line"]["digest_window_minutes"] = _digest_window("line", channels.line.digest_window_minutes)
+    normalized["slack"]["digest_window_minutes"] = _digest_window("slack", channels.slack.digest_window_minutes)
+
     return normalized
 
 
@@ -115,6 +143,7 @@ def _serialize(setting: models.DashboardNotificationSetting) -> schemas.Dashboar
         profile_id=setting.profile_id,
         updated_at=setting.updated_at,
         trigger_status=trigger_status,
+        urgent_status=setting.urgent_status or [],
         channels=channels,
     )
 
@@ -137,6 +166,7 @@ async def _get_or_create_setting(
     setting = models.DashboardNotificationSetting(
         profile_id=profile.id,
         trigger_status=_DEFAULT_TRIGGER_STATUS.copy(),
+        urgent_status=[],
         channels=_default_channels_dict(),
         updated_at=models.now_utc(),
         updated_by=None,
@@ -144,6 +174,7 @@ async def _get_or_create_setting(
     db.add(setting)
     await db.commit()
     await db.refresh(setting)
+    invalidate_shop_routing(profile.id)
     return setting
 
 
@@ -188,11 +219,14 @@ async def update_dashboard_notifications(
     channels = _normalize_channels(payload.channels)
 
     setting.trigger_status = trigger_status
+    if payload.urgent_status is not None:
+        setting.urgent_status = _normalize_urgent_status(list(payload.urgent_status))
     setting.channels = channels
     setting.updated_at = models.now_utc()
     setting.updated_by = user.id
     await db.commit()
     await db.refresh(setting)
+    invalidate_shop_routing(profile.id)
     return _serialize(setting)
 
 
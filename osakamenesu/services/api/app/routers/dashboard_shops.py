@@ -14,6 +14,7 @@ from .. import models
 from ..db import get_session
 from ..deps import require_user
 from ..meili import index_profile
+from ..notifications import invalidate_shop_routing
 from ..schemas import (
     DashboardShopContact,
     DashboardShopMenu,
@@ -483,5 +484,7 @@ async def update_dashboard_shop_profile(
     await db.commit()
     await db.refresh(profile)
     await _reindex_profile(db, profile)
+    # Cached notification routing carries the shop name.
+    invalidate_shop_routing(profile.id)
 
     return _serialize_profile(profile)
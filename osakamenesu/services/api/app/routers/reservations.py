@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime, timezone
 from typing import Optional
-from uuid import UUID
+from uuid import UUID, uuid4
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy import select
@@ -17,6 +17,14 @@ from ..schemas import (
     ReservationUpdateRequest,
 )
 from ..deps import require_admin, audit_admin, get_optional_user
+from ..events import reservation_event, stage
+from ..jobs.escalation import escalation_due_at
+from ..notifications import (
+    fire_and_forget,
+    reservation_notification_from_model,
+    send_reservation_notification,
+)
+from .shops import invalidate_availability_cache
 
 
 router = APIRouter(prefix="/api/v1/reservations", tags=["reservations"])
@@ -60,10 +68,15 @@ def _reservation_to_schema(reservation: models.Reservation) -> ReservationSchema
     )
 
 
-async def _ensure_shop(db: AsyncSession, shop_id: UUID) -> None:
-    exists = await db.get(models.Profile, shop_id)
-    if not exists:
+async def _ensure_shop(db: AsyncSession, shop_id: UUID) -> models.Profile:
+    profile = await db.get(models.Profile, shop_id)
+    if not profile:
         raise HTTPException(status_code=404, detail="shop not found")
+    return profile
+
+
+def _notify(reservation: models.Reservation, shop_name: str = "") -> None:
+    fire_and_forget(send_reservation_notification(reservation_notification_from_model(reservation, shop_name)))
 
 
 async def _check_overlap(
@@ -94,13 +107,14 @@ async def create_reservation(
     if payload.desired_end <= payload.desired_start:
         raise HTTPException(status_code=400, detail="desired_end must be after desired_start")
 
-    await _ensure_shop(db, payload.shop_id)
+    shop = await _ensure_shop(db, payload.shop_id)
 
     has_overlap = await _check_overlap(db, payload.shop_id, payload.desired_start, payload.desired_end)
     if has_overlap:
         raise HTTPException(status_code=409, detail="conflicting reservation slot")
 
     reservation = models.Reservation(
+        id=uuid4(),
         shop_id=payload.shop_id,
         staff_id=payload.staff_id,
         menu_id=payload.menu_id,
@@ -120,6 +134,7 @@ async def create_reservation(
     if not reservation.status:
         reservation.status = 'pending'
     initial_status = reservation.status
+    reservation.escalate_at = escalation_due_at(datetime.now(timezone.utc))
     status_event = models.ReservationStatusEvent(
         status=initial_status,
         changed_at=datetime.now(timezone.utc),
@@ -129,10 +144,16 @@ async def create_reservation(
     reservation.status_events.append(status_event)
 
     db.add(reservation)
+    await stage(
+        db,
+        reservation_event("reservation.created", reservation.shop_id, reservation.id, initial_status, status_event.changed_at),
+    )
     await db.commit()
+    invalidate_availability_cache(reservation.shop_id)
     await db.refresh(reservation)
     await db.refresh(reservation, attribute_names=["status_events"])
 
+    _notify(reservation, shop.name)
     return _reservation_to_schema(reservation).model_dump()
 
 
@@ -191,9 +212,15 @@ async def update_reservation(
             note=note,
         )
         db.add(event)
+    if status_changed:
+        await stage(db, reservation_event("reservation.status_changed", reservation.shop_id, reservation.id, reservation.status))
 
     await db.commit()
+    if status_changed:
+        invalidate_availability_cache(reservation.shop_id)
     await db.refresh(reservation)
     await db.refresh(reservation, attribute_names=["status_events"])
 
+    if status_changed:
+        _notify(reservation)
     return _reservation_to_schema(reservation).model_dump()
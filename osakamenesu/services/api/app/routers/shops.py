@@ -1,20 +1,28 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone, date
-from typing import Any, Dict, Iterable, List, Set
+from datetime import datetime, time, timedelta, timezone, date
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Literal, Sequence, Set
 from uuid import UUID
 import uuid
 import logging
+from zoneinfo import ZoneInfo
 
+import orjson
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from .. import models
-from ..db import get_session
-from ..meili import search as meili_search, build_filter
+from ..db import REPLICA_MAX_LAG_SECONDS, get_read_session, get_session, is_replica_session, read_session_scope
+from ..meili import search as meili_search, build_after_filter, build_filter
+from ..metrics import coalesce_observer
+from ..settings import settings
 from ..schemas import (
     AvailabilityCalendar,
+    AvailabilityCompactCalendar,
+    AvailabilityCompactDay,
     AvailabilityDay,
     AvailabilitySlot,
     ContactInfo,
@@ -28,8 +36,11 @@ from ..schemas import (
     ReviewItem,
     ReviewListResponse,
     ReviewSummary,
-    ShopStaffPreview,
+    ShopCard,
+    ShopCardSearchResponse,
     ShopDetail,
+    ShopPin,
+    ShopPinSearchResponse,
     ShopSearchResponse,
     ShopSummary,
     SocialLink,
@@ -38,13 +49,55 @@ from ..schemas import (
     DiaryItem,
     DiaryListResponse,
 )
-from ..utils.profiles import build_profile_doc, infer_store_name, compute_review_summary, PRICE_BANDS
+from ..utils.pagination import InvalidCursor, decode_cursor, encode_cursor
+from ..utils.profiles import build_profile_doc, infer_store_name, compute_review_summary, id_rank, PRICE_BANDS
+from ..utils.cache import TTLCache
+from ..utils.singleflight import SingleFlight
 
 
 logger = logging.getLogger(__name__)
 
 
 router = APIRouter(prefix="/api/v1/shops", tags=["shops"])
+JST = ZoneInfo("Asia/Tokyo")
+
+
+def _orjson_default(value: Any) -> Any:
+    # orjson only takes exact uuid.UUID instances; asyncpg returns its own subclass.
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class ShopJSONResponse(ORJSONResponse):
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
+
+# Identical concurrent reads share one computation (see _with_read_session).
+_COALESCE_MAX_WAITERS = int(getattr(settings, "coalesce_max_waiters", 500) or 500)
+_search_flight: SingleFlight[tuple, Dict[str, Any]] = SingleFlight(
+    _COALESCE_MAX_WAITERS, on_call=coalesce_observer("shop_search")
+)
+_detail_flight: SingleFlight[str, Dict[str, Any]] = SingleFlight(
+    _COALESCE_MAX_WAITERS, on_call=coalesce_observer("shop_detail")
+)
+_availability_flight: SingleFlight[tuple, Dict[str, Any]] = SingleFlight(
+    _COALESCE_MAX_WAITERS, on_call=coalesce_observer("shop_availability")
+)
+
+# Calendars default to a rolling window so payloads stay constant-sized however
+# long a shop has been listed; explicit ranges are capped at the same bound.
+AVAILABILITY_WINDOW_DAYS = max(1, int(getattr(settings, "availability_window_days", 14) or 14))
+AVAILABILITY_MAX_DAYS = 62
+AVAILABILITY_CELL = timedelta(minutes=15)
+_availability_cache: TTLCache[tuple, tuple] = TTLCache(
+    float(getattr(settings, "availability_cache_ttl_seconds", 30.0) or 0.0),
+    max_entries=2048,
+)
+# Shops written to recently: the replica may not have the write yet.
+_availability_recent_writes: TTLCache[UUID, bool] = TTLCache(REPLICA_MAX_LAG_SECONDS, max_entries=2048)
 
 PRICE_BAND_LABELS: Dict[str, str] = {key: label for key, *_rest, label in PRICE_BANDS}
 PRICE_BAND_LABELS.setdefault("unknown", "価格未設定")
@@ -71,6 +124,31 @@ SORT_ALIASES: Dict[str, List[str]] = {
 }
 
 
+async def _with_read_session(fn: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any) -> Any:
+    # A coalesced computation serves every waiter, so it owns its session instead
+    # of borrowing the one bound to the request that happened to start it.
+    async with read_session_scope() as db:
+        return await fn(db, *args, **kwargs)
+
+
+def _comma_set(value: str | None) -> str:
+    return ",".join(sorted({item.strip() for item in (value or "").split(",") if item.strip()}))
+
+
+def _search_key(params: Dict[str, Any]) -> tuple:
+    normalized = dict(params)
+    for name in ("service_tags", "price_band", "ranking_badges_param"):
+        normalized[name] = _comma_set(params.get(name))
+    return tuple(sorted(normalized.items()))
+
+
+def _shop_key(shop_id: str) -> str:
+    try:
+        return str(uuid.UUID(shop_id))
+    except ValueError:
+        return shop_id
+
+
 def serialize_review(review: models.Review) -> ReviewItem:
     return ReviewItem(
         id=review.id,
@@ -175,6 +253,26 @@ def _resolve_sort(sort: str | None) -> List[str]:
     return SORT_ALIASES.get(key, DEFAULT_SORT)
 
 
+def _search_after(cursor: str, sort_expr: List[str]) -> str:
+    """Meilisearch filter for the page following ``cursor`` under ``sort_expr``."""
+    try:
+        cursor_sort, values, last_id = decode_cursor(cursor, 3)
+        if cursor_sort != sort_expr or not isinstance(values, list) or len(values) != len(sort_expr):
+            raise InvalidCursor("cursor does not match sort")
+        tiebreak = id_rank(UUID(str(last_id)))
+    except (InvalidCursor, ValueError):
+        raise HTTPException(status_code=400, detail="invalid cursor")
+    return build_after_filter(sort_expr, values, tiebreak)
+
+
+def _next_search_cursor(hits: List[Dict[str, Any]], sort_expr: List[str], page_size: int) -> str | None:
+    if len(hits) < page_size:
+        return None
+    last = hits[-1]
+    values = [last.get(spec.partition(":")[0]) for spec in sort_expr]
+    return encode_cursor([sort_expr, values, last["id"]])
+
+
 def _parse_datetime(value: Any) -> datetime | None:
     if isinstance(value, datetime):
         return value
@@ -241,56 +339,146 @@ def _facet_label(name: str, value: str) -> str:
 
 
 def _doc_to_shop_summary(doc: Dict[str, Any]) -> ShopSummary:
-    first_photo = None
-    photos = doc.get("photos") or []
-    if isinstance(photos, list) and photos:
-        first_photo = photos[0]
-    promotions_raw = doc.get("promotions")
-    promotions = _normalize_promotions(promotions_raw)
-    review_score = doc.get("review_score")
-    rating = review_score if review_score is not None else doc.get("rating")
-    review_count = doc.get("review_count")
-    return ShopSummary(
-        id=UUID(doc["id"]),
-        slug=doc.get("slug"),
-        name=doc.get("name", ""),
-        store_name=doc.get("store_name"),
-        area=doc.get("area", ""),
-        area_name=doc.get("area_name"),
-        address=doc.get("address"),
-        categories=list(doc.get("categories", []) or []),
-        service_tags=list(doc.get("body_tags", []) or []),
-        min_price=doc.get("price_min", 0) or 0,
-        max_price=doc.get("price_max", 0) or 0,
-        nearest_station=doc.get("nearest_station"),
-        station_line=doc.get("station_line"),
-        station_exit=doc.get("station_exit"),
-        station_walk_minutes=doc.get("station_walk_minutes"),
-        latitude=doc.get("latitude"),
-        longitude=doc.get("longitude"),
-        rating=rating,
-        review_count=review_count,
-        lead_image_url=first_photo,
-        badges=list(doc.get("ranking_badges", []) or []),
-        today_available=doc.get("today"),
-        next_available_at=_unix_to_dt(doc.get("next_available_at")),
-        distance_km=doc.get("distance_km"),
-        online_reservation=doc.get("online_reservation"),
-        updated_at=_unix_to_dt(doc.get("updated_at")),
-        ranking_reason=doc.get("ranking_reason"),
-        promotions=promotions,
-        price_band=doc.get("price_band"),
-        price_band_label=doc.get("price_band_label"),
-        has_promotions=doc.get("has_promotions"),
-        has_discounts=doc.get("has_discounts"),
-        promotion_count=doc.get("promotion_count"),
-        ranking_score=doc.get("ranking_score"),
-        diary_count=doc.get("diary_count"),
-        has_diaries=doc.get("has_diaries"),
-        staff_preview=_normalize_staff_preview(doc.get("staff_preview")),
+    # Runs for every search hit: nested entries stay plain dicts so the whole
+    # summary is validated by a single pydantic-core call.
+    get = doc.get
+    photos = get("photos") or []
+    review_score = get("review_score")
+    return ShopSummary.model_validate(
+        {
+            "id": doc["id"],
+            "slug": get("slug"),
+            "name": get("name", ""),
+            "store_name": get("store_name"),
+            "area": get("area", ""),
+            "area_name": get("area_name"),
+            "address": get("address"),
+            "categories": list(get("categories", []) or []),
+            "service_tags": list(get("body_tags", []) or []),
+            "min_price": get("price_min", 0) or 0,
+            "max_price": get("price_max", 0) or 0,
+            "nearest_station": get("nearest_station"),
+            "station_line": get("station_line"),
+            "station_exit": get("station_exit"),
+            "station_walk_minutes": get("station_walk_minutes"),
+            "latitude": get("latitude"),
+            "longitude": get("longitude"),
+            "rating": review_score if review_score is not None else get("rating"),
+            "review_count": get("review_count"),
+            "lead_image_url": photos[0] if isinstance(photos, list) and photos else None,
+            "badges": list(get("ranking_badges", []) or []),
+            "today_available": get("today"),
+            "next_available_at": _unix_to_dt(get("next_available_at")),
+            "distance_km": get("distance_km"),
+            "online_reservation": get("online_reservation"),
+            "updated_at": _unix_to_dt(get("updated_at")),
+            "ranking_reason": get("ranking_reason"),
+            "promotions": _promotion_entries(get("promotions")),
+            "price_band": get("price_band"),
+            "price_band_label": get("price_band_label"),
+            "has_promotions": get("has_promotions"),
+            "has_discounts": get("has_discounts"),
+            "promotion_count": get("promotion_count"),
+            "ranking_score": get("ranking_score"),
+            "diary_count": get("diary_count"),
+            "has_diaries": get("has_diaries"),
+            "staff_preview": _staff_preview_entries(get("staff_preview")),
+        }
+    )
+
+
+def _doc_to_shop_card(doc: Dict[str, Any]) -> ShopCard:
+    get = doc.get
+    photos = get("photos") or []
+    review_score = get("review_score")
+    return ShopCard.model_validate(
+        {
+            "id": doc["id"],
+            "slug": get("slug"),
+            "name": get("name", ""),
+            "store_name": get("store_name"),
+            "area": get("area", ""),
+            "nearest_station": get("nearest_station"),
+            "station_walk_minutes": get("station_walk_minutes"),
+            "min_price": get("price_min", 0) or 0,
+            "max_price": get("price_max", 0) or 0,
+            "rating": review_score if review_score is not None else get("rating"),
+            "review_count": get("review_count"),
+            "lead_image_url": photos[0] if isinstance(photos, list) and photos else None,
+            "badges": list(get("ranking_badges", []) or []),
+            "today_available": get("today"),
+            "price_band_label": get("price_band_label"),
+            "has_promotions": get("has_promotions"),
+        }
+    )
+
+
+def _doc_to_shop_pin(doc: Dict[str, Any]) -> ShopPin:
+    get = doc.get
+    return ShopPin.model_validate(
+        {
+            "id": doc["id"],
+            "name": get("name", ""),
+            "latitude": get("latitude"),
+            "longitude": get("longitude"),
+            "min_price": get("price_min", 0) or 0,
+            "today_available": get("today"),
+        }
     )
 
 
+SEARCH_FACETS = [
+    "area",
+    "nearest_station",
+    "station_line",
+    "service_type",
+    "body_tags",
+    "today",
+    "price_band",
+    "ranking_badges",
+    "has_promotions",
+    "has_discounts",
+    "has_diaries",
+]
+
+# Named projections for ``fields=``: the Meilisearch attributes to retrieve
+# (None = whole document), the hit converter, the response model and whether
+# facet counts are computed. Pins feed the map, which reuses the list's facets.
+SEARCH_PROJECTIONS: Dict[str, tuple] = {
+    "full": (None, _doc_to_shop_summary, ShopSearchResponse, True),
+    "card": (
+        [
+            "id",
+            "slug",
+            "name",
+            "store_name",
+            "area",
+            "nearest_station",
+            "station_walk_minutes",
+            "price_min",
+            "price_max",
+            "review_score",
+            "rating",
+            "review_count",
+            "photos",
+            "ranking_badges",
+            "today",
+            "price_band_label",
+            "has_promotions",
+        ],
+        _doc_to_shop_card,
+        ShopCardSearchResponse,
+        True,
+    ),
+    "pin": (
+        ["id", "name", "latitude", "longitude", "price_min", "today"],
+        _doc_to_shop_pin,
+        ShopPinSearchResponse,
+        False,
+    ),
+}
+
+
 def _build_facets(
     facet_distribution: Dict[str, Dict[str, int]] | None,
     selected: Dict[str, Set[str]] | None = None,
@@ -504,8 +692,8 @@ def _parse_review_date(value: Any) -> date | None:
     return None
 
 
-def _normalize_promotions(*sources: Any) -> List[Promotion]:
-    promotions: List[Promotion] = []
+def _promotion_entries(*sources: Any) -> List[Dict[str, Any]]:
+    promotions: List[Dict[str, Any]] = []
     seen: Set[tuple[str, str | None, str | None]] = set()
     for source in sources:
         if not isinstance(source, list):
@@ -526,18 +714,28 @@ def _normalize_promotions(*sources: Any) -> List[Promotion]:
                 continue
             seen.add(key)
             promotions.append(
-                Promotion(
-                    label=label,
-                    description=str(description) if description else None,
-                    expires_at=expires_at,
-                    highlight=entry.get("highlight"),
-                )
+                {
+                    "label": label,
+                    "description": str(description) if description else None,
+                    "expires_at": expires_at,
+                    "highlight": entry.get("highlight"),
+                }
             )
     return promotions
 
 
-def _normalize_staff_preview(raw: Any) -> List[schemas.ShopStaffPreview]:
-    previews: List[ShopStaffPreview] = []
+def _normalize_promotions(*sources: Any) -> List[Promotion]:
+    return [Promotion.model_validate(entry) for entry in _promotion_entries(*sources)]
+
+
+def _stripped_or_none(value: Any) -> str | None:
+    if value is None:
+        return None
+    return str(value).strip() or None
+
+
+def _staff_preview_entries(raw: Any) -> List[Dict[str, Any]]:
+    previews: List[Dict[str, Any]] = []
     if not isinstance(raw, list):
         return previews
     for entry in raw:
@@ -550,21 +748,23 @@ def _normalize_staff_preview(raw: Any) -> List[schemas.ShopStaffPreview]:
         if not name:
             continue
         specialties_raw = entry.get("specialties")
+        specialties: List[str] = []
         if isinstance(specialties_raw, list):
-            specialties = [str(tag).strip() for tag in specialties_raw if str(tag).strip()]
-        else:
-            specialties = []
+            for tag in specialties_raw:
+                text = str(tag).strip()
+                if text:
+                    specialties.append(text)
         previews.append(
-            ShopStaffPreview(
-                id=(str(entry.get("id")).strip() or None) if entry.get("id") is not None else None,
-                name=name,
-                alias=(str(entry.get("alias")).strip() or None) if entry.get("alias") is not None else None,
-                headline=(str(entry.get("headline")).strip() or None) if entry.get("headline") is not None else None,
-                rating=_safe_float(entry.get("rating")),
-                review_count=_safe_int(entry.get("review_count")),
-                avatar_url=(str(entry.get("avatar_url")).strip() or None) if entry.get("avatar_url") is not None else None,
-                specialties=specialties,
-            )
+            {
+                "id": _stripped_or_none(entry.get("id")),
+                "name": name,
+                "alias": _stripped_or_none(entry.get("alias")),
+                "headline": _stripped_or_none(entry.get("headline")),
+                "rating": _safe_float(entry.get("rating")),
+                "review_count": _safe_int(entry.get("review_count")),
+                "avatar_url": _stripped_or_none(entry.get("avatar_url")),
+                "specialties": specialties,
+            }
         )
     return previews
 
@@ -625,6 +825,14 @@ def _normalize_reviews(raw: Any) -> ReviewSummary:
         highlighted=highlighted,
     )
 
+def _availability_days(records: Iterable[models.Availability]) -> List[AvailabilityDay]:
+    today = datetime.now(JST).date()
+    return [
+        AvailabilityDay(date=record.date, is_today=record.date == today, slots=_convert_slots(record.slots_json))
+        for record in records
+    ]
+
+
 async def _fetch_availability(
     db: AsyncSession, shop_id: UUID, start_date: date | None = None, end_date: date | None = None
 ) -> AvailabilityCalendar | None:
@@ -643,27 +851,114 @@ async def _fetch_availability(
     if not records:
         return None
 
-    days: List[AvailabilityDay] = []
-    today = date.today()
-    for record in records:
-        slots = _convert_slots(record.slots_json)
-        days.append(
-            AvailabilityDay(
-                date=record.date,
-                is_today=record.date == today,
-                slots=slots,
-            )
-        )
     return AvailabilityCalendar(
         shop_id=shop_id,
         generated_at=datetime.now(timezone.utc),
-        days=days,
+        days=_availability_days(records),
+    )
+
+
+async def _fetch_availability_many(
+    db: AsyncSession, shop_ids: Iterable[UUID], start_date: date, end_date: date
+) -> Dict[UUID, List[AvailabilityDay]]:
+    """Availability days for several shops in one query; shops without rows are absent."""
+    ids = set(shop_ids)
+    if not ids:
+        return {}
+    result = await db.execute(
+        select(models.Availability)
+        .where(models.Availability.profile_id.in_(ids))
+        .where(models.Availability.date >= start_date, models.Availability.date <= end_date)
+        .order_by(models.Availability.profile_id, models.Availability.date.asc())
+    )
+    by_shop: Dict[UUID, List[models.Availability]] = {}
+    for record in result.scalars().all():
+        by_shop.setdefault(record.profile_id, []).append(record)
+    return {shop_id: _availability_days(records) for shop_id, records in by_shop.items()}
+
+
+def _availability_window(date_from: date | None, date_to: date | None) -> tuple[date, date]:
+    span = timedelta(days=AVAILABILITY_WINDOW_DAYS - 1)
+    if date_from is None:
+        date_from = date_to - span if date_to else datetime.now(JST).date()
+    start = date_from
+    end = date_to or start + span
+    if end < start:
+        raise HTTPException(status_code=400, detail="date_to must not be before date_from")
+    if (end - start).days >= AVAILABILITY_MAX_DAYS:
+        raise HTTPException(status_code=400, detail=f"date range is limited to {AVAILABILITY_MAX_DAYS} days")
+    return start, end
+
+
+async def _cached_availability(
+    db: AsyncSession, shop_id: UUID, start_date: date, end_date: date
+) -> AvailabilityCalendar | None:
+    """``_fetch_availability`` for one window, cached until the shop's next write.
+
+    Availability upserts and reservation writes in this process invalidate the
+    shop's entries. Writes made elsewhere (other replicas, the expiry job) show
+    up once the entry expires, after ``availability_cache_ttl_seconds``. Within
+    the replica lag window after a write, a calendar read from the replica is
+    served but not cached, since it may predate the write. The key includes the
+    JST date so ``is_today`` turns over at midnight. The calendar is shared
+    between requests and must not be mutated.
+    """
+    key = (shop_id, start_date, end_date, datetime.now(JST).date())
+    cached = _availability_cache.get(key)
+    if cached is not None:
+        return cached[0]
+    calendar = await _fetch_availability(db, shop_id, start_date=start_date, end_date=end_date)
+    if not (is_replica_session(db) and _availability_recent_writes.get(shop_id)):
+        _availability_cache.set(key, (calendar,))
+    return calendar
+
+
+def invalidate_availability_cache(shop_id: UUID) -> None:
+    _availability_cache.invalidate_where(lambda key: key[0] == shop_id)
+    _availability_recent_writes.set(shop_id, True)
+
+
+_STATUS_RANK = {"blocked": 0, "tentative": 1, "open": 2}
+_STATUS_CODE = {"open": "o", "tentative": "t", "blocked": "b"}
+
+
+def _compact_day(day: AvailabilityDay) -> AvailabilityCompactDay:
+    midnight = datetime.combine(day.date, time.min, JST)
+    # Slots may run past midnight; anything beyond the next day is dropped.
+    limit = 2 * (timedelta(days=1) // AVAILABILITY_CELL)
+    cells: Dict[int, str] = {}
+    for slot in day.slots:
+        start = slot.start_at if slot.start_at.tzinfo else slot.start_at.replace(tzinfo=JST)
+        end = slot.end_at if slot.end_at.tzinfo else slot.end_at.replace(tzinfo=JST)
+        first = max(0, (start - midnight) // AVAILABILITY_CELL)
+        last = min(limit, -((midnight - end) // AVAILABILITY_CELL))
+        rank = _STATUS_RANK[slot.status]
+        for cell in range(first, last):
+            current = cells.get(cell)
+            if current is None or rank > _STATUS_RANK[current]:
+                cells[cell] = slot.status
+    runs: List[List[Any]] = []
+    for cell in sorted(cells):
+        code = _STATUS_CODE[cells[cell]]
+        if runs and runs[-1][0] + runs[-1][1] == cell and runs[-1][2] == code:
+            runs[-1][1] += 1
+        else:
+            runs.append([cell, 1, code])
+    return AvailabilityCompactDay(date=day.date, is_today=day.is_today, runs=runs)
+
+
+def _compact_calendar(calendar: AvailabilityCalendar) -> AvailabilityCompactCalendar:
+    return AvailabilityCompactCalendar(
+        shop_id=calendar.shop_id,
+        generated_at=calendar.generated_at,
+        cell_minutes=AVAILABILITY_CELL // timedelta(minutes=1),
+        days=[_compact_day(day) for day in calendar.days],
     )
 
 
 async def _filter_results_by_availability(
-    db: AsyncSession, shops: List[ShopSummary], target_date: date
-) -> List[ShopSummary]:
+    db: AsyncSession, shops: Sequence[Any], target_date: date
+) -> List[Any]:
     if not shops:
         return []
     shop_ids = [shop.id for shop in shops]
@@ -681,27 +976,30 @@ async def _filter_results_by_availability(
     return [shop for shop in shops if shop.id in eligible]
 
 
-@router.get("")
-async def search_shops(
-    q: str | None = Query(default=None, description="Free text query"),
-    area: str | None = Query(default=None, description="Area code filter"),
-    station: str | None = Query(default=None, description="Nearest station filter"),
-    category: str | None = Query(default=None, description="Service category"),
-    service_tags: str | None = Query(default=None, description="Comma separated service tags"),
-    price_min: int | None = Query(default=None, ge=0),
-    price_max: int | None = Query(default=None, ge=0),
-    available_date: date | None = Query(default=None, description="Required availability date"),
-    open_now: bool | None = Query(default=None),
-    price_band: str | None = Query(default=None, description="Comma separated price band keys"),
-    ranking_badges_param: str | None = Query(default=None, description="Comma separated ranking badge keys"),
-    promotions_only: bool | None = Query(default=None, description="Filter shops with promotions"),
-    discounts_only: bool | None = Query(default=None, description="Filter shops with discounts"),
-    diaries_only: bool | None = Query(default=None, description="Filter shops with published diaries"),
-    sort: str | None = Query(default=None),
-    page: int = Query(default=1, ge=1),
-    page_size: int = Query(default=12, ge=1, le=50),
-    db: AsyncSession = Depends(get_session),
-):
+async def _search_payload(
+    db: AsyncSession,
+    *,
+    q: str | None,
+    area: str | None,
+    station: str | None,
+    category: str | None,
+    service_tags: str | None,
+    price_min: int | None,
+    price_max: int | None,
+    available_date: date | None,
+    open_now: bool | None,
+    price_band: str | None,
+    ranking_badges_param: str | None,
+    promotions_only: bool | None,
+    discounts_only: bool | None,
+    diaries_only: bool | None,
+    sort: str | None,
+    page: int,
+    page_size: int,
+    fields: str = "full",
+    cursor: str | None = None,
+) -> Dict[str, Any]:
+    attributes, to_result, response_model, with_facets = SEARCH_PROJECTIONS[fields]
     # Map request filters to existing Meilisearch document structure
     body_tags = [tag.strip() for tag in (service_tags or "").split(",") if tag.strip()]
     price_bands = [band.strip() for band in (price_band or "").split(",") if band.strip()]
@@ -723,26 +1021,23 @@ async def search_shops(
         has_diaries=diaries_only,
     )
     sort_expr = _resolve_sort(sort)
+    # Text relevance outranks the sort keys, so only unqueried searches get
+    # cursors; those fetch their sort keys and replace the offset with a range
+    # filter, keeping deep pages as cheap as the first and clear of maxTotalHits.
+    keyset = not q
+    if keyset and attributes:
+        attributes = attributes + [spec.partition(":")[0] for spec in sort_expr]
+    after = _search_after(cursor, sort_expr) if cursor else None
     try:
         res = meili_search(
             q,
             filter_expr,
-            sort_expr,
+            sort_expr + ["id_rank:asc"],
             page,
             page_size,
-            facets=[
-                "area",
-                "nearest_station",
-                "station_line",
-                "service_type",
-                "body_tags",
-                "today",
-                "price_band",
-                "ranking_badges",
-                "has_promotions",
-                "has_discounts",
-                "has_diaries",
-            ],
+            facets=SEARCH_FACETS if with_facets else None,
+            attributes=attributes,
+            after=after,
         )
     except Exception:
         logger.exception(
@@ -755,7 +1050,7 @@ async def search_shops(
                 "page_size": page_size,
             },
         )
-        empty = ShopSearchResponse(
+        empty = response_model(
             page=page,
             page_size=page_size,
             total=0,
@@ -765,7 +1060,7 @@ async def search_shops(
         empty["_error"] = "search temporarily unavailable"
         return empty
     hits = res.get("hits", [])
-    results = [_doc_to_shop_summary(doc) for doc in hits]
+    results = [to_result(doc) for doc in hits]
 
     if available_date:
         results = await _filter_results_by_availability(db, results, available_date)
@@ -792,27 +1087,92 @@ async def search_shops(
     if diaries_only is not None:
         selected_facets["has_diaries"] = {"true" if diaries_only else "false"}
 
-    response = ShopSearchResponse(
+    response = response_model(
         page=page,
         page_size=page_size,
         total=len(results) if available_date else res.get("estimatedTotalHits", 0),
         results=results,
         facets=_build_facets(res.get("facetDistribution"), selected_facets),
+        next_cursor=_next_search_cursor(hits, sort_expr, page_size) if keyset else None,
     )
     return response.model_dump()
 
 
-@router.get("/{shop_id}")
-async def get_shop_detail(shop_id: str, db: AsyncSession = Depends(get_session)):
+@router.get("", response_class=ShopJSONResponse)
+async def search_shops(
+    q: str | None = Query(default=None, description="Free text query"),
+    area: str | None = Query(default=None, description="Area code filter"),
+    station: str | None = Query(default=None, description="Nearest station filter"),
+    category: str | None = Query(default=None, description="Service category"),
+    service_tags: str | None = Query(default=None, description="Comma separated service tags"),
+    price_min: int | None = Query(default=None, ge=0),
+    price_max: int | None = Query(default=None, ge=0),
+    available_date: date | None = Query(default=None, description="Required availability date"),
+    open_now: bool | None = Query(default=None),
+    price_band: str | None = Query(default=None, description="Comma separated price band keys"),
+    ranking_badges_param: str | None = Query(default=None, description="Comma separated ranking badge keys"),
+    promotions_only: bool | None = Query(default=None, description="Filter shops with promotions"),
+    discounts_only: bool | None = Query(default=None, description="Filter shops with discounts"),
+    diaries_only: bool | None = Query(default=None, description="Filter shops with published diaries"),
+    sort: str | None = Query(default=None),
+    page: int = Query(default=1, ge=1),
+    page_size: int = Query(default=12, ge=1, le=50),
+    fields: Literal["full", "card", "pin"] = Query(
+        default="full",
+        description="Result projection: full summaries, compact list cards, or map pins (pins omit facets)",
+    ),
+    cursor: str | None = Query(
+        default=None,
+        description="next_cursor from a previous page; replaces page and cannot be combined with q",
+    ),
+):
+    if cursor:
+        if q:
+            raise HTTPException(status_code=400, detail="cursor pagination cannot be combined with q")
+        # Reject bad cursors here rather than failing every coalesced waiter.
+        _search_after(cursor, _resolve_sort(sort))
+    params = {
+        "q": q,
+        "area": area,
+        "station": station,
+        "category": category,
+        "service_tags": service_tags,
+        "price_min": price_min,
+        "price_max": price_max,
+        "available_date": available_date,
+        "open_now": open_now,
+        "price_band": price_band,
+        "ranking_badges_param": ranking_badges_param,
+        "promotions_only": promotions_only,
+        "discounts_only": discounts_only,
+        "diaries_only": diaries_only,
+        "sort": sort,
+        "page": page,
+        "page_size": page_size,
+        "fields": fields,
+        "cursor": cursor,
+    }
+    payload = await _search_flight.do(
+        _search_key(params), lambda: _with_read_session(_search_payload, **params)
+    )
+    # Returning a response skips FastAPI's jsonable_encoder pass over the dump.
+    return ShopJSONResponse(payload)
+
+
+async def _shop_detail_payload(db: AsyncSession, shop_id: str) -> Dict[str, Any]:
     profile = None
+    # Reviews and diaries feed the document, the review summary and the diary
+    # snippets; load them with the profile instead of lazily afterwards.
+    related = (selectinload(models.Profile.reviews), selectinload(models.Profile.diaries))
     try:
         profile_uuid = uuid.UUID(shop_id)
     except ValueError:
-        profile = await db.scalar(select(models.Profile).where(models.Profile.slug == shop_id))
+        by_slug = select(models.Profile).options(*related)
+        profile = await db.scalar(by_slug.where(models.Profile.slug == shop_id))
         if not profile:
-            profile = await db.scalar(select(models.Profile).where(models.Profile.name == shop_id))
+            profile = await db.scalar(by_slug.where(models.Profile.name == shop_id))
     else:
-        profile = await db.get(models.Profile, profile_uuid)
+        profile = await db.get(models.Profile, profile_uuid, options=related)
 
     if not profile:
         raise HTTPException(status_code=404, detail="shop not found")
@@ -827,10 +1187,6 @@ async def get_shop_detail(shop_id: str, db: AsyncSession = Depends(get_session))
     staff_members = _normalize_staff(contact_data.get("staff"), profile.id)
     service_tags = contact_data.get("service_tags") if isinstance(contact_data.get("service_tags"), list) else profile.body_tags or []
     promotions = _normalize_promotions(profile.discounts or [], contact_data.get("promotions"))
-    try:
-        await db.refresh(profile, attribute_names=["reviews", "diaries"])
-    except Exception:
-        await db.refresh(profile, attribute_names=["reviews"])
     review_avg, review_count, review_highlights = compute_review_summary(
         profile,
         contact_data.get("reviews"),
@@ -921,19 +1277,27 @@ async def get_shop_detail(shop_id: str, db: AsyncSession = Depends(get_session))
         diaries=diary_snippets,
     )
 
-    availability = await _fetch_availability(db, profile.id)
+    availability = await _cached_availability(db, profile.id, *_availability_window(None, None))
     if availability:
         shop_summary.availability_calendar = availability
 
     return shop_summary.model_dump()
 
 
+@router.get("/{shop_id}", response_class=ShopJSONResponse)
+async def get_shop_detail(shop_id: str):
+    payload = await _detail_flight.do(
+        _shop_key(shop_id), lambda: _with_read_session(_shop_detail_payload, shop_id)
+    )
+    return ShopJSONResponse(payload)
+
+
 @router.get("/{shop_id}/diaries", response_model=DiaryListResponse)
 async def list_shop_diaries(
     shop_id: UUID,
     page: int = Query(default=1, ge=1),
     page_size: int = Query(default=6, ge=1, le=20),
-    db: AsyncSession = Depends(get_session),
+    db: AsyncSession = Depends(get_read_session),
 ):
     profile = await db.get(models.Profile, shop_id)
     if not profile:
@@ -949,29 +1313,47 @@ async def list_shop_diaries(
     return DiaryListResponse(total=total, items=items)
 
 
-@router.get("/{shop_id}/availability")
-async def get_shop_availability(
-    shop_id: UUID,
-    date_from: date | None = Query(default=None),
-    date_to: date | None = Query(default=None),
-    db: AsyncSession = Depends(get_session),
-):
+async def _availability_payload(
+    db: AsyncSession, shop_id: UUID, date_from: date, date_to: date, fmt: str = "slots"
+) -> Dict[str, Any]:
     profile = await db.get(models.Profile, shop_id)
     if not profile:
         raise HTTPException(status_code=404, detail="shop not found")
 
-    availability = await _fetch_availability(db, shop_id, start_date=date_from, end_date=date_to)
+    availability = await _cached_availability(db, shop_id, date_from, date_to)
     if not availability:
         raise HTTPException(status_code=404, detail="availability not found")
+    if fmt == "compact":
+        return _compact_calendar(availability).model_dump()
     return availability.model_dump()
 
 
+@router.get("/{shop_id}/availability")
+async def get_shop_availability(
+    shop_id: UUID,
+    date_from: date | None = Query(default=None, description="First day (defaults to today, JST)"),
+    date_to: date | None = Query(
+        default=None, description=f"Last day (defaults to a {AVAILABILITY_WINDOW_DAYS}-day window)"
+    ),
+    fmt: Literal["slots", "compact"] = Query(
+        default="slots",
+        alias="format",
+        description="slots: slot objects; compact: run-length 15-minute cells per day",
+    ),
+):
+    start, end = _availability_window(date_from, date_to)
+    return await _availability_flight.do(
+        (shop_id, start, end, fmt),
+        lambda: _with_read_session(_availability_payload, shop_id, start, end, fmt),
+    )
+
+
 @router.get("/{shop_id}/reviews", response_model=ReviewListResponse)
 async def list_shop_reviews(
     shop_id: UUID,
     page: int = Query(default=1, ge=1),
     page_size: int = Query(default=10, ge=1, le=50),
-    db: AsyncSession = Depends(get_session),
+    db: AsyncSession = Depends(get_read_session),
 ):
     profile = await db.get(models.Profile, shop_id)
     if not profile:
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, conint, constr, EmailStr
-from typing import Optional, List, Dict, Any, Literal
+from typing import Optional, List, Dict, Any, Literal, Tuple
 from uuid import UUID
 from datetime import datetime, date
 
@@ -194,12 +194,51 @@ class ShopSummary(BaseModel):
     staff_preview: List[ShopStaffPreview] = Field(default_factory=list)
 
 
+class ShopCard(BaseModel):
+    """Compact list card (``fields=card``)."""
+    id: UUID
+    slug: Optional[str] = None
+    name: str
+    store_name: Optional[str] = None
+    area: str
+    nearest_station: Optional[str] = None
+    station_walk_minutes: Optional[int] = None
+    min_price: int = Field(..., ge=0)
+    max_price: int = Field(..., ge=0)
+    rating: Optional[float] = None
+    review_count: Optional[int] = None
+    lead_image_url: Optional[str] = None
+    badges: List[str] = Field(default_factory=list)
+    today_available: Optional[bool] = None
+    price_band_label: Optional[str] = None
+    has_promotions: Optional[bool] = None
+
+
+class ShopPin(BaseModel):
+    """Map marker (``fields=pin``)."""
+    id: UUID
+    name: str
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    min_price: int = Field(..., ge=0)
+    today_available: Optional[bool] = None
+
+
 class ShopSearchResponse(BaseModel):
     page: int
     page_size: int
     total: int
     results: List[ShopSummary]
     facets: Dict[str, List[FacetValue]] = Field(default_factory=dict)
+    next_cursor: Optional[str] = None
+
+
+class ShopCardSearchResponse(ShopSearchResponse):
+    results: List[ShopCard]  # type: ignore[assignment]
+
+
+class ShopPinSearchResponse(ShopSearchResponse):
+    results: List[ShopPin]  # type: ignore[assignment]
 
 
 class MediaImage(BaseModel):
@@ -283,6 +322,26 @@ class AvailabilityCalendar(BaseModel):
     days: List[AvailabilityDay]
 
 
+class AvailabilityCompactDay(BaseModel):
+    date: date
+    is_today: Optional[bool] = None
+    runs: List[Tuple[int, int, Literal['o', 't', 'b']]] = Field(default_factory=list)
+
+
+class AvailabilityCompactCalendar(BaseModel):
+    """Run-length availability (``format=compact``).
+
+    Each run is ``[first_cell, cell_count, status]`` in ``cell_minutes`` cells
+    counted from local midnight of ``date`` (past 96 for overnight slots), with
+    status ``o``pen, ``t``entative or ``b``locked. Overlapping slots collapse to
+    the most available status; staff and menu ids are not included.
+    """
+    shop_id: UUID
+    generated_at: datetime
+    cell_minutes: int = 15
+    days: List[AvailabilityCompactDay]
+
+
 class HighlightedReview(BaseModel):
     review_id: Optional[UUID] = None
     title: str
@@ -320,8 +379,9 @@ class ReviewCreateRequest(BaseModel):
 
 
 class ReviewListResponse(BaseModel):
-    total: int
+    total: Optional[int] = None
     items: List[ReviewItem]
+    next_cursor: Optional[str] = None
 
 
 class ReviewModerationRequest(BaseModel):
@@ -439,8 +499,9 @@ class ReservationAdminSummary(BaseModel):
 
 
 class ReservationAdminList(BaseModel):
-    total: int
+    total: Optional[int] = None
     items: list[ReservationAdminSummary]
+    next_cursor: Optional[str] = None
 
 
 class ReservationAdminUpdate(BaseModel):
@@ -588,6 +649,7 @@ class ShopAdminSummary(BaseModel):
 
 class ShopAdminList(BaseModel):
     items: List[ShopAdminSummary]
+    next_cursor: Optional[str] = None
 
 
 class ShopAdminDetail(BaseModel):
@@ -614,16 +676,21 @@ DashboardNotificationStatus = Literal['pending', 'confirmed', 'declined', 'cance
 class DashboardNotificationChannelEmail(BaseModel):
     enabled: bool = False
     recipients: List[str] = Field(default_factory=list)
+    digest_window_minutes: int = Field(default=0, ge=0, le=60)
 
 
 class DashboardNotificationChannelLine(BaseModel):
     enabled: bool = False
+    # LINE Messaging API channel access token and the user/group id to push to.
     token: Optional[str] = None
+    to: Optional[str] = None
+    digest_window_minutes: int = Field(default=0, ge=0, le=60)
 
 
 class DashboardNotificationChannelSlack(BaseModel):
     enabled: bool = False
     webhook_url: Optional[str] = None
+    digest_window_minutes: int = Field(default=0, ge=0, le=60)
 
 
 class DashboardNotificationChannels(BaseModel):
@@ -636,12 +703,14 @@ class DashboardNotificationSettingsResponse(BaseModel):
     profile_id: UUID
     updated_at: datetime
     trigger_status: List[DashboardNotificationStatus] = Field(default_factory=list)
+    urgent_status: List[DashboardNotificationStatus] = Field(default_factory=list)
     channels: DashboardNotificationChannels
 
 
 class DashboardNotificationSettingsUpdatePayload(BaseModel):
     updated_at: datetime
     trigger_status: List[DashboardNotificationStatus]
+    urgent_status: Optional[List[DashboardNotificationStatus]] = None
     channels: DashboardNotificationChannels
 
 
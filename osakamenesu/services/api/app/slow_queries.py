@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import re
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from .request_context import current_request
+from .settings import settings
+
+logger = logging.getLogger("app.slow_query")
+
+THRESHOLD_SECONDS = float(getattr(settings, "slow_query_threshold_ms", 200.0) or 0.0) / 1000.0
+MAX_TRACKED_STATEMENTS = 500
+
+_WHITESPACE = re.compile(r"\s+")
+_PLACEHOLDER = re.compile(r"\$\d+|%\(\w+\)s|(?<!:):\w+\b|\?")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w$.])-?\d+(?:\.\d+)?\b")
+# asyncpg renders expanded IN lists with a cast per element: ($1::UUID, $2::UUID).
+_CAST = r"(?:::\w+(?: \w+)*(?:\[\])?)?"
+_IN_LIST = re.compile(rf"\(\s*\?{_CAST}(?:\s*,\s*\?{_CAST})+\s*\)")
+
+
+@lru_cache(maxsize=2048)
+def normalize_sql(statement: str) -> str:
+    """Collapse a statement to its shape so N+1 variants share one entry."""
+    sql = _WHITESPACE.sub(" ", statement).strip()
+    sql = _STRING_LITERAL.sub("?", sql)
+    sql = _PLACEHOLDER.sub("?", sql)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    return _IN_LIST.sub("(?...)", sql)
+
+
+def parameters_fingerprint(parameters: Any) -> str:
+    try:
+        raw = repr(parameters)
+    except Exception:  # pragma: no cover - defensive
+        return "-"
+    return hashlib.sha1(raw.encode("utf-8", "replace")).hexdigest()[:12]
+
+
+@dataclass
+class StatementStats:
+    sql: str
+    count: int = 0
+    slow_count: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    last_route: Optional[str] = None
+    last_request_id: Optional[str] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "sql": self.sql,
+            "count": self.count,
+            "slow_count": self.slow_count,
+            "total_ms": round(self.total_seconds * 1000, 3),
+            "mean_ms": round(self.total_seconds * 1000 / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max_seconds * 1000, 3),
+            "last_route": self.last_route,
+            "last_request_id": self.last_request_id,
+        }
+
+
+class SlowQueryStats:
+    """Aggregates statements by normalized SQL, bounded to the heaviest entries.
+
+    Every statement counts, not just slow ones, so a fast query run thousands of
+    times (an N+1) ranks by the total time it costs.
+    """
+
+    def __init__(self, max_entries: int = MAX_TRACKED_STATEMENTS) -> None:
+        self.max_entries = max(1, max_entries)
+        self._entries: Dict[str, StatementStats] = {}
+        self._lock = threading.Lock()
+
+    def add(
+        self,
+        sql: str,
+        seconds: float,
+        route: Optional[str],
+        request_id: Optional[str],
+        slow: bool = False,
+    ) -> None:
+        with self._lock:
+            entry = self._entries.get(sql)
+            if entry is None:
+                if len(self._entries) >= self.max_entries:
+                    lightest = min(self._entries.values(), key=lambda e: e.total_seconds)
+                    del self._entries[lightest.sql]
+                entry = StatementStats(sql=sql)
+                self._entries[sql] = entry
+            entry.count += 1
+            entry.slow_count += slow
+            entry.total_seconds += seconds
+            entry.max_seconds = max(entry.max_seconds, seconds)
+            entry.last_route = route
+            entry.last_request_id = request_id
+
+    def top(self, limit: int = 20) -> List[Dict[str, Any]]:
+        with self._lock:
+            entries = sorted(self._entries.values(), key=lambda e: e.total_seconds, reverse=True)
+            return [entry.as_dict() for entry in entries[:limit]]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+stats = SlowQueryStats()
+
+
+def record(statement: str, parameters: Any, seconds: float, rowcount: int | None) -> None:
+    """Aggregate ``statement``; also log it when it ran longer than the threshold."""
+    ctx = current_request()
+    route = f"{ctx.method} {ctx.route}" if ctx else None
+    request_id = ctx.request_id if ctx else None
+    sql = normalize_sql(statement)
+    slow = THRESHOLD_SECONDS > 0 and seconds >= THRESHOLD_SECONDS
+    stats.add(sql, seconds, route, request_id, slow)
+    if not slow:
+        return
+    logger.warning(
+        json.dumps(
+            {
+                "event": "slow_query",
+                "duration_ms": round(seconds * 1000, 3),
+                "rows": rowcount if rowcount is not None and rowcount >= 0 else None,
+                "sql": sql,
+                "params_fingerprint": parameters_fingerprint(parameters),
+                "route": route,
+                "request_id": request_id,
+            },
+            ensure_ascii=False,
+        )
+    )
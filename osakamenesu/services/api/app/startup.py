@@ -0,0 +1,75 @@
+"""Cold-start timing: how long imports, lifespan and the first request take."""
+
+from __future__ import annotations
+
+import logging
+import os
+import time
+from typing import Any, Callable, Dict, Optional
+
+from .metrics import STARTUP_SECONDS
+
+logger = logging.getLogger("app.startup")
+
+_MODULE_LOADED = time.monotonic()
+
+
+def _process_started() -> float:
+    """Process start on the ``time.monotonic`` clock, falling back to this module's import."""
+    try:
+        with open("/proc/self/stat", "rb") as fh:
+            # Field 22 (starttime) counts clock ticks since boot; the command name
+            # in field 2 may contain spaces, so split after its closing paren.
+            fields = fh.read().rsplit(b")", 1)[1].split()
+        started_after_boot = int(fields[19]) / os.sysconf("SC_CLK_TCK")
+        with open("/proc/uptime", "rb") as fh:
+            uptime = float(fh.read().split()[0])
+    except (OSError, ValueError, IndexError):
+        return _MODULE_LOADED
+    return time.monotonic() - (uptime - started_after_boot)
+
+
+PROCESS_STARTED = _process_started()
+
+
+def since_process_start() -> float:
+    return time.monotonic() - PROCESS_STARTED
+
+
+def record(phase: str, seconds: float) -> None:
+    STARTUP_SECONDS.labels(phase).set(seconds)
+
+
+class StartupTimingMiddleware:
+    """Logs time-to-first-request once, then stays out of the way."""
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+        self._served = False
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if self._served or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status: Optional[int] = None
+
+        async def send_wrapper(message: Dict[str, Any]) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message.get("status")
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if not self._served:
+                self._served = True
+                elapsed = since_process_start()
+                record("first_request", elapsed)
+                logger.info(
+                    "first request served %.3fs after process start (%s %s -> %s)",
+                    elapsed,
+                    scope.get("method"),
+                    scope.get("path"),
+                    status,
+                )
@@ -0,0 +1,108 @@
+"""Database fixtures for unit tests that need real ORM round trips.
+
+``sqlite_sessionmaker`` is a fresh SQLite database (a file under ``tmp_path``)
+with every app table. Postgres-only column types (``ARRAY``, ``JSONB``) are
+stored as JSON, and ``timestamptz`` columns are stored in UTC and read back
+timezone-aware like on Postgres, while the fixture is active. Postgres-only
+statements, such as advisory locks, have to be patched out by the test.
+``query_counter`` counts the statements sent through that engine.
+
+Nothing from ``app`` is imported at module level, so test modules can still
+install their ``app.settings`` stub first.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from datetime import timezone
+from typing import Any, AsyncIterator, Iterator, List, Tuple
+
+import pytest
+from sqlalchemy import JSON, DateTime, event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.types import TypeDecorator
+
+
+class QueryCounter:
+    def __init__(self, engine: AsyncEngine) -> None:
+        self.engine = engine
+        self.statements: List[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany) -> None:  # noqa: ARG002
+        self.statements.append(statement)
+
+    @contextmanager
+    def capture(self) -> Iterator["QueryCounter"]:
+        self.statements = []
+        event.listen(self.engine.sync_engine, "before_cursor_execute", self._record)
+        try:
+            yield self
+        finally:
+            event.remove(self.engine.sync_engine, "before_cursor_execute", self._record)
+
+    def describe(self) -> str:
+        return "\n".join(f"  {i + 1}. {sql.splitlines()[0][:160]}" for i, sql in enumerate(self.statements))
+
+
+class _UTCDateTime(TypeDecorator):
+    impl = DateTime
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):  # noqa: ARG002
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+    def process_result_value(self, value, dialect):  # noqa: ARG002
+        return value.replace(tzinfo=timezone.utc) if value is not None else None
+
+
+@contextmanager
+def _sqlite_column_types(metadata: Any) -> Iterator[None]:
+    from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+
+    swapped: List[Tuple[Any, Any, Any]] = []
+    for table in metadata.tables.values():
+        for column in table.columns:
+            if isinstance(column.type, (ARRAY, JSONB)):
+                swapped.append((column, column.type, column.server_default))
+                column.type = JSON()
+                column.server_default = None
+            elif isinstance(column.type, DateTime) and column.type.timezone:
+                swapped.append((column, column.type, column.server_default))
+                column.type = _UTCDateTime()
+    try:
+        yield
+    finally:
+        for column, type_, server_default in swapped:
+            column.type = type_
+            column.server_default = server_default
+
+
+@pytest.fixture
+async def sqlite_engine(tmp_path) -> AsyncIterator[AsyncEngine]:
+    from app import models
+
+    with _sqlite_column_types(models.Base.metadata):
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'app.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(models.Base.metadata.create_all)
+        try:
+            yield engine
+        finally:
+            await engine.dispose()
+
+
+@pytest.fixture
+def sqlite_sessionmaker(sqlite_engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(sqlite_engine, class_=AsyncSession, expire_on_commit=False)
+
+
+@pytest.fixture
+def query_counter(sqlite_engine: AsyncEngine) -> QueryCounter:
+    """Counts statements sent through ``sqlite_engine`` inside ``with query_counter.capture():``."""
+    return QueryCounter(sqlite_engine)
@@ -0,0 +1,61 @@
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[4]
+sys.path.insert(0, str(ROOT / "services" / "api"))
+
+from app import meili  # type: ignore  # noqa: E402
+
+
+class _Index:
+    def __init__(self, client: "_Client", uid: str) -> None:
+        self.client = client
+        self.uid = uid
+
+    def update_settings(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        self.client.settings_pushes.append(body)
+        return {"taskUid": None}
+
+    def get_document(self, doc_id: str) -> Dict[str, Any]:
+        return dict(self.client.documents[(self.uid, doc_id)])
+
+    def add_documents(self, docs: List[Dict[str, Any]], primary_key: str | None = None) -> Dict[str, Any]:
+        for doc in docs:
+            self.client.documents[(self.uid, doc["id"])] = doc
+        return {"taskUid": None}
+
+
+class _Client:
+    def __init__(self) -> None:
+        self.indexes: set[str] = set()
+        self.documents: Dict[tuple[str, str], Dict[str, Any]] = {}
+        self.settings_pushes: List[Dict[str, Any]] = []
+
+    def get_index(self, uid: str) -> str:
+        if uid not in self.indexes:
+            raise LookupError(uid)
+        return uid
+
+    def create_index(self, uid: str, options: Dict[str, Any]) -> Dict[str, Any]:
+        self.indexes.add(uid)
+        return {"taskUid": None}
+
+    def index(self, uid: str) -> _Index:
+        return _Index(self, uid)
+
+
+def test_ensure_indexes_skips_unchanged_settings(monkeypatch: pytest.MonkeyPatch) -> None:
+    client = _Client()
+    monkeypatch.setattr(meili, "get_client", lambda: client)
+
+    assert meili.ensure_indexes() is True
+    assert meili.ensure_indexes() is False
+    assert len(client.settings_pushes) == 1
+
+    assert meili.ensure_indexes(force=True) is True
+    monkeypatch.setitem(meili.INDEX_SETTINGS, "sortableAttributes", ["price_min"])
+    assert meili.ensure_indexes() is True
+    assert len(client.settings_pushes) == 3
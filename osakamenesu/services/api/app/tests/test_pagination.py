@@ -0,0 +1,31 @@
+import sys
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[4]
+sys.path.insert(0, str(ROOT / "services" / "api"))
+
+from app.utils.pagination import (  # type: ignore  # noqa: E402
+    InvalidCursor,
+    decode_created_cursor,
+    encode_created_cursor,
+)
+
+
+def test_created_cursor_round_trip() -> None:
+    created_at = datetime(2025, 10, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+    row_id = uuid.uuid4()
+
+    cursor = encode_created_cursor(created_at, row_id)
+
+    assert "=" not in cursor
+    assert decode_created_cursor(cursor) == (created_at, row_id)
+
+
+@pytest.mark.parametrize("cursor", ["", "not-base64!!", "W10", "WyJ4IiwieSJd"])
+def test_malformed_cursor_is_rejected(cursor: str) -> None:
+    with pytest.raises(InvalidCursor):
+        decode_created_cursor(cursor)
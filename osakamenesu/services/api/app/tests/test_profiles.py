@@ -65,9 +65,12 @@ dummy_settings_module.Settings = _DummySettings  # type: ignore[attr-defined]
 dummy_settings_module.settings = _DummySettings()
 sys.modules.setdefault("app.settings", dummy_settings_module)
 
-from app import models  # type: ignore  # noqa: E402
+from app import meili, models  # type: ignore  # noqa: E402
 from app.routers import admin as admin_router  # type: ignore  # noqa: E402
-from app.utils.profiles import build_profile_doc  # type: ignore  # noqa: E402
+from app.routers import shops as shops_router  # type: ignore  # noqa: E402
+from app.utils.profiles import build_profile_doc, id_rank  # type: ignore  # noqa: E402
+from benchmarks.fake_meili import FakeMeiliClient  # type: ignore  # noqa: E402
+from fastapi import HTTPException  # noqa: E402
 
 
 class FakeScalarResult:
@@ -109,6 +112,18 @@ def _extract_profile_id(query) -> uuid.UUID:
     raise AssertionError("profile_id not found in query criteria")
 
 
+def _extract_profile_ids(query) -> Optional[List[uuid.UUID]]:
+    """Return the ``profile_id IN (...)`` values, or ``None`` for a single-id filter."""
+    for criterion in getattr(query, "_where_criteria", []):
+        left = getattr(criterion, "left", None)
+        if getattr(left, "name", None) == "profile_id":
+            raw = getattr(criterion.right, "value", None)
+            if isinstance(raw, (list, tuple, set)):
+                return [uuid.UUID(str(item)) for item in raw]
+            return None
+    return None
+
+
 class FakeSession:
     def __init__(
         self,
@@ -119,15 +134,22 @@ class FakeSession:
         self._profiles = profiles
         self._availability = availability
         self._outlinks = outlinks
+        self.queries = 0
 
     async def execute(self, query):  # type: ignore[override]
+        self.queries += 1
         desc = query.column_descriptions[0]
         entity = desc.get("entity")
         if entity is models.Profile:
             return FakeResult(scalars=self._profiles)
         if entity is models.Outlink:
+            pids = _extract_profile_ids(query)
+            if pids is not None:
+                return FakeResult(scalars=[o for pid in pids for o in self._outlinks.get(pid, [])])
             pid = _extract_profile_id(query)
             return FakeResult(scalars=self._outlinks.get(pid, []))
+        if entity is models.Availability and desc.get("name") == "profile_id":
+            return FakeResult(scalars=[pid for pid, available in self._availability.items() if available])
         if desc.get("name") == "count" and entity is None:
             pid = _extract_profile_id(query)
             count = 1 if self._availability.get(pid, False) else 0
@@ -232,6 +254,23 @@ def test_build_profile_doc_promotions_and_reviews() -> None:
     assert doc["ranking_reason"] == "編集部ピックアップ"
 
 
+def test_build_profile_doc_store_name_fallbacks() -> None:
+    profile = _make_profile(contact_json={"web": "https://contact.example.jp/top", "height_cm": "160"}, height_cm=None)
+    outlink = models.Outlink(
+        id=uuid.uuid4(),
+        profile_id=profile.id,
+        kind="web",
+        token="web-token",
+        target_url="https://outlink.example.com/shop",
+        utm=None,
+    )
+
+    assert build_profile_doc(profile, outlinks=[outlink])["store_name"] == "outlink.example.com"
+    doc = build_profile_doc(profile)
+    assert doc["store_name"] == "contact.example.jp"
+    assert doc["height_cm"] == 160
+
+
 @pytest.mark.anyio
 async def test_admin_reindex_uses_build_profile_doc(monkeypatch: pytest.MonkeyPatch) -> None:
     profile_a = _make_profile(name="凛", area="梅田")
@@ -269,6 +308,8 @@ async def test_admin_reindex_uses_build_profile_doc(monkeypatch: pytest.MonkeyPa
 
     payload = await admin_router.reindex_all(purge=False, db=fake_session)  # type: ignore[arg-type]
     assert payload["indexed"] == 2
+    # Query budget: profiles, today's availability and outlinks, independent of shop count.
+    assert fake_session.queries <= 3
     assert not purge_called  # purge is only invoked when purge=True
     assert captured_docs, "index_bulk should be invoked"
 
@@ -286,3 +327,88 @@ async def test_admin_reindex_uses_build_profile_doc(monkeypatch: pytest.MonkeyPa
     assert doc_b["today"] is False
     # Reviews data should still be populated from contact JSON
     assert doc_b["review_score"] is not None
+
+
+_SEARCH_PARAMS: Dict[str, Any] = dict.fromkeys(
+    [
+        "q", "area", "station", "category", "service_tags", "price_min", "price_max",
+        "available_date", "open_now", "price_band", "ranking_badges_param",
+        "promotions_only", "discounts_only", "diaries_only", "sort",
+    ]
+)
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("fields", ["card", "pin"])
+async def test_search_projection_retrieves_only_needed_attributes(
+    monkeypatch: pytest.MonkeyPatch, fields: str
+) -> None:
+    doc = build_profile_doc(_make_profile(latitude=34.7, longitude=135.5), today=True)
+    calls: List[Dict[str, Any]] = []
+
+    def fake_search(q, filter_expr, sort_expr, page, page_size, **kwargs):
+        calls.append(kwargs)
+        wanted = kwargs["attributes"]
+        return {"hits": [{key: doc[key] for key in wanted if key in doc}], "estimatedTotalHits": 1}
+
+    monkeypatch.setattr(shops_router, "meili_search", fake_search)
+    payload = await shops_router._search_payload(None, page=1, page_size=12, fields=fields, **_SEARCH_PARAMS)  # type: ignore[arg-type]
+
+    assert "review_highlights" not in calls[0]["attributes"]
+    assert (calls[0]["facets"] is None) is (fields == "pin")
+    (result,) = payload["results"]
+    model = shops_router.ShopCard if fields == "card" else shops_router.ShopPin
+    assert set(result) == set(model.model_fields)
+    assert result["id"] == uuid.UUID(doc["id"])
+    assert result["today_available"] is True
+    assert result["min_price"] == 12000
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("sort", [None, "price_asc", "rating"])
+async def test_search_cursor_walks_every_hit_once(monkeypatch: pytest.MonkeyPatch, sort: Optional[str]) -> None:
+    client = FakeMeiliClient()
+    docs = []
+    for n in range(40):
+        shop_id = uuid.UUID(int=(n * 7919) << 64)
+        docs.append(
+            {
+                "id": str(shop_id),
+                "id_rank": id_rank(shop_id),
+                "name": f"店舗{n}",
+                "area": "梅田",
+                "status": "published",
+                # Heavy ties and nulls on every sort key.
+                "ranking_score": [10.5, 3.25][n % 2],
+                "review_score": [None, 4.5, 4.0][n % 3],
+                "review_count": n % 4,
+                "updated_at": 1_700_000_000 + n % 5,
+                "price_min": 10000 if n % 3 else 12000,
+            }
+        )
+    client.index(meili.INDEX).add_documents(docs)
+    monkeypatch.setattr(meili, "get_client", lambda: client)
+    params = dict(_SEARCH_PARAMS, sort=sort)
+
+    everything = await shops_router._search_payload(None, page=1, page_size=50, **params)  # type: ignore[arg-type]
+    expected = [shop["id"] for shop in everything["results"]]
+    assert everything["next_cursor"] is None
+
+    seen: List[uuid.UUID] = []
+    cursor = None
+    first_cursor = None
+    for fields in ["full", "card", "pin", "full", "card", "pin", "full"]:
+        payload = await shops_router._search_payload(  # type: ignore[arg-type]
+            None, page=1, page_size=7, fields=fields, cursor=cursor, **params
+        )
+        seen.extend(shop["id"] for shop in payload["results"])
+        cursor = payload["next_cursor"]
+        first_cursor = first_cursor or cursor
+        if cursor is None:
+            break
+    assert seen == expected
+    assert len(expected) == 40
+
+    for bad_cursor, bad_sort in [(first_cursor, ["updated_at:desc"]), ("bm90LWEtY3Vyc29y", ["updated_at:desc"])]:
+        with pytest.raises(HTTPException):
+            shops_router._search_after(bad_cursor, bad_sort)
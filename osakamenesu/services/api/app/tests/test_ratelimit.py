@@ -205,3 +205,32 @@ def test_rate_limiter_falls_back_on_redis_error(monkeypatch: pytest.MonkeyPatch)
     fake_time.advance(31.0)
     run(limiter.allow("another"))
     assert redis.pipeline_calls == 2
+
+
+def test_redis_calls_are_reported_to_callback() -> None:
+    calls: List[Tuple[str, bool]] = []
+
+    def record(operation: str, seconds: float, ok: bool) -> None:
+        assert seconds >= 0
+        calls.append((operation, ok))
+
+    ok_limiter = RateLimiter(
+        max_events=2,
+        window_sec=60.0,
+        redis_client=InMemoryRedis(),
+        namespace="test",
+        on_redis_call=record,
+    )
+    failing_limiter = RateLimiter(
+        max_events=2,
+        window_sec=60.0,
+        redis_client=FailingRedis(),
+        namespace="test",
+        redis_error_cooldown=0.0,
+        on_redis_call=record,
+    )
+
+    assert run(ok_limiter.allow("k"))[0] is True
+    assert run(failing_limiter.allow("k"))[0] is True
+
+    assert calls == [("sliding_window", True), ("sliding_window", False)]
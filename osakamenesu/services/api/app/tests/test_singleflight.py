@@ -0,0 +1,123 @@
+import asyncio
+import sys
+from pathlib import Path
+from typing import List
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[4]
+sys.path.insert(0, str(ROOT / "services" / "api"))
+
+from app.utils.singleflight import SingleFlight  # type: ignore  # noqa: E402
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.mark.anyio
+async def test_concurrent_calls_share_one_computation() -> None:
+    outcomes: List[str] = []
+    flight: SingleFlight[str, dict] = SingleFlight(on_call=outcomes.append)
+    calls = 0
+    release = asyncio.Event()
+
+    async def load() -> dict:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return {"id": "shop"}
+
+    waiters = [asyncio.create_task(flight.do("shop", load)) for _ in range(50)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*waiters)
+
+    assert calls == 1
+    assert all(result is results[0] for result in results)
+    assert outcomes.count("leader") == 1 and outcomes.count("shared") == 49
+    assert len(flight) == 0
+
+    # Once finished, the next call computes afresh.
+    await flight.do("shop", load)
+    assert calls == 2
+
+
+@pytest.mark.anyio
+async def test_errors_propagate_to_every_waiter() -> None:
+    flight: SingleFlight[str, dict] = SingleFlight()
+    release = asyncio.Event()
+
+    async def boom() -> dict:
+        await release.wait()
+        raise LookupError("shop not found")
+
+    waiters = [asyncio.create_task(flight.do("missing", boom)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*waiters, return_exceptions=True)
+    assert all(isinstance(result, LookupError) for result in results)
+
+
+@pytest.mark.anyio
+async def test_cancelled_waiter_does_not_cancel_shared_work() -> None:
+    flight: SingleFlight[str, str] = SingleFlight()
+    release = asyncio.Event()
+    started = asyncio.Event()
+    cancelled = False
+
+    async def load() -> str:
+        nonlocal cancelled
+        started.set()
+        try:
+            await release.wait()
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        return "ok"
+
+    leader = asyncio.create_task(flight.do("k", load))
+    follower = asyncio.create_task(flight.do("k", load))
+    await started.wait()
+    leader.cancel()
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await follower == "ok"
+    assert leader.cancelled()
+    assert not cancelled
+
+    # With nobody left waiting, the computation itself is cancelled.
+    release.clear()
+    started.clear()
+    lone = asyncio.create_task(flight.do("k", load))
+    await started.wait()
+    lone.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await lone
+    await asyncio.sleep(0)
+    assert cancelled
+    assert len(flight) == 0
+
+
+@pytest.mark.anyio
+async def test_waiters_are_bounded() -> None:
+    outcomes: List[str] = []
+    flight: SingleFlight[str, int] = SingleFlight(max_waiters=2, on_call=outcomes.append)
+    release = asyncio.Event()
+    calls = 0
+
+    async def load() -> int:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return calls
+
+    waiters = [asyncio.create_task(flight.do("k", load)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(*waiters)
+
+    assert outcomes == ["leader", "shared", "bypass"]
+    assert calls == 2
@@ -0,0 +1,79 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[4]
+sys.path.insert(0, str(ROOT / "services" / "api"))
+
+from app import slow_queries  # type: ignore  # noqa: E402
+
+
+def test_normalize_sql_collapses_parameters_and_in_lists() -> None:
+    first = slow_queries.normalize_sql(
+        "SELECT outlinks.id\n  FROM outlinks WHERE outlinks.profile_id = $1 AND kind::text = 'line'"
+    )
+    second = slow_queries.normalize_sql(
+        "SELECT outlinks.id FROM outlinks WHERE outlinks.profile_id = $7 AND kind::text = 'web'"
+    )
+    assert first == second == "SELECT outlinks.id FROM outlinks WHERE outlinks.profile_id = ? AND kind::text = ?"
+    assert slow_queries.normalize_sql("SELECT 1 FROM t WHERE id IN ($1, $2, $3)") == "SELECT ? FROM t WHERE id IN (?...)"
+
+
+def test_normalize_sql_collapses_asyncpg_in_lists_with_casts() -> None:
+    two = slow_queries.normalize_sql("SELECT reviews.id FROM reviews WHERE reviews.profile_id IN ($1::UUID, $2::UUID)")
+    five = slow_queries.normalize_sql(
+        "SELECT reviews.id FROM reviews WHERE reviews.profile_id IN "
+        "($1::UUID, $2::UUID, $3::UUID, $4::UUID, $5::UUID)"
+    )
+    assert two == five == "SELECT reviews.id FROM reviews WHERE reviews.profile_id IN (?...)"
+    assert slow_queries.normalize_sql(
+        "SELECT 1 FROM t WHERE at IN ($1::TIMESTAMP WITH TIME ZONE, $2::TIMESTAMP WITH TIME ZONE)"
+    ) == "SELECT ? FROM t WHERE at IN (?...)"
+
+
+def test_stats_rank_by_total_time_and_stay_bounded() -> None:
+    stats = slow_queries.SlowQueryStats(max_entries=2)
+    stats.add("SELECT a", 0.5, "GET /a", "r1")
+    stats.add("SELECT b", 0.3, "GET /b", "r2")
+    stats.add("SELECT b", 0.3, "GET /b", "r3")
+    stats.add("SELECT c", 0.4, "GET /c", "r4")
+
+    top = stats.top()
+    assert [item["sql"] for item in top] == ["SELECT b", "SELECT c"]
+    assert top[0]["count"] == 2
+    assert top[0]["last_request_id"] == "r3"
+
+
+def test_fast_repeated_statements_aggregate_into_one_heavy_entry(monkeypatch, caplog) -> None:
+    stats = slow_queries.SlowQueryStats()
+    monkeypatch.setattr(slow_queries, "stats", stats)
+    monkeypatch.setattr(slow_queries, "THRESHOLD_SECONDS", 0.2)
+
+    # An N+1: one cheap lookup per row, each far below the threshold.
+    for shop_id in range(500):
+        slow_queries.record(f"SELECT menus.id FROM menus WHERE menus.profile_id = {shop_id}", None, 0.002, 1)
+    slow_queries.record("SELECT count(*) FROM reservations", None, 0.3, 1)
+
+    top = stats.top()
+    assert [item["sql"] for item in top] == [
+        "SELECT menus.id FROM menus WHERE menus.profile_id = ?",
+        "SELECT count(*) FROM reservations",
+    ]
+    assert top[0]["count"] == 500
+    assert top[0]["slow_count"] == 0
+    assert top[0]["total_ms"] == 1000.0
+    assert top[1]["slow_count"] == 1
+    # Only the statement over the threshold is logged.
+    logged = [r for r in caplog.records if r.name == "app.slow_query"]
+    assert len(logged) == 1
+    assert "reservations" in logged[0].getMessage()
+
+
+def test_disabled_threshold_still_aggregates_without_logging(monkeypatch, caplog) -> None:
+    stats = slow_queries.SlowQueryStats()
+    monkeypatch.setattr(slow_queries, "stats", stats)
+    monkeypatch.setattr(slow_queries, "THRESHOLD_SECONDS", 0.0)
+
+    slow_queries.record("SELECT 1", None, 5.0, 1)
+
+    assert stats.top()[0]["count"] == 1
+    assert not [r for r in caplog.records if r.name == "app.slow_query"]
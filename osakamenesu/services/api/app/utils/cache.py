@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import time
+from typing import Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """Small in-process cache with per-entry expiry and a bounded size.
+
+    Entries are evicted oldest-first once ``max_entries`` is reached. The cache is
+    not shared between processes, so callers must tolerate up to ``ttl_seconds``
+    of staleness on other replicas after an invalidation.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        max_entries: int = 10_000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl = max(0.0, ttl_seconds)
+        self.max_entries = max(1, max_entries)
+        self._clock = clock
+        self._entries: Dict[K, Tuple[float, V]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: K) -> Optional[V]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            self._entries.pop(key, None)
+            return None
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        if key in self._entries:
+            self._entries.pop(key)
+        elif len(self._entries) >= self.max_entries:
+            oldest = next(iter(self._entries))
+            self._entries.pop(oldest, None)
+        self._entries[key] = (self._clock() + self.ttl, value)
+
+    def invalidate(self, key: K) -> None:
+        self._entries.pop(key, None)
+
+    def invalidate_where(self, predicate: Callable[[K], bool]) -> None:
+        for key in [k for k in self._entries if predicate(k)]:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
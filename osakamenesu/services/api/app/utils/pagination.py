@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, List, Sequence
+from uuid import UUID
+
+from sqlalchemy import tuple_
+from sqlalchemy.sql.elements import ColumnElement
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode the sort-key values of the last row into an opaque, URL-safe token."""
+    raw = json.dumps(list(values), separators=(",", ":"), ensure_ascii=False, default=str)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+    except (binascii.Error, UnicodeError, ValueError) as exc:
+        raise InvalidCursor("malformed cursor") from exc
+    if not isinstance(values, list) or len(values) != size:
+        raise InvalidCursor("malformed cursor")
+    return values
+
+
+def encode_created_cursor(created_at: datetime, row_id: UUID) -> str:
+    return encode_cursor([created_at.isoformat(), str(row_id)])
+
+
+def decode_created_cursor(cursor: str) -> tuple[datetime, UUID]:
+    created_raw, id_raw = decode_cursor(cursor, 2)
+    try:
+        return datetime.fromisoformat(str(created_raw)), UUID(str(id_raw))
+    except ValueError as exc:
+        raise InvalidCursor("malformed cursor") from exc
+
+
+def before_keyset(columns: Sequence[Any], values: Sequence[Any]) -> ColumnElement[bool]:
+    """Row-value predicate for the next page of a ``DESC, DESC`` ordered listing."""
+    return tuple_(*columns) < tuple_(*values)
+
+
+def after_keyset(columns: Sequence[Any], values: Sequence[Any]) -> ColumnElement[bool]:
+    """Row-value predicate for the next page of an ``ASC, ASC`` ordered listing."""
+    return tuple_(*columns) > tuple_(*values)
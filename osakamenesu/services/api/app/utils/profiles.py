@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from typing import Optional, Iterable, Tuple, Any, List
+from urllib.parse import urlparse
 
 PRICE_BANDS: list[tuple[str, int, int | None, str]] = [
     ("under_10k", 0, 10000, "〜1万円"),
@@ -11,6 +12,15 @@ PRICE_BANDS: list[tuple[str, int, int | None, str]] = [
 ]
 
 
+def id_rank(profile_id: Any) -> int:
+    """Numeric stand-in for the id used as the last search sort key.
+
+    Meilisearch only range-filters numbers, so cursor pagination breaks ties on
+    the top 52 bits of the UUID, which a JSON number holds exactly.
+    """
+    return int(str(profile_id).replace("-", "")[:13], 16)
+
+
 def _compute_price_band(min_price: Optional[int], max_price: Optional[int]) -> tuple[str, str]:
     if min_price is None and max_price is None:
         return "unknown", "価格未設定"
@@ -170,6 +180,39 @@ def infer_height_age(profile: models.Profile) -> Tuple[Optional[int], Optional[i
     return height_cm, age
 
 
+def _outlink_host(outlinks: Optional[Iterable[models.Outlink]]) -> Optional[str]:
+    if not outlinks:
+        return None
+    try:
+        web = next((o for o in outlinks if getattr(o, "kind", None) == "web"), None)
+    except Exception:
+        web = None
+    if web and getattr(web, "target_url", None):
+        try:
+            host = urlparse(web.target_url).hostname
+            if host:
+                return host
+        except Exception:
+            pass
+    return None
+
+
+def _store_name(contact_json: dict, outlinks: Optional[Iterable[models.Outlink]]) -> Optional[str]:
+    store_name = contact_json.get("store_name")
+    if store_name:
+        return store_name
+    host = _outlink_host(outlinks)
+    if host:
+        return host
+    web = contact_json.get("web")
+    if isinstance(web, str):
+        try:
+            return urlparse(web).hostname or None
+        except Exception:
+            return None
+    return None
+
+
 def infer_store_name(
     profile: models.Profile,
     outlinks: Optional[Iterable[models.Outlink]] = None,
@@ -181,45 +224,47 @@ def infer_store_name(
     2) domain from a 'web' outlink in provided outlinks
     3) domain from profile.contact_json.web
     """
-    store_name: Optional[str] = None
     try:
         cj = profile.contact_json or {}
-        store_name = cj.get("store_name")
     except Exception:
-        store_name = None
-
-    if store_name:
-        return store_name
-
-    # Try provided outlinks
-    if outlinks:
-        try:
-            web = next((o for o in outlinks if getattr(o, "kind", None) == "web"), None)
-        except Exception:
-            web = None
-        if web and getattr(web, "target_url", None):
-            try:
-                from urllib.parse import urlparse
-
-                host = urlparse(web.target_url).hostname
-                if host:
-                    return host
-            except Exception:
-                pass
-
-    # Fallback to contact_json.web
-    try:
-        from urllib.parse import urlparse
-
-        cj = profile.contact_json or {}
-        if isinstance(cj.get("web"), str):
-            host = urlparse(cj["web"]).hostname
-            if host:
-                return host
-    except Exception:
-        pass
-
-    return None
+        cj = {}
+    if not isinstance(cj, dict):
+        return _outlink_host(outlinks)
+    return _store_name(cj, outlinks)
+
+
+# Profile columns read by build_profile_doc.
+_DOC_ATTRIBUTES = (
+    "id",
+    "slug",
+    "name",
+    "area",
+    "nearest_station",
+    "station_line",
+    "station_exit",
+    "station_walk_minutes",
+    "latitude",
+    "longitude",
+    "price_min",
+    "price_max",
+    "bust_tag",
+    "service_type",
+    "height_cm",
+    "age",
+    "body_tags",
+    "photos",
+    "discounts",
+    "ranking_badges",
+    "ranking_weight",
+    "status",
+    "contact_json",
+    "created_at",
+    "updated_at",
+)
+
+
+def _doc_attributes(profile: models.Profile) -> dict[str, Any]:
+    return {name: getattr(profile, name) for name in _DOC_ATTRIBUTES}
 
 
 def build_profile_doc(
@@ -234,15 +279,19 @@ def build_profile_doc(
 
     Centralizes field normalization and derived attributes.
     """
-    height_cm, age = infer_height_age(profile)
-    store_name = infer_store_name(profile, outlinks)
-    try:
-        contact_json = profile.contact_json or {}
-    except Exception:
-        contact_json = {}
+    attrs = _doc_attributes(profile)
+    contact_json = attrs["contact_json"] or {}
+    height_cm = attrs["height_cm"]
+    if height_cm is None:
+        height_cm = _safe_int(contact_json.get("height_cm"))
+    age = attrs["age"]
+    if age is None:
+        age = _safe_int(contact_json.get("age"))
+    store_name = _store_name(contact_json, outlinks)
+    discounts = attrs["discounts"]
 
     promotions: list[dict[str, Any]] = []
-    for source in (profile.discounts or [], contact_json.get("promotions")):
+    for source in (discounts or [], contact_json.get("promotions")):
         if not isinstance(source, list):
             continue
         for entry in source:
@@ -260,7 +309,7 @@ def build_profile_doc(
                 }
             )
 
-    price_band_key, price_band_label = _compute_price_band(profile.price_min, profile.price_max)
+    price_band_key, price_band_label = _compute_price_band(attrs["price_min"], attrs["price_max"])
 
     review_score, review_count, review_highlights = compute_review_summary(
         profile,
@@ -277,37 +326,36 @@ def build_profile_doc(
         tag_score=tag_score,
         ctr7d=ctr7d,
     )
-    has_discounts = bool(profile.discounts)
-    has_promotions = bool(promotions)
     diary_count = _count_published_diaries(profile, contact_json)
     return {
-        "id": str(profile.id),
-        "slug": profile.slug,
-        "name": profile.name,
-        "area": profile.area,
-        "nearest_station": profile.nearest_station,
-        "station_line": profile.station_line,
-        "station_exit": profile.station_exit,
-        "station_walk_minutes": profile.station_walk_minutes,
-        "latitude": profile.latitude,
-        "longitude": profile.longitude,
-        "price_min": profile.price_min,
-        "price_max": profile.price_max,
-        "bust_tag": profile.bust_tag,
-        "service_type": profile.service_type,
+        "id": str(attrs["id"]),
+        "id_rank": id_rank(attrs["id"]),
+        "slug": attrs["slug"],
+        "name": attrs["name"],
+        "area": attrs["area"],
+        "nearest_station": attrs["nearest_station"],
+        "station_line": attrs["station_line"],
+        "station_exit": attrs["station_exit"],
+        "station_walk_minutes": attrs["station_walk_minutes"],
+        "latitude": attrs["latitude"],
+        "longitude": attrs["longitude"],
+        "price_min": attrs["price_min"],
+        "price_max": attrs["price_max"],
+        "bust_tag": attrs["bust_tag"],
+        "service_type": attrs["service_type"],
         "store_name": store_name,
-        "body_tags": profile.body_tags or [],
+        "body_tags": attrs["body_tags"] or [],
         "height_cm": height_cm,
         "age": age,
-        "photos": profile.photos or [],
-        "discounts": profile.discounts or [],
-        "ranking_badges": profile.ranking_badges or [],
-        "ranking_weight": profile.ranking_weight,
-        "status": profile.status,
+        "photos": attrs["photos"] or [],
+        "discounts": discounts or [],
+        "ranking_badges": attrs["ranking_badges"] or [],
+        "ranking_weight": attrs["ranking_weight"],
+        "status": attrs["status"],
         "today": today,
         "tag_score": tag_score,
         "ctr7d": ctr7d,
-        "updated_at": int((profile.updated_at or profile.created_at).timestamp()),
+        "updated_at": int((attrs["updated_at"] or attrs["created_at"]).timestamp()),
         "promotions": promotions,
         "review_score": review_score,
         "review_count": review_count,
@@ -316,8 +364,8 @@ def build_profile_doc(
         "staff_preview": contact_json.get("staff"),
         "price_band": price_band_key,
         "price_band_label": price_band_label,
-        "has_promotions": has_promotions,
-        "has_discounts": has_discounts,
+        "has_promotions": bool(promotions),
+        "has_discounts": bool(discounts),
         "promotion_count": len(promotions),
         "ranking_score": ranking_score,
         "diary_count": diary_count,
@@ -5,7 +5,7 @@ import time
 import uuid
 import logging
 from collections import deque
-from typing import Deque, Dict, Optional, Tuple
+from typing import Callable, Deque, Dict, Optional, Tuple
 
 from redis.asyncio import Redis
 from redis.exceptions import RedisError
@@ -22,6 +22,7 @@ class RateLimiter:
         namespace: str = "rate",
         redis_error_cooldown: float = 5.0,
         logger: Optional[logging.Logger] = None,
+        on_redis_call: Optional[Callable[[str, float, bool], None]] = None,
     ) -> None:
         self.max_events = max_events
         self.window = window_sec
@@ -32,6 +33,7 @@ class RateLimiter:
         self._redis_disabled_until = 0.0
         self._logger = logger or logging.getLogger(__name__)
         self._last_warning_at = 0.0
+        self._on_redis_call = on_redis_call
 
     async def close(self) -> None:
         if self.redis:
@@ -79,6 +81,18 @@ class RateLimiter:
         return True, 0.0
 
     async def _allow_redis(self, key: str) -> Tuple[bool, float]:
+        if self._on_redis_call is None:
+            return await self._sliding_window(key)
+        started = time.perf_counter()
+        ok = False
+        try:
+            result = await self._sliding_window(key)
+            ok = True
+            return result
+        finally:
+            self._on_redis_call("sliding_window", time.perf_counter() - started, ok)
+
+    async def _sliding_window(self, key: str) -> Tuple[bool, float]:
         assert self.redis is not None
         now = time.time()
         redis_key = f"{self.namespace}{key}"
@@ -112,6 +126,7 @@ def create_rate_limiter(
     *,
     redis_error_cooldown: float = 5.0,
     logger: Optional[logging.Logger] = None,
+    on_redis_call: Optional[Callable[[str, float, bool], None]] = None,
 ) -> RateLimiter:
     return RateLimiter(
         max_events=max_events,
@@ -120,6 +135,7 @@ def create_rate_limiter(
         namespace=namespace,
         redis_error_cooldown=redis_error_cooldown,
         logger=logger,
+        on_redis_call=on_redis_call,
     )
 
 
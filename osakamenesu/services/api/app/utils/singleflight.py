@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Awaitable, Callable, Dict, Generic, Hashable, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class _Call(Generic[V]):
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: "asyncio.Task[V]") -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight(Generic[K, V]):
+    """Collapses concurrent calls for the same key into one in-flight computation.
+
+    The first caller for a key starts ``fn()`` as its own task; callers that
+    arrive while it runs await the same task and receive the same result (or
+    exception), so results must be treated as read-only. A cancelled waiter only
+    stops waiting: the computation keeps running for the others and is cancelled
+    once nobody is waiting for it. Past ``max_waiters`` concurrent waiters a key
+    stops coalescing and further callers run ``fn()`` themselves, which bounds
+    how many requests one slow computation can hold up.
+
+    ``on_call`` receives ``"leader"``, ``"shared"`` or ``"bypass"`` per call.
+    """
+
+    def __init__(
+        self,
+        max_waiters: int = 1000,
+        on_call: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        self.max_waiters = max(1, max_waiters)
+        self._on_call = on_call
+        self._calls: Dict[K, _Call[V]] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def _record(self, outcome: str) -> None:
+        if self._on_call is not None:
+            self._on_call(outcome)
+
+    async def do(self, key: K, fn: Callable[[], Awaitable[V]]) -> V:
+        call = self._calls.get(key)
+        if call is not None and call.waiters >= self.max_waiters:
+            self._record("bypass")
+            return await fn()
+        if call is None:
+            call = _Call(asyncio.ensure_future(fn()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _task, key=key, call=call: self._forget(key, call))
+            self._record("leader")
+        else:
+            self._record("shared")
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        except asyncio.CancelledError:
+            if call.waiters == 1 and not call.task.done():
+                # Detach first so a caller arriving now starts a fresh computation
+                # instead of inheriting the cancellation.
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+                call.task.cancel()
+            raise
+        finally:
+            call.waiters -= 1
+
+    def _forget(self, key: K, call: _Call[V]) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        # Retrieve the outcome so an unawaited failure is not logged as never retrieved.
+        if not call.task.cancelled():
+            call.task.exception()
@@ -0,0 +1,237 @@
+"""In-memory stand-in for the Meilisearch client used by ``app.meili``.
+
+Only the surface the API touches is implemented: document upserts/deletes,
+index settings and ``search`` with the filter grammar produced by
+``app.meili.build_filter`` and ``build_after_filter``. Tasks complete synchronously, so ``wait_for_task``
+is a no-op. Good enough to keep search cost out of API latency numbers.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+_TOKEN = re.compile(
+    r"\s*(?:(?P<paren>[()])|(?P<op>>=|<=|!=|=|>|<)|(?P<string>'(?:[^'\\]|\\.)*')|(?P<word>[^\s()=<>!']+))"
+)
+
+
+def _tokenize(expr: str) -> List[str]:
+    tokens: List[str] = []
+    pos = 0
+    while pos < len(expr):
+        match = _TOKEN.match(expr, pos)
+        if not match or match.end() == pos:
+            if expr[pos:].strip():
+                raise ValueError(f"unsupported filter: {expr!r}")
+            break
+        tokens.append(match.group(match.lastgroup))
+        pos = match.end()
+    return tokens
+
+
+def _literal(raw: str) -> Any:
+    if raw.startswith("'") and raw.endswith("'"):
+        return re.sub(r"\\(.)", r"\1", raw[1:-1])
+    if raw in ("true", "false"):
+        return raw == "true"
+    try:
+        return float(raw) if "." in raw or "e" in raw else int(raw)
+    except ValueError:
+        return raw
+
+
+def _compare(op: str, field: str, value: Any) -> Callable[[dict], bool]:
+    def check(doc: dict) -> bool:
+        current = doc.get(field)
+        if op == "=":
+            if isinstance(current, list):
+                return value in current
+            return current == value
+        if current is None:
+            return False
+        if op == ">=":
+            return current >= value
+        if op == "<=":
+            return current <= value
+        if op == ">":
+            return current > value
+        return current < value
+
+    return check
+
+
+class _Parser:
+    """Recursive descent over the subset of the filter grammar the API emits:
+    ``AND``/``OR``/parentheses, comparisons, ``IS NULL`` and ``NOT EXISTS``."""
+
+    def __init__(self, expr: str) -> None:
+        self.tokens = _tokenize(expr)
+        self.pos = 0
+
+    def _peek(self) -> Optional[str]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def _take(self, expected: Optional[str] = None) -> str:
+        token = self._peek()
+        if token is None or (expected is not None and token != expected):
+            raise ValueError(f"unsupported filter near token {self.pos}: expected {expected!r}, got {token!r}")
+        self.pos += 1
+        return token
+
+    def parse(self) -> Callable[[dict], bool]:
+        predicate = self._or()
+        if self._peek() is not None:
+            raise ValueError(f"unsupported filter: trailing {self._peek()!r}")
+        return predicate
+
+    def _or(self) -> Callable[[dict], bool]:
+        options = [self._and()]
+        while self._peek() == "OR":
+            self._take()
+            options.append(self._and())
+        return options[0] if len(options) == 1 else (lambda doc: any(option(doc) for option in options))
+
+    def _and(self) -> Callable[[dict], bool]:
+        clauses = [self._atom()]
+        while self._peek() == "AND":
+            self._take()
+            clauses.append(self._atom())
+        return clauses[0] if len(clauses) == 1 else (lambda doc: all(clause(doc) for clause in clauses))
+
+    def _atom(self) -> Callable[[dict], bool]:
+        if self._peek() == "(":
+            self._take("(")
+            inner = self._or()
+            self._take(")")
+            return inner
+        field = self._take()
+        token = self._take()
+        if token == "IS":
+            self._take("NULL")
+            return lambda doc: field in doc and doc[field] is None
+        if token == "NOT":
+            self._take("EXISTS")
+            return lambda doc: field not in doc
+        if token == "EXISTS":
+            return lambda doc: field in doc
+        return _compare(token, field, _literal(self._take()))
+
+
+def compile_filter(expr: Optional[str]) -> Callable[[dict], bool]:
+    if not expr:
+        return lambda doc: True
+    return _Parser(expr).parse()
+
+
+def _facet_key(value: Any) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+class FakeIndex:
+    def __init__(self, uid: str, primary_key: str = "id") -> None:
+        self.uid = uid
+        self.primary_key = primary_key
+        self.documents: Dict[str, dict] = {}
+        self.settings: Dict[str, Any] = {}
+        self.searchable: List[str] = []
+
+    def add_documents(self, docs: Iterable[dict], primary_key: Optional[str] = None) -> dict:
+        key = primary_key or self.primary_key
+        for doc in docs:
+            self.documents[str(doc[key])] = dict(doc)
+        return {"taskUid": None}
+
+    def get_document(self, doc_id: str) -> dict:
+        return dict(self.documents[str(doc_id)])
+
+    def delete_document(self, doc_id: str) -> dict:
+        self.documents.pop(str(doc_id), None)
+        return {"taskUid": None}
+
+    def delete_all_documents(self) -> dict:
+        self.documents.clear()
+        return {"taskUid": None}
+
+    def update_settings(self, body: Dict[str, Any]) -> dict:
+        self.settings.update(body)
+        self.searchable = list(body.get("searchableAttributes") or self.searchable)
+        return {"taskUid": None}
+
+    def get_settings(self) -> Dict[str, Any]:
+        return dict(self.settings)
+
+    def _matches_query(self, doc: dict, q: str) -> bool:
+        needle = q.lower()
+        for field in self.searchable or list(doc):
+            value = doc.get(field)
+            values = value if isinstance(value, list) else [value]
+            if any(isinstance(item, str) and needle in item.lower() for item in values):
+                return True
+        return False
+
+    def search(self, q: str, options: Optional[Dict[str, Any]] = None) -> dict:
+        options = options or {}
+        predicate = compile_filter(options.get("filter"))
+        hits = [doc for doc in self.documents.values() if predicate(doc)]
+        if q:
+            hits = [doc for doc in hits if self._matches_query(doc, q)]
+
+        for rule in reversed(options.get("sort") or []):
+            field, _, direction = rule.partition(":")
+            present = [doc for doc in hits if doc.get(field) is not None]
+            missing = [doc for doc in hits if doc.get(field) is None]
+            present.sort(key=lambda doc: doc[field], reverse=direction == "desc")
+            hits = present + missing
+
+        facet_distribution: Dict[str, Dict[str, int]] = {}
+        for facet in options.get("facets") or []:
+            counts: Counter[str] = Counter()
+            for doc in hits:
+                value = doc.get(facet)
+                for item in value if isinstance(value, list) else [value]:
+                    if item is not None:
+                        counts[_facet_key(item)] += 1
+            facet_distribution[facet] = dict(counts)
+
+        offset = int(options.get("offset", 0))
+        limit = int(options.get("limit", 20))
+        attributes = options.get("attributesToRetrieve")
+        page = hits[offset : offset + limit]
+        if attributes and "*" not in attributes:
+            page = [{key: doc[key] for key in attributes if key in doc} for doc in page]
+        result: Dict[str, Any] = {
+            "hits": [dict(doc) for doc in page],
+            "query": q,
+            "limit": limit,
+            "offset": offset,
+            "estimatedTotalHits": len(hits),
+            "processingTimeMs": 0,
+        }
+        if facet_distribution:
+            result["facetDistribution"] = facet_distribution
+        return result
+
+
+class FakeMeiliClient:
+    def __init__(self) -> None:
+        self.indexes: Dict[str, FakeIndex] = {}
+
+    def get_index(self, uid: str) -> FakeIndex:
+        if uid not in self.indexes:
+            raise KeyError(uid)
+        return self.indexes[uid]
+
+    def create_index(self, uid: str, options: Optional[Dict[str, Any]] = None) -> dict:
+        primary_key = (options or {}).get("primaryKey", "id")
+        self.indexes.setdefault(uid, FakeIndex(uid, primary_key))
+        return {"taskUid": None}
+
+    def index(self, uid: str) -> FakeIndex:
+        return self.indexes.setdefault(uid, FakeIndex(uid))
+
+    def wait_for_task(self, uid: Any, *args: Any, **kwargs: Any) -> dict:
+        return {"uid": uid, "status": "succeeded"}
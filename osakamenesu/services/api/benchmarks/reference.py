@@ -0,0 +1,314 @@
+"""Unoptimised copies of the document builders, as they were before the fast path.
+
+``benchmarks.serialization`` times these against the live implementations and
+checks that both produce identical output, so fields added to the live
+documents have to be added here as well. Do not optimise this module.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from uuid import UUID
+
+from app import models
+from app.routers.shops import _normalize_date_string, _safe_float, _safe_int, _unix_to_dt
+from app.schemas import Promotion, ShopStaffPreview, ShopSummary
+from app.utils.profiles import (
+    _compute_price_band,
+    _compute_ranking_score,
+    _count_published_diaries,
+    _safe_int as _profile_safe_int,
+    compute_review_summary,
+    id_rank,
+)
+
+
+def infer_height_age(profile: models.Profile) -> Tuple[Optional[int], Optional[int]]:
+    """Prefer DB columns; fall back to contact_json integers.
+
+    Returns (height_cm, age).
+    """
+    height_cm = getattr(profile, "height_cm", None)
+    age = getattr(profile, "age", None)
+    if height_cm is None or age is None:
+        try:
+            cj = profile.contact_json or {}
+        except Exception:
+            cj = {}
+        if height_cm is None:
+            height_cm = _profile_safe_int(cj.get("height_cm"))
+        if age is None:
+            age = _profile_safe_int(cj.get("age"))
+    return height_cm, age
+
+
+def infer_store_name(
+    profile: models.Profile,
+    outlinks: Optional[Iterable[models.Outlink]] = None,
+) -> Optional[str]:
+    """Determine store name.
+
+    Priority:
+    1) profile.contact_json.store_name
+    2) domain from a 'web' outlink in provided outlinks
+    3) domain from profile.contact_json.web
+    """
+    store_name: Optional[str] = None
+    try:
+        cj = profile.contact_json or {}
+        store_name = cj.get("store_name")
+    except Exception:
+        store_name = None
+
+    if store_name:
+        return store_name
+
+    # Try provided outlinks
+    if outlinks:
+        try:
+            web = next((o for o in outlinks if getattr(o, "kind", None) == "web"), None)
+        except Exception:
+            web = None
+        if web and getattr(web, "target_url", None):
+            try:
+                from urllib.parse import urlparse
+
+                host = urlparse(web.target_url).hostname
+                if host:
+                    return host
+            except Exception:
+                pass
+
+    # Fallback to contact_json.web
+    try:
+        from urllib.parse import urlparse
+
+        cj = profile.contact_json or {}
+        if isinstance(cj.get("web"), str):
+            host = urlparse(cj["web"]).hostname
+            if host:
+                return host
+    except Exception:
+        pass
+
+    return None
+
+
+def build_profile_doc(
+    profile: models.Profile,
+    *,
+    today: bool = False,
+    tag_score: float = 0.0,
+    ctr7d: float = 0.0,
+    outlinks: Optional[Iterable[models.Outlink]] = None,
+) -> dict:
+    """Build a search document for Meilisearch based on a Profile model.
+
+    Centralizes field normalization and derived attributes.
+    """
+    height_cm, age = infer_height_age(profile)
+    store_name = infer_store_name(profile, outlinks)
+    try:
+        contact_json = profile.contact_json or {}
+    except Exception:
+        contact_json = {}
+
+    promotions: list[dict[str, Any]] = []
+    for source in (profile.discounts or [], contact_json.get("promotions")):
+        if not isinstance(source, list):
+            continue
+        for entry in source:
+            if not isinstance(entry, dict):
+                continue
+            label = entry.get("label") or entry.get("title")
+            if not label:
+                continue
+            promotions.append(
+                {
+                    "label": label,
+                    "description": entry.get("description") or entry.get("detail"),
+                    "expires_at": entry.get("expires_at") or entry.get("until"),
+                    "highlight": entry.get("highlight"),
+                }
+            )
+
+    price_band_key, price_band_label = _compute_price_band(profile.price_min, profile.price_max)
+
+    review_score, review_count, review_highlights = compute_review_summary(
+        profile,
+        contact_json.get("reviews"),
+        highlight_limit=3,
+    )
+    ranking_reason = contact_json.get("ranking_reason") or contact_json.get("ranking_message")
+    ranking_score = _compute_ranking_score(
+        profile,
+        today=today,
+        review_score=review_score,
+        review_count=review_count,
+        promotions=promotions,
+        tag_score=tag_score,
+        ctr7d=ctr7d,
+    )
+    has_discounts = bool(profile.discounts)
+    has_promotions = bool(promotions)
+    diary_count = _count_published_diaries(profile, contact_json)
+    return {
+        "id": str(profile.id),
+        "id_rank": id_rank(profile.id),
+        "slug": profile.slug,
+        "name": profile.name,
+        "area": profile.area,
+        "nearest_station": profile.nearest_station,
+        "station_line": profile.station_line,
+        "station_exit": profile.station_exit,
+        "station_walk_minutes": profile.station_walk_minutes,
+        "latitude": profile.latitude,
+        "longitude": profile.longitude,
+        "price_min": profile.price_min,
+        "price_max": profile.price_max,
+        "bust_tag": profile.bust_tag,
+        "service_type": profile.service_type,
+        "store_name": store_name,
+        "body_tags": profile.body_tags or [],
+        "height_cm": height_cm,
+        "age": age,
+        "photos": profile.photos or [],
+        "discounts": profile.discounts or [],
+        "ranking_badges": profile.ranking_badges or [],
+        "ranking_weight": profile.ranking_weight,
+        "status": profile.status,
+        "today": today,
+        "tag_score": tag_score,
+        "ctr7d": ctr7d,
+        "updated_at": int((profile.updated_at or profile.created_at).timestamp()),
+        "promotions": promotions,
+        "review_score": review_score,
+        "review_count": review_count,
+        "review_highlights": review_highlights,
+        "ranking_reason": ranking_reason,
+        "staff_preview": contact_json.get("staff"),
+        "price_band": price_band_key,
+        "price_band_label": price_band_label,
+        "has_promotions": has_promotions,
+        "has_discounts": has_discounts,
+        "promotion_count": len(promotions),
+        "ranking_score": ranking_score,
+        "diary_count": diary_count,
+        "has_diaries": diary_count > 0,
+    }
+
+
+def _normalize_promotions(*sources: Any) -> List[Promotion]:
+    promotions: List[Promotion] = []
+    seen: Set[tuple[str, str | None, str | None]] = set()
+    for source in sources:
+        if not isinstance(source, list):
+            continue
+        for entry in source:
+            if not isinstance(entry, dict):
+                continue
+            label_raw = entry.get("label") or entry.get("title") or entry.get("name")
+            if not label_raw:
+                continue
+            label = str(label_raw).strip()
+            if not label:
+                continue
+            description = entry.get("description") or entry.get("detail")
+            expires_at = _normalize_date_string(entry.get("expires_at") or entry.get("until"))
+            key = (label, description, expires_at)
+            if key in seen:
+                continue
+            seen.add(key)
+            promotions.append(
+                Promotion(
+                    label=label,
+                    description=str(description) if description else None,
+                    expires_at=expires_at,
+                    highlight=entry.get("highlight"),
+                )
+            )
+    return promotions
+
+
+def _normalize_staff_preview(raw: Any) -> List[ShopStaffPreview]:
+    previews: List[ShopStaffPreview] = []
+    if not isinstance(raw, list):
+        return previews
+    for entry in raw:
+        if not isinstance(entry, dict):
+            continue
+        name_raw = entry.get("name")
+        if not name_raw:
+            continue
+        name = str(name_raw).strip()
+        if not name:
+            continue
+        specialties_raw = entry.get("specialties")
+        if isinstance(specialties_raw, list):
+            specialties = [str(tag).strip() for tag in specialties_raw if str(tag).strip()]
+        else:
+            specialties = []
+        previews.append(
+            ShopStaffPreview(
+                id=(str(entry.get("id")).strip() or None) if entry.get("id") is not None else None,
+                name=name,
+                alias=(str(entry.get("alias")).strip() or None) if entry.get("alias") is not None else None,
+                headline=(str(entry.get("headline")).strip() or None) if entry.get("headline") is not None else None,
+                rating=_safe_float(entry.get("rating")),
+                review_count=_safe_int(entry.get("review_count")),
+                avatar_url=(str(entry.get("avatar_url")).strip() or None) if entry.get("avatar_url") is not None else None,
+                specialties=specialties,
+            )
+        )
+    return previews
+
+
+def _doc_to_shop_summary(doc: Dict[str, Any]) -> ShopSummary:
+    first_photo = None
+    photos = doc.get("photos") or []
+    if isinstance(photos, list) and photos:
+        first_photo = photos[0]
+    promotions_raw = doc.get("promotions")
+    promotions = _normalize_promotions(promotions_raw)
+    review_score = doc.get("review_score")
+    rating = review_score if review_score is not None else doc.get("rating")
+    review_count = doc.get("review_count")
+    return ShopSummary(
+        id=UUID(doc["id"]),
+        slug=doc.get("slug"),
+        name=doc.get("name", ""),
+        store_name=doc.get("store_name"),
+        area=doc.get("area", ""),
+        area_name=doc.get("area_name"),
+        address=doc.get("address"),
+        categories=list(doc.get("categories", []) or []),
+        service_tags=list(doc.get("body_tags", []) or []),
+        min_price=doc.get("price_min", 0) or 0,
+        max_price=doc.get("price_max", 0) or 0,
+        nearest_station=doc.get("nearest_station"),
+        station_line=doc.get("station_line"),
+        station_exit=doc.get("station_exit"),
+        station_walk_minutes=doc.get("station_walk_minutes"),
+        latitude=doc.get("latitude"),
+        longitude=doc.get("longitude"),
+        rating=rating,
+        review_count=review_count,
+        lead_image_url=first_photo,
+        badges=list(doc.get("ranking_badges", []) or []),
+        today_available=doc.get("today"),
+        next_available_at=_unix_to_dt(doc.get("next_available_at")),
+        distance_km=doc.get("distance_km"),
+        online_reservation=doc.get("online_reservation"),
+        updated_at=_unix_to_dt(doc.get("updated_at")),
+        ranking_reason=doc.get("ranking_reason"),
+        promotions=promotions,
+        price_band=doc.get("price_band"),
+        price_band_label=doc.get("price_band_label"),
+        has_promotions=doc.get("has_promotions"),
+        has_discounts=doc.get("has_discounts"),
+        promotion_count=doc.get("promotion_count"),
+        ranking_score=doc.get("ranking_score"),
+        diary_count=doc.get("diary_count"),
+        has_diaries=doc.get("has_diaries"),
+        staff_preview=_normalize_staff_preview(doc.get("staff_preview")),
+    )
@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""End-to-end latency benchmarks for the API hot paths.
+
+The ASGI app runs in-process behind ``httpx.ASGITransport`` against the
+configured Postgres (``DATABASE_URL``) and an in-memory fake Meilisearch, so the
+numbers cover routing, validation, SQL and serialization but not the network or
+the search engine.
+
+The catalog is rebuilt for every size, which TRUNCATEs ``profiles`` and every
+table referencing it; point ``DATABASE_URL`` at a throwaway database (e.g. the
+``docker-compose.test.yml`` stack) and pass ``--reset-database`` to confirm.
+
+    python -m benchmarks.run --reset-database --catalog-sizes 100,1000 \
+        --output bench.json
+    python -m benchmarks.run --reset-database --baseline bench-main.json \
+        --max-regression 15
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import platform
+import random
+import subprocess
+import sys
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+from httpx import ASGITransport, AsyncClient, Response
+from sqlalchemy import text
+
+from app import meili, models
+from app.db import SessionLocal
+from app.main import app
+from app.settings import settings
+
+from .fake_meili import FakeMeiliClient
+
+ADMIN_HEADERS = {"X-Admin-Key": settings.admin_api_key}
+AREAS = ["難波/日本橋", "梅田", "心斎橋", "天王寺", "京橋", "堺筋本町"]
+BODY_TAGS = ["癒し", "丁寧", "密着", "ストレッチ", "指名多数"]
+SCENARIOS = ("search", "shop_detail", "outlink", "reservation_create", "reindex", "bulk_ingest")
+# Scenarios that rewrite the whole catalog; they run sequentially and fewer times.
+HEAVY_SCENARIOS = {"reindex", "bulk_ingest"}
+
+RequestFactory = Callable[[AsyncClient, int], Awaitable[Response]]
+
+
+@dataclass
+class Catalog:
+    shop_ids: List[uuid.UUID] = field(default_factory=list)
+    outlink_tokens: List[str] = field(default_factory=list)
+
+
+@dataclass
+class ScenarioResult:
+    catalog_size: int
+    scenario: str
+    requests: int
+    errors: int
+    concurrency: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    mean_ms: float
+    max_ms: float
+    throughput_rps: float
+
+
+def percentile(samples: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile; ``samples`` must be sorted."""
+    if not samples:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(samples)))
+    return samples[min(rank, len(samples)) - 1]
+
+
+async def reset_catalog() -> None:
+    async with SessionLocal() as session:
+        await session.execute(text("TRUNCATE TABLE profiles CASCADE"))
+        await session.commit()
+
+
+async def seed_catalog(size: int, *, seed: int) -> Catalog:
+    rng = random.Random(seed)
+    catalog = Catalog()
+    now = datetime.now(UTC)
+    async with SessionLocal() as session:
+        for index in range(size):
+            shop_id = uuid.uuid4()
+            price_min = rng.choice([8000, 10000, 12000, 14000])
+            session.add(
+                models.Profile(
+                    id=shop_id,
+                    name=f"ベンチ店舗{index:05d}",
+                    area=rng.choice(AREAS),
+                    price_min=price_min,
+                    price_max=price_min + rng.choice([4000, 6000, 8000]),
+                    bust_tag=rng.choice("BCDEF"),
+                    service_type=rng.choice(["store", "dispatch"]),
+                    height_cm=rng.randint(150, 170),
+                    age=rng.randint(20, 35),
+                    body_tags=rng.sample(BODY_TAGS, 2),
+                    photos=[f"https://example.com/{shop_id.hex}/{n}.jpg" for n in range(3)],
+                    contact_json={"store_name": f"ベンチ店舗{index:05d}", "phone": "0600000000"},
+                    discounts=[{"label": "WEB予約割", "description": "500円OFF"}] if index % 3 == 0 else [],
+                    ranking_badges=["人気No.1"] if index % 10 == 0 else [],
+                    ranking_weight=rng.randint(0, 100),
+                    status="published",
+                    created_at=now,
+                    updated_at=now,
+                )
+            )
+            session.add(
+                models.Availability(
+                    profile_id=shop_id,
+                    date=date.today(),
+                    slots_json={
+                        "slots": [
+                            {
+                                "start_at": (now + timedelta(hours=h)).isoformat(),
+                                "end_at": (now + timedelta(hours=h + 1)).isoformat(),
+                                "status": "open",
+                            }
+                            for h in range(1, 4)
+                        ]
+                    },
+                    is_today=True,
+                )
+            )
+            token = f"bench-{shop_id.hex[:16]}"
+            session.add(
+                models.Outlink(profile_id=shop_id, kind="web", token=token, target_url="https://example.com")
+            )
+            for score in rng.sample(range(1, 6), 3):
+                session.add(
+                    models.Review(profile_id=shop_id, status="published", score=score, body="ベンチマーク口コミ")
+                )
+            catalog.shop_ids.append(shop_id)
+            catalog.outlink_tokens.append(token)
+        await session.commit()
+    return catalog
+
+
+def build_scenarios(catalog: Catalog, *, seed: int) -> Dict[str, RequestFactory]:
+    rng = random.Random(seed)
+    base_start = datetime.now(UTC).replace(minute=0, second=0, microsecond=0) + timedelta(days=30)
+    search_params = [
+        {},
+        {"page": 2},
+        {"area": AREAS[0]},
+        {"sort": "price_min:asc"},
+        {"service_tags": BODY_TAGS[0], "price_max": 14000},
+    ]
+
+    async def search(client: AsyncClient, i: int) -> Response:
+        return await client.get("/api/v1/shops", params=search_params[i % len(search_params)])
+
+    async def shop_detail(client: AsyncClient, i: int) -> Response:
+        return await client.get(f"/api/v1/shops/{rng.choice(catalog.shop_ids)}")
+
+    async def outlink(client: AsyncClient, i: int) -> Response:
+        # A distinct client IP per request keeps the outlink rate limiter out of the numbers.
+        return await client.get(
+            f"/api/out/{rng.choice(catalog.outlink_tokens)}",
+            headers={"x-forwarded-for": f"10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}"},
+        )
+
+    async def reservation_create(client: AsyncClient, i: int) -> Response:
+        start = base_start + timedelta(hours=i)
+        return await client.post(
+            "/api/v1/reservations",
+            json={
+                "shop_id": str(catalog.shop_ids[i % len(catalog.shop_ids)]),
+                "desired_start": start.isoformat(),
+                "desired_end": (start + timedelta(minutes=90)).isoformat(),
+                "channel": "web",
+                "customer": {"name": "ベンチ太郎", "phone": "09000000000"},
+            },
+        )
+
+    async def reindex(client: AsyncClient, i: int) -> Response:
+        return await client.post("/api/admin/reindex", headers=ADMIN_HEADERS)
+
+    async def bulk_ingest(client: AsyncClient, i: int) -> Response:
+        shops = catalog.shop_ids[: min(len(catalog.shop_ids), 50)]
+        return await client.post(
+            "/api/admin/shops/content:bulk",
+            headers=ADMIN_HEADERS,
+            json={
+                "shops": [
+                    {
+                        "shop_id": str(shop_id),
+                        "reviews": [
+                            {"external_id": f"bench-{n}", "score": 4 + (i + n) % 2, "body": f"更新{i}"}
+                            for n in range(5)
+                        ],
+                        "availability": [
+                            {"date": (date.today() + timedelta(days=d)).isoformat(), "slots": []}
+                            for d in range(3)
+                        ],
+                    }
+                    for shop_id in shops
+                ]
+            },
+        )
+
+    return {
+        "search": search,
+        "shop_detail": shop_detail,
+        "outlink": outlink,
+        "reservation_create": reservation_create,
+        "reindex": reindex,
+        "bulk_ingest": bulk_ingest,
+    }
+
+
+async def run_scenario(
+    client: AsyncClient,
+    name: str,
+    factory: RequestFactory,
+    *,
+    catalog_size: int,
+    requests: int,
+    concurrency: int,
+    warmup: int,
+) -> ScenarioResult:
+    for i in range(warmup):
+        await factory(client, -1 - i)
+
+    latencies: List[float] = []
+    errors = 0
+    counter = iter(range(requests))
+
+    async def worker() -> None:
+        nonlocal errors
+        for i in counter:
+            started = time.perf_counter()
+            try:
+                resp = await factory(client, i)
+                failed = resp.status_code >= 400
+            except Exception:
+                failed = True
+            latencies.append((time.perf_counter() - started) * 1000.0)
+            errors += failed
+
+    wall_started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - wall_started
+
+    latencies.sort()
+    return ScenarioResult(
+        catalog_size=catalog_size,
+        scenario=name,
+        requests=len(latencies),
+        errors=errors,
+        concurrency=concurrency,
+        p50_ms=round(percentile(latencies, 50), 3),
+        p95_ms=round(percentile(latencies, 95), 3),
+        p99_ms=round(percentile(latencies, 99), 3),
+        mean_ms=round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+        max_ms=round(latencies[-1], 3) if latencies else 0.0,
+        throughput_rps=round(len(latencies) / wall, 2) if wall > 0 else 0.0,
+    )
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: List[Dict[str, Any]], baseline: List[Dict[str, Any]], max_regression: float) -> List[str]:
+    """Return p95 regressions larger than ``max_regression`` percent."""
+    previous = {(row["catalog_size"], row["scenario"]): row for row in baseline}
+    regressions: List[str] = []
+    for row in results:
+        before = previous.get((row["catalog_size"], row["scenario"]))
+        if not before or not before["p95_ms"]:
+            continue
+        change = (row["p95_ms"] - before["p95_ms"]) / before["p95_ms"] * 100.0
+        line = (
+            f"{row['scenario']:<20} n={row['catalog_size']:<6} "
+            f"p95 {before['p95_ms']:>9.2f} -> {row['p95_ms']:>9.2f} ms ({change:+.1f}%)"
+        )
+        print(line, file=sys.stderr)
+        if change > max_regression:
+            regressions.append(line)
+    return regressions
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    fake = FakeMeiliClient()
+    meili.get_client = lambda: fake  # type: ignore[assignment]
+    meili.ensure_indexes()
+
+    results: List[ScenarioResult] = []
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://bench") as client:
+        for size in args.catalog_sizes:
+            await reset_catalog()
+            catalog = await seed_catalog(size, seed=args.seed)
+            # Populate the fake index before anything searches it.
+            await client.post("/api/admin/reindex", headers=ADMIN_HEADERS)
+            scenarios = build_scenarios(catalog, seed=args.seed)
+            for name in args.scenarios:
+                heavy = name in HEAVY_SCENARIOS
+                result = await run_scenario(
+                    client,
+                    name,
+                    scenarios[name],
+                    catalog_size=size,
+                    requests=args.heavy_requests if heavy else args.requests,
+                    concurrency=1 if heavy else args.concurrency,
+                    warmup=1 if heavy else args.warmup,
+                )
+                results.append(result)
+                print(
+                    f"{name:<20} n={size:<6} p50={result.p50_ms:>8.2f} p95={result.p95_ms:>8.2f} "
+                    f"p99={result.p99_ms:>8.2f} ms  {result.throughput_rps:>8.1f} req/s  errors={result.errors}",
+                    file=sys.stderr,
+                )
+
+    return {
+        "meta": {
+            "git_revision": _git_revision(),
+            "generated_at": datetime.now(UTC).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "requests": args.requests,
+            "heavy_requests": args.heavy_requests,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+        },
+        "results": [asdict(result) for result in results],
+    }
+
+
+def _csv_list(value: str) -> List[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--catalog-sizes", type=lambda v: [int(x) for x in _csv_list(v)], default=[100, 1000])
+    parser.add_argument("--scenarios", type=_csv_list, default=list(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=200, help="measured requests per light scenario")
+    parser.add_argument("--heavy-requests", type=int, default=5, help="measured runs of reindex/bulk ingest")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", type=Path, default=None, help="write JSON results here (default: stdout)")
+    parser.add_argument("--baseline", type=Path, default=None, help="previous JSON results to compare p95 against")
+    parser.add_argument("--max-regression", type=float, default=20.0, help="allowed p95 increase in percent")
+    parser.add_argument(
+        "--reset-database",
+        action="store_true",
+        help="confirm that the catalog tables in DATABASE_URL may be truncated",
+    )
+    args = parser.parse_args(argv)
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    if not args.reset_database:
+        parser.error("benchmarks truncate the catalog; re-run with --reset-database against a disposable database")
+    return args
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    report = asyncio.run(run(args))
+    payload = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        args.output.write_text(payload + "\n", encoding="utf-8")
+    else:
+        print(payload)
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = compare(report["results"], baseline.get("results", []), args.max_regression)
+        if regressions:
+            print(f"p95 regressed by more than {args.max_regression}%:", file=sys.stderr)
+            for line in regressions:
+                print(f"  {line}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
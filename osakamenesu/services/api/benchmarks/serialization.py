@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""Microbenchmarks for search document building and summary serialization.
+
+Times ``build_profile_doc`` (every reindex) and ``_doc_to_shop_summary`` (every
+search hit) against the unoptimised copies in ``benchmarks.reference`` over a
+synthetic catalog, after checking that both produce identical output. Also
+times encoding a full search page the way FastAPI does by default
+(``jsonable_encoder`` + ``JSONResponse``) against the routes'
+``ShopJSONResponse``. No database or Meilisearch is needed.
+
+    python -m benchmarks.serialization --size 100000 --output serialization.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import platform
+import random
+import sys
+import time
+import uuid
+from datetime import UTC, date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Sequence
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app import models
+from app.routers.shops import ShopJSONResponse, _build_facets, _doc_to_shop_summary
+from app.schemas import ShopSearchResponse
+from app.utils.profiles import build_profile_doc
+
+from . import reference
+
+AREAS = ["難波/日本橋", "梅田", "心斎橋", "天王寺", "京橋", "堺筋本町"]
+BODY_TAGS = ["癒し", "丁寧", "密着", "ストレッチ", "指名多数", "アロマ"]
+
+
+def synthetic_profile(index: int, rng: random.Random) -> tuple[models.Profile, list[models.Outlink]]:
+    """A transient Profile exercising every normalisation branch at realistic rates."""
+    now = datetime(2024, 1, 1, tzinfo=UTC) + timedelta(minutes=index)
+    profile_id = uuid.UUID(int=rng.getrandbits(128))
+    contact_json: Dict[str, Any] = {
+        "phone": "0600000000",
+        "ranking_reason": "編集部ピックアップ" if index % 4 == 0 else None,
+        "promotions": [
+            {"label": "朝割", "description": "11時まで1,000円OFF", "expires_at": "2024-12-31"},
+            {"title": "新人割", "detail": "初回限定", "until": date(2024, 6, 30).isoformat()},
+        ][: index % 3],
+        "staff": [
+            {
+                "id": f"staff-{index}-{n}",
+                "name": f"セラピスト{n}",
+                "alias": f"alias{n}" if n % 2 else None,
+                "headline": "丁寧な施術",
+                "rating": "4.5" if n % 2 else 4.8,
+                "review_count": str(10 + n),
+                "avatar_url": f"https://example.com/avatar/{index}/{n}.jpg",
+                "specialties": ["リンパ", " ", "ストレッチ"],
+            }
+            for n in range(index % 4)
+        ],
+        "reviews": {
+            "average_score": 4.2 + (index % 8) / 10,
+            "review_count": index % 40,
+            "highlighted": [
+                {"title": "極上の癒し", "body": "丁寧でした", "score": 5, "visited_at": "2024-01-02"}
+            ],
+        },
+    }
+    if index % 2 == 0:
+        contact_json["store_name"] = f"リラクゼーション{index}"
+    elif index % 3 == 0:
+        contact_json["web"] = f"https://shop{index}.example.com/top"
+    if index % 5 == 0:
+        contact_json["height_cm"] = "158"
+        contact_json["age"] = 24
+
+    price_min = rng.choice([0, 8000, 10000, 12000, 15000, 20000, 25000])
+    profile = models.Profile(
+        id=profile_id,
+        slug=f"shop-{index}",
+        name=f"ベンチ店舗{index:06d}",
+        area=rng.choice(AREAS),
+        nearest_station="なんば",
+        station_line="御堂筋線",
+        station_exit="5",
+        station_walk_minutes=rng.randint(1, 10),
+        latitude=34.66,
+        longitude=135.50,
+        price_min=price_min,
+        price_max=price_min + 6000,
+        bust_tag=rng.choice("BCDEF"),
+        service_type=rng.choice(["store", "dispatch"]),
+        height_cm=None if index % 5 == 0 else rng.randint(150, 170),
+        age=None if index % 5 == 0 else rng.randint(20, 35),
+        body_tags=rng.sample(BODY_TAGS, 3),
+        photos=[f"https://example.com/{index}/{n}.jpg" for n in range(4)],
+        discounts=[{"label": "WEB予約割", "description": "500円OFF"}] if index % 3 == 0 else [],
+        ranking_badges=["人気No.1"] if index % 10 == 0 else [],
+        ranking_weight=rng.randint(0, 100),
+        status="published",
+        contact_json=contact_json,
+        created_at=now,
+        updated_at=now,
+    )
+    outlinks = []
+    if index % 3 == 1:
+        outlinks.append(
+            models.Outlink(profile_id=profile_id, kind="web", token=f"t{index}", target_url=f"https://o{index}.example.jp/")
+        )
+    return profile, outlinks
+
+
+def _time_pair(before: Callable[[], Any], after: Callable[[], Any], repeat: int) -> tuple[float, float]:
+    """Best-of-``repeat`` timings, interleaved so drift affects both sides equally."""
+    best = [float("inf"), float("inf")]
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            for slot, fn in enumerate((before, after)):
+                gc.collect()
+                started = time.perf_counter()
+                fn()
+                best[slot] = min(best[slot], time.perf_counter() - started)
+    finally:
+        gc.enable()
+    return best[0], best[1]
+
+
+def _result(name: str, size: int, before: float, after: float) -> Dict[str, Any]:
+    return {
+        "benchmark": name,
+        "items": size,
+        "reference_s": round(before, 4),
+        "current_s": round(after, 4),
+        "reference_us_per_item": round(before / size * 1e6, 3),
+        "current_us_per_item": round(after / size * 1e6, 3),
+        "speedup": round(before / after, 3) if after else None,
+    }
+
+
+def run(size: int, repeat: int, seed: int) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    catalog = [synthetic_profile(index, rng) for index in range(size)]
+    build_args = [
+        (profile, {"today": index % 2 == 0, "tag_score": 0.5, "ctr7d": 0.01 * (index % 7), "outlinks": outlinks})
+        for index, (profile, outlinks) in enumerate(catalog)
+    ]
+
+    docs = [build_profile_doc(profile, **kwargs) for profile, kwargs in build_args]
+    reference_docs = [reference.build_profile_doc(profile, **kwargs) for profile, kwargs in build_args]
+    if docs != reference_docs:
+        raise SystemExit("build_profile_doc output differs from the reference implementation")
+
+    summaries = [_doc_to_shop_summary(doc).model_dump_json() for doc in docs]
+    reference_summaries = [reference._doc_to_shop_summary(doc).model_dump_json() for doc in docs]
+    if summaries != reference_summaries:
+        raise SystemExit("_doc_to_shop_summary output differs from the reference implementation")
+
+    page_size = 50
+    pages = [
+        ShopSearchResponse(
+            page=1,
+            page_size=page_size,
+            total=size,
+            results=[_doc_to_shop_summary(doc) for doc in docs[start : start + page_size]],
+            facets=_build_facets({"area": {area: 10 for area in AREAS}, "body_tags": {tag: 5 for tag in BODY_TAGS}}),
+        ).model_dump()
+        for start in range(0, min(size, 200 * page_size), page_size)
+    ]
+    if [JSONResponse(jsonable_encoder(body)).body for body in pages] != [ShopJSONResponse(body).body for body in pages]:
+        raise SystemExit("ShopJSONResponse bytes differ from the default JSONResponse encoding")
+
+    results = [
+        _result(
+            "build_profile_doc",
+            size,
+            *_time_pair(
+                lambda: [reference.build_profile_doc(p, **kw) for p, kw in build_args],
+                lambda: [build_profile_doc(p, **kw) for p, kw in build_args],
+                repeat,
+            ),
+        ),
+        _result(
+            "doc_to_shop_summary",
+            size,
+            *_time_pair(
+                lambda: [reference._doc_to_shop_summary(doc) for doc in docs],
+                lambda: [_doc_to_shop_summary(doc) for doc in docs],
+                repeat,
+            ),
+        ),
+        _result(
+            "search_page_encoding",
+            len(pages),
+            *_time_pair(
+                lambda: [JSONResponse(jsonable_encoder(body)).body for body in pages],
+                lambda: [ShopJSONResponse(body).body for body in pages],
+                repeat,
+            ),
+        ),
+    ]
+    return {
+        "meta": {
+            "generated_at": datetime.now(UTC).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "size": size,
+            "repeat": repeat,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=100_000, help="synthetic profiles in the catalog")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per benchmark; the best is kept")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", type=Path, default=None, help="write JSON results here (default: stdout)")
+    args = parser.parse_args(argv)
+
+    report = run(args.size, args.repeat, args.seed)
+    for row in report["results"]:
+        print(
+            f"{row['benchmark']:<22} reference {row['reference_us_per_item']:>8.2f} us  "
+            f"current {row['current_us_per_item']:>8.2f} us  x{row['speedup']}",
+            file=sys.stderr,
+        )
+    payload = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        args.output.write_text(payload + "\n", encoding="utf-8")
+    else:
+        print(payload)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,7 +9,8 @@ set -euo pipefail
 #   MEILI_HOST
 #   MEILI_MASTER_KEY
 #   NOTIFY_SMTP_HOST / PORT / USERNAME / PASSWORD / FROM_EMAIL
-# Optional: AUTH_MAGIC_LINK_DEBUG (default true)
+# Optional: AUTH_MAGIC_LINK_DEBUG (default true), FAST_START (default true: run the bootstrap job
+# and start instances without migrations or index settings)
 
 PROJECT=${PROJECT:-gen-lang-client-0412098348}
 REGION=${REGION:-asia-northeast1}
@@ -61,6 +62,9 @@ NOTIFY_SMTP_USERNAME=${NOTIFY_SMTP_USERNAME:-d7f28b27f7218e}
 NOTIFY_SMTP_PASSWORD=${NOTIFY_SMTP_PASSWORD:-e1705971ebda5b}
 NOTIFY_FROM_EMAIL=${NOTIFY_FROM_EMAIL:-no-reply@osakamenesu-stg.local}
 AUTH_MAGIC_LINK_DEBUG=${AUTH_MAGIC_LINK_DEBUG:-true}
+# Run migrations/index settings once in a Cloud Run job so instances start without them.
+FAST_START=${FAST_START:-true}
+BOOTSTRAP_JOB=${BOOTSTRAP_JOB:-${SERVICE}-bootstrap}
 
 if [[ "${AUTH_MAGIC_LINK_DEBUG,,}" == "true" ]]; then
   echo "[deploy_api] note: AUTH_MAGIC_LINK_DEBUG is enabled. Disable this in production unless actively troubleshooting." >&2
@@ -118,6 +122,24 @@ gcloud builds submit "$API_DIR" \
   --project="$PROJECT" \
   --tag="$IMAGE"
 
+if [[ "$FAST_START" == "true" ]]; then
+  echo "[deploy_api] running bootstrap job ($BOOTSTRAP_JOB)"
+  gcloud run jobs deploy "$BOOTSTRAP_JOB" \
+    --project="$PROJECT" \
+    --region="$REGION" \
+    --image="$IMAGE" \
+    --set-cloudsql-instances="${PROJECT}:${REGION}:osakamenesu-pg" \
+    --command=python \
+    --args=-m,tools.bootstrap \
+    --set-env-vars=DATABASE_URL="$DATABASE_URL",\
+MEILI_HOST="$MEILI_HOST",\
+MEILI_MASTER_KEY="$MEILI_MASTER_KEY"
+  gcloud run jobs execute "$BOOTSTRAP_JOB" \
+    --project="$PROJECT" \
+    --region="$REGION" \
+    --wait
+fi
+
 echo "[deploy_api] updating Cloud Run service ($SERVICE)"
 gcloud run services update "$SERVICE" \
   --project="$PROJECT" \
@@ -135,6 +157,7 @@ NOTIFY_SMTP_USERNAME="$NOTIFY_SMTP_USERNAME",\
 NOTIFY_SMTP_PASSWORD="$NOTIFY_SMTP_PASSWORD",\
 NOTIFY_FROM_EMAIL="$NOTIFY_FROM_EMAIL",\
 ADMIN_API_KEY="$ADMIN_API_KEY",\
-OSAKAMENESU_ADMIN_API_KEY="$ADMIN_API_KEY"
+OSAKAMENESU_ADMIN_API_KEY="$ADMIN_API_KEY",\
+FAST_START="$FAST_START"
 
 echo "[deploy_api] deployment complete"
@@ -3,8 +3,14 @@ set -euo pipefail
 
 cd /app
 
-echo "[migrate] upgrading DB..."
-alembic upgrade head || true
+# With FAST_START=true migrations and index settings are applied by the
+# bootstrap job (tools/bootstrap.py) once per deploy instead of on every boot.
+if [[ "${FAST_START:-false}" == "true" ]]; then
+  echo "[migrate] skipped (FAST_START)"
+else
+  echo "[migrate] upgrading DB..."
+  alembic upgrade head || true
+fi
 PORT=${PORT:-8080}
 echo "[start] uvicorn on port ${PORT}"
 exec uvicorn app.main:app --host 0.0.0.0 --port "${PORT}"
@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+"""Background worker that purges expired magic-link tokens and dead sessions."""
+
+import asyncio
+import logging
+
+from app.jobs.auth_cleanup import BATCH_SIZE, GRACE, INTERVAL_SECONDS, run_loop
+
+logger = logging.getLogger("auth_cleanup")
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    logger.info("starting auth cleanup service (interval=%ss, grace=%s, batch=%s)", INTERVAL_SECONDS, GRACE, BATCH_SIZE)
+    asyncio.run(run_loop())
+
+
+if __name__ == "__main__":
+    main()
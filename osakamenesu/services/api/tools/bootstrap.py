@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+"""Apply migrations and search index settings ahead of a FAST_START deploy."""
+
+import argparse
+import logging
+
+from app.jobs.bootstrap import run
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--skip-migrations", action="store_true", help="do not run alembic upgrade head")
+    parser.add_argument(
+        "--force-index-settings",
+        action="store_true",
+        help="push Meilisearch settings even if the stored fingerprint matches",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    run(migrate=not args.skip_migrations, force_index_settings=args.force_index_settings)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""Background worker that expires stale pending reservations."""
+
+import asyncio
+import logging
+
+from app.jobs.expiry import GRACE, INTERVAL_SECONDS, PENDING_SLA, run_loop
+from app.notifications import flush_pending_digests
+
+logger = logging.getLogger("expiry")
+
+
+async def _run() -> None:
+    try:
+        await run_loop()
+    finally:
+        await flush_pending_digests()
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    logger.info("starting expiry service (interval=%ss, grace=%s, sla=%s)", INTERVAL_SECONDS, GRACE, PENDING_SLA)
+    asyncio.run(_run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+"""Background worker that keeps the log tables' monthly partitions ahead and enforces retention."""
+
+import asyncio
+import logging
+
+from app.jobs.partitions import ARCHIVE, INTERVAL_SECONDS, PREMAKE_MONTHS, RETENTION_MONTHS, run_loop
+
+logger = logging.getLogger("partitions")
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    logger.info(
+        "starting partition service (interval=%ss, premake=%s months, retention=%s, %s)",
+        INTERVAL_SECONDS,
+        PREMAKE_MONTHS,
+        RETENTION_MONTHS,
+        "detach" if ARCHIVE else "drop",
+    )
+    asyncio.run(run_loop())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""Background worker that runs every periodic job on its schedule.
+
+Run it on as many replicas as you like: each job is led by one process at a
+time through a Postgres advisory lock, and the others take over if it dies.
+"""
+
+import asyncio
+import logging
+
+from app.jobs.scheduler import build_scheduler
+
+logger = logging.getLogger("scheduler")
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    scheduler = build_scheduler()
+    logger.info(
+        "starting scheduler service (%s)",
+        ", ".join(f"{name}={job.schedule}" for name, job in scheduler.jobs.items()),
+    )
+    asyncio.run(scheduler.run_forever())
+
+
+if __name__ == "__main__":
+    main()